@@ -0,0 +1,58 @@
+from __future__ import annotations
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+# Permite rodar direto da pasta do projeto: python benchmarks/bench_formato.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.personagem import Personagem, Arqueiro
+from models.catalogo import catalogo
+from utils.formato_binario import codificar, ler_save
+
+# Compara o save JSON (indent=4, como o Repositorio grava) com o binário compacto:
+# tamanho em disco e tempo de salvar/carregar (incluindo Personagem.from_dict).
+
+
+def personagem_exemplo(itens: int) -> Personagem:
+    p = Arqueiro.no_nivel("Benchmark", 20)
+    cat = catalogo() # Itens do catálogo: o save guarda só o id de cada um
+    modelos = [cat.item_por_id(ident) for ident in ("pocao_pequena", "essencia_de_mana", "machado_de_orc", "elmo_de_pedra")]
+    for i in range(itens):
+        p.adicionar_item(modelos[i % len(modelos)]) # Os repetidos viram pilhas
+    p.equipamentos["arma"] = cat.item_por_id("arco_elfico")
+    p.invalidar_stats()
+    return p
+
+
+def medir(itens: int, repeticoes: int = 200) -> None:
+    dados = personagem_exemplo(itens).to_dict()
+    formatos = {
+        "json": lambda d: json.dumps(d, indent=4, ensure_ascii=False).encode("utf-8"),
+        "binario": codificar,
+    }
+    with tempfile.TemporaryDirectory() as pasta:
+        for nome, codificador in formatos.items():
+            caminho = os.path.join(pasta, "save")
+
+            def salvar():
+                with open(caminho, "wb") as f:
+                    f.write(codificador(dados))
+
+            def carregar():
+                with open(caminho, "rb") as f:
+                    return Personagem.from_dict(ler_save(f.read()))
+
+            salvar()
+            tamanho = os.path.getsize(caminho)
+            t_salvar = min(timeit.repeat(salvar, number=repeticoes, repeat=3)) / repeticoes
+            t_carregar = min(timeit.repeat(carregar, number=repeticoes, repeat=3)) / repeticoes
+            print(f"{itens:>6} itens | {nome:<8} | {tamanho:>9} bytes | "
+                  f"salvar {t_salvar * 1e6:>8.1f} µs | carregar {t_carregar * 1e6:>8.1f} µs")
+
+
+if __name__ == "__main__":
+    for n in (0, 50, 500, 5000):
+        medir(n, repeticoes=20 if n >= 5000 else 200)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+import os
+import sys
+import time
+
+# Permite rodar direto da pasta do projeto: python benchmarks/bench_horda.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.personagem import criar_personagem
+from models.inimigo import ESPECIES
+from models.missao import Missao
+from models.politicas import PoliticaAtacar
+
+# Custo de um turno de combate headless em função do tamanho da horda.
+# O personagem não causa nem sofre dano (ataque 0, defesa alta), então todos os inimigos
+# agem em todos os turnos: o custo por inimigo deve ficar estável (crescimento linear).
+
+TURNOS = 200
+
+
+def tempo_por_turno(tamanho: int, repeticoes: int) -> float:
+    politica = PoliticaAtacar()
+    total = 0.0
+    for semente in range(repeticoes):
+        p = criar_personagem("Guerreiro", "Bench", 80)
+        p._atrib.ataque = 0
+        p._atrib.defesa = 10_000
+        p.invalidar_stats()
+        missao = Missao("Fácil", "Floresta", semente=semente, inimigos=[ESPECIES["Goblin"]() for _ in range(tamanho)])
+        inicio = time.perf_counter()
+        missao.simular(p, politica, limite_turnos=TURNOS)
+        total += time.perf_counter() - inicio
+    return total / (repeticoes * TURNOS)
+
+
+if __name__ == "__main__":
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'inimigos':>8} | {'µs/turno':>10} | {'µs/inimigo':>10}")
+    for tamanho in (1, 4, 16, 40, 100):
+        t = tempo_por_turno(tamanho, repeticoes) * 1e6
+        print(f"{tamanho:>8} | {t:>10.1f} | {t / tamanho:>10.2f}")
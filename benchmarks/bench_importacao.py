@@ -0,0 +1,115 @@
+from __future__ import annotations
+import argparse
+import compileall
+import os
+import re
+import subprocess
+import sys
+import time
+
+# Tempo de partida: o import de cada ponto de entrada (python -X importtime, relatório dos
+# módulos que mais pesam) e a partida a frio até o primeiro menu (processo novo até o prompt
+# "> " chegar no stdout). Fica o menor de N processos, para filtrar o ruído da máquina.
+# Sai com 1 se algum tempo passar do orçamento: o servidor e os lotes criam muitos processos
+# curtos, então cada milissegundo de import se multiplica.
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRADAS = ("main", "servidor", "simulador", "replay")
+# Orçamentos (ms) na máquina de referência; --escala-orcamento para máquinas mais lentas
+ORCAMENTO_MS = {
+    "primeiro_menu": 55.0,
+    "import main": 30.0,
+}
+# Carregados sob demanda: se algum aparecer no import do main, alguém voltou a importar cedo demais
+PREGUICOSOS = ("models.personagem", "models.missao", "models.inimigo", "models.catalogo",
+               "utils.repositorio", "utils.logger", "json")
+
+_LINHA = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def importtime(modulo: str) -> list[tuple[str, int, int, int]]:
+    #[(módulo, próprio µs, acumulado µs, profundidade)] de um processo novo.
+    saida = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                           cwd=RAIZ, capture_output=True, text=True, check=True).stderr
+    linhas = []
+    for m in _LINHA.finditer(saida):
+        linhas.append((m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2))
+    return linhas
+
+
+def melhor_importtime(modulo: str, repeticoes: int) -> tuple[float, list]:
+    #(ms do import do módulo, linhas do melhor processo)
+    melhor = None
+    for _ in range(repeticoes):
+        linhas = importtime(modulo)
+        total = next(acumulado for nome, _, acumulado, _ in reversed(linhas) if nome == modulo)
+        if melhor is None or total < melhor[0]:
+            melhor = (total, linhas)
+    return melhor[0] / 1000, melhor[1]
+
+
+def primeiro_menu(repeticoes: int) -> float:
+    #ms do processo novo até o primeiro prompt do main.py.
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        processo = subprocess.Popen([sys.executable, "main.py"], cwd=RAIZ, stdin=subprocess.PIPE,
+                                    stdout=subprocess.PIPE)
+        lido = b""
+        while not lido.endswith(b"> "):
+            bloco = processo.stdout.read1(4096)
+            if not bloco:
+                raise RuntimeError("main.py terminou antes do primeiro menu")
+            lido += bloco
+        melhor = min(melhor, (time.perf_counter() - inicio) * 1000)
+        processo.communicate(b"0\n")
+    return melhor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tempo de import e de partida até o primeiro menu")
+    parser.add_argument("--repeticoes", type=int, default=15)
+    parser.add_argument("--top", type=int, default=12, help="módulos mais pesados no relatório do main")
+    parser.add_argument("--escala-orcamento", type=float, default=1.0)
+    args = parser.parse_args()
+
+    # Mede como numa instalação normal, com o bytecode em dia (com PYTHONDONTWRITEBYTECODE
+    # o Python não grava os .pyc e recompila a cada processo o que mudou desde o último)
+    compileall.compile_dir(RAIZ, quiet=1)
+    medidas: dict[str, float] = {}
+    relatorio = []
+    for entrada in ENTRADAS:
+        medidas[f"import {entrada}"], linhas = melhor_importtime(entrada, args.repeticoes)
+        if entrada == "main":
+            relatorio = linhas
+    medidas["primeiro_menu"] = primeiro_menu(args.repeticoes)
+
+    carregados = {nome for nome, *_ in relatorio}
+    print("Módulos mais pesados no import do main (µs, tempo próprio):")
+    for nome, proprio, acumulado, profundidade in sorted(relatorio, key=lambda l: -l[1])[:args.top]:
+        print(f"  {proprio:>7} | {acumulado:>7} | {'  ' * profundidade}{nome}")
+    cedo = [nome for nome in PREGUICOSOS if nome in carregados]
+
+    print(f"\n{'medida':<20} {'ms':>8} {'orçamento':>10}")
+    estourou = []
+    for nome, valor in medidas.items():
+        limite = ORCAMENTO_MS.get(nome)
+        if limite is None:
+            print(f"{nome:<20} {valor:>8.1f} {'-':>10}")
+            continue
+        limite *= args.escala_orcamento
+        marca = ""
+        if valor > limite:
+            estourou.append(nome)
+            marca = "  <-- ESTOUROU"
+        print(f"{nome:<20} {valor:>8.1f} {limite:>10.1f}{marca}")
+
+    if cedo:
+        print(f"\nImportados cedo demais pelo main: {', '.join(cedo)}")
+    if estourou or cedo:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
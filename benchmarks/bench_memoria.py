@@ -0,0 +1,43 @@
+from __future__ import annotations
+import gc
+import os
+import sys
+import tracemalloc
+
+# Permite rodar direto da pasta do projeto: python benchmarks/bench_memoria.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.personagem import Guerreiro, Mago
+from models.inimigo import ESPECIES
+from models.item import Consumivel, Equipamento
+
+# Bytes por entidade viva (tracemalloc): quanto cada instância custa numa simulação
+# que mantém muitas entidades ao mesmo tempo. Inclui Atributos e os objetos próprios
+# da instância (listas, dicts), mas não strings/itens compartilhados entre instâncias.
+
+FABRICAS = {
+    "Goblin": ESPECIES["Goblin"],
+    "Lich": ESPECIES["Lich"],
+    "Guerreiro": lambda: Guerreiro("Bench"),
+    "Mago": lambda: Mago("Bench"),
+    "Consumivel": lambda: Consumivel("Poção Pequena", "vida", 20),
+    "Equipamento": lambda: Equipamento("Machado de Orc", "arma", ataque=12),
+}
+
+
+def bytes_por_entidade(fabrica, quantidade: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    vivos = [fabrica() for _ in range(quantidade)]
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Desconta a própria lista que segura as entidades
+    return (depois - antes - sys.getsizeof(vivos)) / len(vivos)
+
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{'entidade':<12} | bytes por instância viva ({quantidade} instâncias)")
+    for nome, fabrica in FABRICAS.items():
+        print(f"{nome:<12} | {bytes_por_entidade(fabrica, quantidade):>10.1f}")
@@ -0,0 +1,66 @@
+from __future__ import annotations
+import os
+import sys
+import time
+
+# Permite rodar direto da pasta do projeto: python benchmarks/bench_render.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.personagem import criar_personagem
+from models.missao import Missao
+from utils.logger import Logger
+from utils.terminal import Console, usar_console, restaurar_console
+
+# Saída do combate interativo: quantas escritas no terminal cada turno custa e o tempo de
+# montar a tela, com cores, sem cores e sem os quadros de status. O stdout é trocado por um
+# contador e o jogador sempre ataca (sem pausas, sem replay).
+
+
+class Contador:
+    def __init__(self):
+        self.escritas = 0
+        self.bytes = 0
+
+    def write(self, texto: str) -> int:
+        self.escritas += 1
+        self.bytes += len(texto.encode("utf-8"))
+        return len(texto)
+
+    def flush(self) -> None:
+        pass
+
+
+class ConsoleBench(Console):
+    def ler(self, prompt: str) -> str:
+        self.descarregar(prompt)
+        return "1"
+
+    def pausar(self, segundos: float) -> None:
+        self.descarregar()
+
+
+def medir(cores: bool, quadros: bool, batalhas: int) -> tuple[float, float, float]:
+    contador = Contador()
+    stdout, sys.stdout = sys.stdout, contador
+    token = usar_console(ConsoleBench(cores=cores, quadros=quadros))
+    turnos = 0
+    inicio = time.perf_counter()
+    try:
+        for semente in range(batalhas):
+            p = criar_personagem("Guerreiro", "Bench", 10)
+            missao = Missao("Média", "Floresta", semente=semente, quantidade=1 + semente % 4)
+            turnos += missao.executar(p, gravar=False).relatorio.turnos
+    finally:
+        duracao = time.perf_counter() - inicio
+        restaurar_console(token)
+        sys.stdout = stdout
+    return contador.escritas / turnos, contador.bytes / turnos, duracao / turnos * 1e6
+
+
+if __name__ == "__main__":
+    batalhas = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    Logger.configurar(nivel="ERRO")
+    print(f"{'modo':>12} | {'escritas/turno':>14} | {'bytes/turno':>11} | {'µs/turno':>8}")
+    for nome, cores, quadros in (("cores", True, True), ("sem cor", False, True), ("sem quadros", False, False)):
+        escritas, tamanho, tempo = medir(cores, quadros, batalhas)
+        print(f"{nome:>12} | {escritas:>14.2f} | {tamanho:>11.0f} | {tempo:>8.1f}")
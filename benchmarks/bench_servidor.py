@@ -0,0 +1,148 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+# Gerador de carga do servidor.py: N clientes roteirizados jogando ao mesmo tempo
+# (cria personagem, faz missões atacando até acabar e sai; com --ranking abre o ranking antes).
+# Mede a latência de cada resposta: do envio da linha até o prompt seguinte (IAC GA).
+# Sem --porta, sobe um servidor numa pasta temporária, sem pausas, e encerra no fim.
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from servidor import FIM_PROMPT
+
+CLASSES = ("1", "2", "3")
+_ANSI = re.compile(r"\x1b\[[0-9;]*m")
+
+
+class Cliente:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, latencias: list[float],
+                 pensar: float = 0.0):
+        self.reader = reader
+        self.writer = writer
+        self.latencias = latencias
+        self.pensar = pensar # Segundos entre uma resposta e o próximo comando (um jogador de verdade)
+        self.tela = ""
+
+    async def receber(self) -> str:
+        dados = await self.reader.readuntil(FIM_PROMPT)
+        self.tela = _ANSI.sub("", dados[:-len(FIM_PROMPT)].decode("utf-8", errors="replace"))
+        return self.tela
+
+    async def enviar(self, linha: str) -> str:
+        if self.pensar:
+            await asyncio.sleep(self.pensar * random.uniform(0.5, 1.5))
+        inicio = time.perf_counter()
+        self.writer.write(linha.encode("utf-8") + b"\r\n")
+        await self.writer.drain()
+        await self.receber()
+        self.latencias.append(time.perf_counter() - inicio)
+        return self.tela
+
+    async def jogar(self, indice: int, missoes: int, ranking: bool) -> None:
+        await self.receber()
+        # Criação: nome, classe, confirmar, voltar
+        for linha in ("1", "1", f"Carga{indice}", "2", CLASSES[indice % 3], "5", "0"):
+            await self.enviar(linha)
+        for _ in range(missoes):
+            await self.enviar("2")
+            tela = await self.enviar("3")
+            # Combate: ataca (escolhendo o primeiro alvo em hordas) até voltar ao menu de missão
+            while "Missão & Combate" not in tela:
+                tela = await self.enviar("1")
+            await self.enviar("0")
+        if ranking:
+            # O ranking relê os saves que mudaram: com milhares de sessões é o passo mais pesado
+            await self.enviar("6")
+            await self.enviar("") # Sai do ranking
+        self.writer.write(b"0\r\n")
+        await self.writer.drain()
+        await self.reader.read() # Até o servidor fechar
+        self.writer.close()
+
+
+async def rodar_carga(host: str, porta: int, clientes: int, missoes: int,
+                      ranking: bool = False, pensar: float = 0.0) -> tuple[list[float], float]:
+    latencias: list[float] = []
+
+    async def um_cliente(indice: int) -> None:
+        if pensar:
+            await asyncio.sleep(random.uniform(0, pensar)) # Jogadores não chegam todos no mesmo instante
+        reader, writer = await asyncio.open_connection(host, porta, limit=1 << 20)
+        await Cliente(reader, writer, latencias, pensar).jogar(indice, missoes, ranking)
+
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(*(um_cliente(i) for i in range(clientes)), return_exceptions=True)
+    duracao = time.perf_counter() - inicio
+    falhas = [r for r in resultados if isinstance(r, BaseException)]
+    if falhas:
+        print(f"{len(falhas)} clientes falharam (ex: {falhas[0]!r})")
+    return latencias, duracao
+
+
+def percentil(valores: list[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+def _porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _subir_servidor(pasta: str, porta: int, max_sessoes: int) -> subprocess.Popen:
+    processo = subprocess.Popen(
+        [sys.executable, os.path.join(RAIZ, "servidor.py"), "--porta", str(porta), "--pausas", "0",
+         "--max-sessoes", str(max_sessoes)],
+        cwd=pasta, stdout=subprocess.PIPE, text=True)
+    processo.stdout.readline() # "Servidor ouvindo em ..."
+    return processo
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Carga no servidor: clientes simultâneos e latência p50/p99")
+    parser.add_argument("--clientes", type=int, default=300)
+    parser.add_argument("--missoes", type=int, default=3, help="missões por cliente")
+    parser.add_argument("--ranking", action="store_true", help="cada cliente também abre o ranking")
+    parser.add_argument("--pensar", type=float, default=0.0,
+                        help="segundos de espera antes de cada comando (0 = carga máxima)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=None, help="servidor já rodando (padrão: sobe um)")
+    args = parser.parse_args()
+
+    processo = pasta = None
+    porta = args.porta
+    if porta is None:
+        pasta = tempfile.TemporaryDirectory()
+        porta = _porta_livre()
+        processo = _subir_servidor(pasta.name, porta, max(args.clientes, 1))
+    try:
+        latencias, duracao = asyncio.run(rodar_carga(args.host, porta, args.clientes, args.missoes,
+                                                  args.ranking, args.pensar))
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait()
+            pasta.cleanup()
+
+    if not latencias:
+        print("Nenhuma resposta medida.")
+        return
+    print(f"{args.clientes} clientes, {len(latencias)} respostas em {duracao:.1f}s "
+          f"({len(latencias) / duracao:.0f} respostas/s)")
+    print(f"latência p50 {percentil(latencias, 50) * 1000:.2f} ms | "
+          f"p99 {percentil(latencias, 99) * 1000:.2f} ms | máx {max(latencias) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Callable
+
+# Permite rodar direto da pasta do projeto: python benchmarks/bench_suite.py
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from models.personagem import Personagem, criar_personagem
+from models.catalogo import carregar, catalogo
+from models.missao import Missao
+from models.politicas import PoliticaAtacar
+from utils.logger import Logger
+from utils.ranking import IndiceRanking
+from utils.repositorio import BACKENDS, Repositorio, criar_repositorio
+from utils.terminal import Console, usar_console, restaurar_console
+from jogo import Jogo
+from bench_importacao import primeiro_menu
+
+# Suíte dos caminhos quentes do jogo. Cada caso devolve vazões (operações por segundo, maior é
+# melhor); cada caso roda --repeticoes vezes e fica a melhor, para filtrar o ruído da máquina.
+#
+#   python benchmarks/bench_suite.py --salvar                 grava benchmarks/baseline.json
+#   python benchmarks/bench_suite.py --comparar               compara com ele (sai com 1 se piorou)
+#   python benchmarks/bench_suite.py --casos batalhas xp      só alguns casos
+#
+# Tudo roda numa pasta temporária (saves, ranking, log): a pasta dados/ do projeto não é tocada.
+# O baseline só vale na máquina (e no Python) em que foi gravado.
+
+BASELINE = os.path.join(RAIZ, "benchmarks", "baseline.json")
+LIMITE_PADRAO = 0.10 # Queda de vazão acima disso conta como regressão
+
+
+class ConsoleMudo(Console):
+    #Descarta a saída dos menus e responde Enter a qualquer pergunta (sai do ranking).
+    def escrever(self, texto: str) -> None:
+        pass
+
+    def ler(self, prompt: str) -> str:
+        return ""
+
+    def pausar(self, segundos: float) -> None:
+        pass
+
+
+def _vazao(funcao: Callable[[], object], n: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(n):
+        funcao()
+    return n / (time.perf_counter() - inicio)
+
+
+def personagem_carregado(itens: int = 50) -> Personagem:
+    p = criar_personagem("Arqueiro", "Benchmark", 20)
+    cat = catalogo() # Itens do catálogo: o save guarda só o id de cada um
+    modelos = [cat.item_por_id(ident) for ident in ("pocao_pequena", "essencia_de_mana", "machado_de_orc", "elmo_de_pedra")]
+    for i in range(itens):
+        p.adicionar_item(modelos[i % len(modelos)]) # Os repetidos viram pilhas
+    p.equipamentos["arma"] = cat.item_por_id("arco_elfico")
+    p.invalidar_stats()
+    return p
+
+
+# --- Casos ---
+
+def caso_batalhas(escala: float) -> dict[str, float]:
+    # Combate headless (Missao.simular, o mesmo laço do executar sem a tela), 1 a 4 inimigos
+    n = max(1, int(300 * escala))
+    politica = PoliticaAtacar()
+    turnos = 0
+    inicio = time.perf_counter()
+    for semente in range(n):
+        p = criar_personagem("Guerreiro", "Bench", 10)
+        turnos += Missao("Média", "Floresta", semente=semente, quantidade=1 + semente % 4).simular(p, politica).turnos
+    duracao = time.perf_counter() - inicio
+    return {"batalhas_por_s": n / duracao, "turnos_por_s": turnos / duracao}
+
+
+def caso_xp(escala: float) -> dict[str, float]:
+    # Do nível 1 direto para um nível alto, com e sem as mensagens de cada nível
+    n = max(1, int(2000 * escala))
+    com_logs = _vazao(lambda: criar_personagem("Mago", "Bench").ganhar_xp(10**9), max(1, n // 10))
+    sem_logs = _vazao(lambda: criar_personagem("Mago", "Bench").ganhar_xp(10**9, logs=False), n)
+    return {"ganhar_xp_por_s": com_logs, "ganhar_xp_sem_logs_por_s": sem_logs}
+
+
+def caso_dict(escala: float) -> dict[str, float]:
+    n = max(1, int(5000 * escala))
+    p = personagem_carregado()
+    dados = p.to_dict()
+    return {"to_dict_por_s": _vazao(p.to_dict, n),
+            "from_dict_por_s": _vazao(lambda: Personagem.from_dict(dados), n),
+            "ida_e_volta_por_s": _vazao(lambda: Personagem.from_dict(p.to_dict()), n)}
+
+
+def caso_repositorio(escala: float) -> dict[str, float]:
+    n = max(1, int(300 * escala))
+    dados = personagem_carregado().to_dict()
+    resultado = {}
+    for backend in BACKENDS:
+        repo = criar_repositorio(backend)
+        resultado[f"salvar_{backend}_por_s"] = _vazao(lambda: repo.salvar(dados, f"bench_{backend}"), n)
+        resultado[f"carregar_{backend}_por_s"] = _vazao(lambda: repo.carregar(f"bench_{backend}"), n)
+    return resultado
+
+
+def caso_ranking(escala: float) -> dict[str, float]:
+    # Hall da fama com 10 mil saves: frio (índice apagado, relê todos) e quente (nada mudou)
+    total = max(1, int(10_000 * escala))
+    pasta = Repositorio.DIR_SAVES
+    os.makedirs(pasta, exist_ok=True)
+    base = criar_personagem("Guerreiro", "Bench", 5).to_dict()
+    for i in range(total):
+        caminho = os.path.join(pasta, f"ranking{i}.json")
+        if os.path.exists(caminho):
+            continue # Repetição do caso: os saves já estão lá
+        base.update(nome=f"Heroi{i}", xp=(i * 7919) % 100_000, nivel=1 + i % 60)
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(base, f, ensure_ascii=False)
+
+    jogo = Jogo()
+    indice = os.path.join(pasta, IndiceRanking.ARQUIVO)
+    if os.path.exists(indice):
+        os.remove(indice)
+    inicio = time.perf_counter()
+    jogo.exibir_ranking()
+    frio = 1 / (time.perf_counter() - inicio)
+    return {"ranking_frio_por_s": frio, "ranking_quente_por_s": _vazao(jogo.exibir_ranking, 20)}
+
+
+def caso_logger(escala: float) -> dict[str, float]:
+    # Linhas por segundo até estarem no arquivo (registrar + descarregar)
+    n = max(1, int(200_000 * escala))
+    registrar = Logger.registrar
+    inicio = time.perf_counter()
+    for i in range(n):
+        registrar("Turno %d: %s causou %d de dano em %s.", "COMBATE", i, "Goblin", 12, "Bench")
+    Logger.descarregar()
+    return {"linhas_log_por_s": n / (time.perf_counter() - inicio)}
+
+
+def caso_inventario(escala: float) -> dict[str, float]:
+    # Mochila de sobrevivência (centenas de poções): pegar loot, usar poção no combate
+    # (lista de pilhas + uso) e trocar de arma
+    n = max(1, int(20_000 * escala))
+    p = personagem_carregado(500)
+    cat = catalogo()
+    pocao, machado, arco = (cat.item_por_id(i) for i in ("pocao_pequena", "machado_de_orc", "arco_elfico"))
+
+    def usar_pocao():
+        p.usar_item(p.inventario.consumiveis()[0])
+        p.adicionar_item(pocao)
+
+    def trocar_arma():
+        p.equipar_item(machado if p.equipamentos["arma"] is arco else arco)
+
+    return {"loot_por_s": _vazao(lambda: p.adicionar_item(pocao), n),
+            "usar_pocao_por_s": _vazao(usar_pocao, n),
+            "equipar_por_s": _vazao(trocar_arma, n)}
+
+
+def caso_catalogo(escala: float) -> dict[str, float]:
+    # Carga do conteúdo (conteudo/*.json): do cache compilado e recompilando os JSON
+    n = max(1, int(1000 * escala))
+    return {"catalogo_cache_por_s": _vazao(carregar, n),
+            "catalogo_json_por_s": _vazao(lambda: carregar(usar_cache=False), n)}
+
+
+def caso_partida(escala: float) -> dict[str, float]:
+    # Processo novo do main.py até o primeiro menu (melhor de N; ver bench_importacao.py)
+    return {"partidas_por_s": 1000 / primeiro_menu(max(3, int(10 * escala)))}
+
+
+CASOS: dict[str, Callable[[float], dict[str, float]]] = {
+    "batalhas": caso_batalhas,
+    "xp": caso_xp,
+    "dict": caso_dict,
+    "repositorio": caso_repositorio,
+    "ranking": caso_ranking,
+    "logger": caso_logger,
+    "inventario": caso_inventario,
+    "catalogo": caso_catalogo,
+    "partida": caso_partida,
+}
+
+
+def rodar(casos: list[str], escala: float, repeticoes: int) -> dict[str, float]:
+    resultados: dict[str, float] = {}
+    token = usar_console(ConsoleMudo())
+    try:
+        for nome in casos:
+            melhores: dict[str, float] = {}
+            for _ in range(repeticoes):
+                for metrica, valor in CASOS[nome](escala).items():
+                    melhores[metrica] = max(valor, melhores.get(metrica, 0.0))
+            for metrica, valor in melhores.items():
+                resultados[f"{nome}.{metrica}"] = valor
+                print(f"{nome + '.' + metrica:<42} {valor:>14,.1f}")
+    finally:
+        restaurar_console(token)
+    return resultados
+
+
+def comparar(resultados: dict[str, float], baseline: dict, limite: float) -> list[str]:
+    #Imprime a variação de cada métrica e devolve as que caíram mais que o limite.
+    regressoes = []
+    anteriores = baseline["resultados"]
+    print(f"\n{'métrica':<42} {'baseline':>14} {'atual':>14} {'variação':>9}")
+    for metrica, valor in resultados.items():
+        anterior = anteriores.get(metrica)
+        if not anterior:
+            print(f"{metrica:<42} {'-':>14} {valor:>14,.1f} {'novo':>9}")
+            continue
+        variacao = valor / anterior - 1
+        marca = ""
+        if variacao < -limite:
+            regressoes.append(metrica)
+            marca = "  <-- REGRESSÃO"
+        print(f"{metrica:<42} {anterior:>14,.1f} {valor:>14,.1f} {variacao:>+8.1%}{marca}")
+    return regressoes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks com baseline em JSON")
+    parser.add_argument("--casos", nargs="+", choices=list(CASOS), default=list(CASOS))
+    parser.add_argument("--escala", type=float, default=1.0, help="multiplica o tamanho de cada caso")
+    parser.add_argument("--repeticoes", type=int, default=3, help="fica a melhor de N rodadas")
+    parser.add_argument("--salvar", nargs="?", const=BASELINE, metavar="ARQUIVO", help="grava o baseline")
+    parser.add_argument("--comparar", nargs="?", const=BASELINE, metavar="ARQUIVO", help="compara com o baseline")
+    parser.add_argument("--limite", type=float, default=LIMITE_PADRAO,
+                        help="queda tolerada antes de acusar regressão (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.comparar:
+        with open(args.comparar, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("escala") != args.escala:
+            print(f"Aviso: baseline gravado com --escala {baseline.get('escala')}, comparando com {args.escala}")
+
+    Logger.configurar(nivel="DEBUG")
+    destino = os.path.abspath(args.salvar) if args.salvar else None
+    with tempfile.TemporaryDirectory() as pasta:
+        anterior = os.getcwd()
+        os.chdir(pasta) # dados/ (saves, ranking.idx, jogo.log) fica na pasta temporária
+        try:
+            resultados = rodar(args.casos, args.escala, args.repeticoes)
+            Logger.encerrar() # Fecha o jogo.log antes de apagar a pasta
+        finally:
+            os.chdir(anterior)
+
+    if destino:
+        with open(destino, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "maquina": platform.machine(),
+                       "data": time.strftime("%Y-%m-%d %H:%M:%S"), "escala": args.escala,
+                       "resultados": resultados}, f, indent=4, ensure_ascii=False)
+        print(f"\nBaseline gravado em {destino}")
+    if baseline is not None:
+        regressoes = comparar(resultados, baseline, args.limite)
+        if regressoes:
+            print(f"\n{len(regressoes)} métrica(s) abaixo do baseline em mais de {args.limite:.0%}.")
+            sys.exit(1)
+        print("\nSem regressões.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,21 @@
 from __future__ import annotations
-import glob
-import os
-import json
-import time
-import random
-from models.personagem import Personagem, Guerreiro, Mago, Arqueiro, ARVORE_EVOLUCAO
-from models.missao import Missao
-from utils.repositorio import Repositorio
-
-# Cores para o terminal (para ficar bonito)
-class Cor:
-    VERMELHO = '\033[91m'
-    VERDE = '\033[92m'
-    AMARELO = '\033[93m'
-    AZUL = '\033[94m'
-    RESET = '\033[0m'
+from typing import TYPE_CHECKING
+from utils.backends import criar_repositorio
+from utils.terminal import Cor, escrever, ler, pausar
+
+# Personagens, missões (com todos os inimigos) e a persistência são importados no primeiro uso,
+# dentro dos métodos: o menu principal aparece sem carregar nada disso. Personagem só é
+# importado para os verificadores de tipo (a anotação de Jogo.jogador)
+if TYPE_CHECKING:
+    from models.personagem import Personagem
 
 class Jogo:
-    def __init__(self) -> None:
+    def __init__(self, backend: str = "json", sufixo_saves: str = "") -> None:
         self.jogador: Personagem | None = None
+        self.backend = backend # "json" / "binario" (um arquivo por save) ou "sqlite"
+        # Save rápido e autosave: no servidor cada sessão tem os seus (sufixo por sessão)
+        self.nome_quick_save = "quick_save" + sufixo_saves
+        self.nome_autosave = "autosave" + sufixo_saves
         
         self.dados_criacao = {
             "nome": "",
@@ -45,17 +42,17 @@ class Jogo:
             classe_exibir = self.dados_criacao["classe_str"] or "(não definido)"
             
             if self.jogador:
-                print(f"\nPersonagem Ativo: {Cor.AZUL}{self.jogador.nome}{Cor.RESET} [{type(self.jogador).__name__}]")
+                escrever(f"\nPersonagem Ativo: {Cor.AZUL}{self.jogador.nome}{Cor.RESET} [{type(self.jogador).__name__}]")
                 
-            print("\n=== Criar/Substituir Personagem ===")
-            print(f"Nome: {nome_exibir} | Classe: {classe_exibir}")
-            print("[1] Definir nome")
-            print("[2] Escolher classe")
-            print("[3] Ver Preview de Habilidades")
-            print("[4] Ajuda")
-            print("[5] Confirmar e Criar")
-            print("[0] Voltar")
-            op = input("> ").strip()
+            escrever("\n=== Criar/Substituir Personagem ===")
+            escrever(f"Nome: {nome_exibir} | Classe: {classe_exibir}")
+            escrever("[1] Definir nome")
+            escrever("[2] Escolher classe")
+            escrever("[3] Ver Preview de Habilidades")
+            escrever("[4] Ajuda")
+            escrever("[5] Confirmar e Criar")
+            escrever("[0] Voltar")
+            op = ler("> ").strip()
 
             if op == "1":
                 self._definir_nome()
@@ -70,38 +67,38 @@ class Jogo:
             elif op == "0":
                 break
             else:
-                print("Opção inválida.")
+                escrever("Opção inválida.")
 
     def _definir_nome(self) -> None:
-        nome = input("Digite o nome do personagem: ").strip()
+        nome = ler("Digite o nome do personagem: ").strip()
         if nome:
             self.dados_criacao["nome"] = nome
 
     def _escolher_arquetipo(self) -> None:
-        print("\nClasses disponíveis:")
-        print("[1] Guerreiro (Tanque/Físico)")
-        print("[2] Mago (Frágil/Dano Mágico)")
-        print("[3] Arqueiro (Equilibrado)")
-        escolha = input("> ").strip()
+        escrever("\nClasses disponíveis:")
+        escrever("[1] Guerreiro (Tanque/Físico)")
+        escrever("[2] Mago (Frágil/Dano Mágico)")
+        escrever("[3] Arqueiro (Equilibrado)")
+        escolha = ler("> ").strip()
 
         mapa = {"1": "Guerreiro", "2": "Mago", "3": "Arqueiro"}
         classe_escolhida = mapa.get(escolha)
         
         if classe_escolhida:
             self.dados_criacao["classe_str"] = classe_escolhida
-            print(f"Classe selecionada: {classe_escolhida}")
+            escrever(f"Classe selecionada: {classe_escolhida}")
         else:
-            print("Opção inválida.")
+            escrever("Opção inválida.")
 
     def _menu_preview_classes(self) -> None:
         while True:
-            print("\n=== Guia de Classes e Evolução ===")
-            print("Veja o que cada classe ganha até o nível 20.")
-            print("[1] Guerreiro")
-            print("[2] Mago")
-            print("[3] Arqueiro")
-            print("[0] Voltar")
-            op = input("> ").strip()
+            escrever("\n=== Guia de Classes e Evolução ===")
+            escrever("Veja o que cada classe ganha até o nível 20.")
+            escrever("[1] Guerreiro")
+            escrever("[2] Mago")
+            escrever("[3] Arqueiro")
+            escrever("[0] Voltar")
+            op = ler("> ").strip()
             
             mapa = {"1": "Guerreiro", "2": "Mago", "3": "Arqueiro"}
             classe = mapa.get(op)
@@ -111,15 +108,16 @@ class Jogo:
             elif op == "0":
                 break
             else:
-                print("Inválido.")
+                escrever("Inválido.")
 
     def _mostrar_arvore_detalhada(self, nome_classe: str):
+        from models.personagem import ARVORE_EVOLUCAO
         dados = ARVORE_EVOLUCAO.get(nome_classe)
         stats = dados["status_base"]
         
-        print(f"\n{Cor.AMARELO}>>> EVOLUÇÃO: {nome_classe.upper()} <<<{Cor.RESET}")
-        print(f"Ganho fixo por nível: +{stats['vida']} HP | +{stats['mana']} MP | +{stats['ataque']} ATK | +{stats['defesa']} DEF")
-        print("-" * 60)
+        escrever(f"\n{Cor.AMARELO}>>> EVOLUÇÃO: {nome_classe.upper()} <<<{Cor.RESET}")
+        escrever(f"Ganho fixo por nível: +{stats['vida']} HP | +{stats['mana']} MP | +{stats['ataque']} ATK | +{stats['defesa']} DEF")
+        escrever("-" * 60)
         
         for nivel in range(1, 21):
             info = dados.get(nivel)
@@ -128,39 +126,41 @@ class Jogo:
                 prefixo = "[HABILIDADE]" if info['tipo'] == 'skill' else "[PASSIVA]"
                 cor_txt = Cor.VERDE if info['tipo'] == 'skill' else Cor.AZUL
                 
-                print(f"Nível {nivel:02d}: {cor_txt}{prefixo} {info['nome']}{Cor.RESET}")
-                print(f"          Descrição: {info['desc']}")
+                escrever(f"Nível {nivel:02d}: {cor_txt}{prefixo} {info['nome']}{Cor.RESET}")
+                escrever(f"          Descrição: {info['desc']}")
                 if 'custo' in info:
-                    print(f"          Custo: {info['custo']} MP")
-                print("-" * 60)
+                    escrever(f"          Custo: {info['custo']} MP")
+                escrever("-" * 60)
             else:
                 # Nível Comum
-                # print(f"Nível {nivel:02d}: Aumento de Status Padrão")
+                # escrever(f"Nível {nivel:02d}: Aumento de Status Padrão")
                 pass
         
-        input("[Pressione Enter para voltar]")
+        ler("[Pressione Enter para voltar]")
 
     def _confirmar_criacao(self) -> None:
         nome = self.dados_criacao["nome"]
         classe_str = self.dados_criacao["classe_str"]
 
         if not nome or not classe_str:
-            print("Erro: Defina NOME e CLASSE antes de confirmar.")
+            escrever("Erro: Defina NOME e CLASSE antes de confirmar.")
             return
 
+        from models.personagem import Guerreiro, Mago, Arqueiro
         if classe_str == "Guerreiro":
             self.jogador = Guerreiro(nome)
         elif classe_str == "Mago":
             self.jogador = Mago(nome)
         elif classe_str == "Arqueiro":
             self.jogador = Arqueiro(nome)
+        self._ultimo_save = None # Personagem novo: o autosave não pode cair no save de outro
         
-        print(f"\n✨ Personagem {self.jogador.nome} criado com sucesso!")
+        escrever(f"\n✨ Personagem {self.jogador.nome} criado com sucesso!")
 
     def _ajuda_criar_personagem(self) -> None:
-        print("\nAjuda — Criar Personagem")
-        print("- Defina um nome e um arquétipo para continuar.")
-        print("- Ao confirmar, um novo personagem nível 1 será gerado.")
+        escrever("\nAjuda — Criar Personagem")
+        escrever("- Defina um nome e um arquétipo para continuar.")
+        escrever("- Ao confirmar, um novo personagem nível 1 será gerado.")
 
     # --------------------------------------------------------------------------
     # MENU: MISSÃO (COM MODO SOBREVIVÊNCIA)
@@ -171,15 +171,15 @@ class Jogo:
     # drops que voce coletou (se digitar outra voce perde a fogueira e vai para a proxima batalha)
     def menu_missao(self) -> None:
         while True:
-            print("\n=== Missão & Combate ===")
-            print(f"Configuração Atual: [{self.missao_config['dificuldade']}] em [{self.missao_config['cenario']}]")
-            print("[1] Escolher dificuldade")
-            print("[2] Escolher cenário")
-            print(f"[3] Iniciar Missão Única")
-            print(f"{Cor.VERMELHO}[4] Modo Sobrevivência (Múltiplas Missões){Cor.RESET}")
-            print("[5] Ajuda")
-            print("[0] Voltar")
-            op = input("> ").strip()
+            escrever("\n=== Missão & Combate ===")
+            escrever(f"Configuração Atual: [{self.missao_config['dificuldade']}] em [{self.missao_config['cenario']}]")
+            escrever("[1] Escolher dificuldade")
+            escrever("[2] Escolher cenário")
+            escrever(f"[3] Iniciar Missão Única")
+            escrever(f"{Cor.VERMELHO}[4] Modo Sobrevivência (Múltiplas Missões){Cor.RESET}")
+            escrever("[5] Ajuda")
+            escrever("[0] Voltar")
+            op = ler("> ").strip()
 
             if op == "1":
                 self._escolher_dificuldade()
@@ -194,91 +194,100 @@ class Jogo:
             elif op == "0":
                 break
             else:
-                print("Opção inválida.")
+                escrever("Opção inválida.")
 
     def _escolher_dificuldade(self) -> None:
-        print("\nDificuldades:")
-        print("[1] Fácil")
-        print("[2] Média")
-        print("[3] Difícil")
-        op = input("> ").strip()
+        escrever("\nDificuldades:")
+        escrever("[1] Fácil")
+        escrever("[2] Média")
+        escrever("[3] Difícil")
+        op = ler("> ").strip()
         mapa = {"1": "Fácil", "2": "Média", "3": "Difícil"}
         dif = mapa.get(op)
         if dif:
             self.missao_config["dificuldade"] = dif
-            print(f"Dificuldade definida: {dif}")
+            escrever(f"Dificuldade definida: {dif}")
 
     def _escolher_cenario(self) -> None:
-        print("\nCenários:")
-        print("[1] Floresta")
-        print("[2] Trilha")
-        print("[3] Caverna")
-        print("[4] Ruínas")
-        op = input("> ").strip()
-        mapa = {"1": "Floresta", "2": "Trilha", "3": "Caverna", "4": "Ruínas"}
+        # Os cenários são os de conteudo/spawn.json, na ordem do arquivo
+        from models.catalogo import catalogo
+        cenarios = list(catalogo().spawn)
+        escrever("\nCenários:")
+        for i, nome in enumerate(cenarios, 1):
+            escrever(f"[{i}] {nome}")
+        op = ler("> ").strip()
+        mapa = {str(i): nome for i, nome in enumerate(cenarios, 1)}
         cen = mapa.get(op)
         if cen:
             self.missao_config["cenario"] = cen
-            print(f"Cenário definido: {cen}")
+            escrever(f"Cenário definido: {cen}")
 
     def _iniciar_missao_unica(self) -> None:
         if not self.jogador:
-            print("Crie um personagem primeiro.")
+            escrever("Crie um personagem primeiro.")
             return
 
         dificuldade = self.missao_config["dificuldade"]
         cenario = self.missao_config["cenario"]
         
         # Cria e executa a missão
+        from models.missao import Missao
         missao = Missao(dificuldade, cenario)
         missao.executar(self.jogador)
         
-        if not self.jogador.vivo:
-            print(f"{Cor.VERMELHO}Game Over.{Cor.RESET}")
+        if self.jogador.vivo:
+            self._autosalvar()
+        else:
+            escrever(f"{Cor.VERMELHO}Game Over.{Cor.RESET}")
             self.jogador = None
 
     def _iniciar_modo_sobrevivencia(self) -> None:
 
         if not self.jogador:
-            print("Crie um personagem primeiro.")
+            escrever("Crie um personagem primeiro.")
             return
 
-        print(f"\n{Cor.VERMELHO}=== ⚔️ MODO SOBREVIVÊNCIA INICIADO ⚔️ ==={Cor.RESET}")
-        print("Você viajará por várias terras. Se morrer, perde o personagem.")
-        print("Entre as batalhas, você poderá descansar.")
-        time.sleep(1)
+        import random
+        from models.missao import Missao, PESOS_SPAWN, tamanho_onda
+        from models.personagem import ARVORE_EVOLUCAO
+
+        escrever(f"\n{Cor.VERMELHO}=== ⚔️ MODO SOBREVIVÊNCIA INICIADO ⚔️ ==={Cor.RESET}")
+        escrever("Você viajará por várias terras. Se morrer, perde o personagem.")
+        escrever("Entre as batalhas, você poderá descansar.")
+        pausar(1)
 
         rodada = 1
-        cenarios_disponiveis = ["Floresta", "Trilha", "Caverna", "Ruínas"]
+        cenarios_disponiveis = list(PESOS_SPAWN) # Todos os de conteudo/spawn.json
         
         while self.jogador.vivo:
             # Escolhe um cenário aleatório para dar variedade
             cenario_atual = random.choice(cenarios_disponiveis)
             dificuldade = self.missao_config["dificuldade"] # Mantém a dif escolhida
 
-            print(f"\n>>> {Cor.AMARELO}RODADA {rodada}{Cor.RESET} - Viajando para: {cenario_atual} <<<")
-            time.sleep(1)
+            escrever(f"\n>>> {Cor.AMARELO}RODADA {rodada}{Cor.RESET} - Viajando para: {cenario_atual} <<<")
+            pausar(1)
 
-            # Executa a missão
-            missao = Missao(dificuldade, cenario_atual)
+            # Executa a missão: a onda de inimigos cresce com as rodadas
+            missao = Missao(dificuldade, cenario_atual, quantidade=tamanho_onda(rodada))
             resultado = missao.executar(self.jogador)
 
             # Se morreu, acaba tudo
             if not self.jogador.vivo:
-                print(f"\n{Cor.VERMELHO}Sua jornada acabou na rodada {rodada}.{Cor.RESET}")
+                escrever(f"\n{Cor.VERMELHO}Sua jornada acabou na rodada {rodada}.{Cor.RESET}")
                 self.jogador = None
                 break
+            self._autosalvar()
 
             # Se venceu, aparece a FOGUEIRA
-            print(f"\n{Cor.AMARELO}🔥 Você encontra uma Fogueira segura... 🔥{Cor.RESET}")
-            print(f"Status: {self.jogador.barra_hp()} | MP: {self.jogador._atrib.mana}")
-            print("[1] Descansar (Recuperar Vida e Mana) e Continuar")
-            print("[2] Pegar o Loot e Voltar para a Cidade (Sair)")
+            escrever(f"\n{Cor.AMARELO}🔥 Você encontra uma Fogueira segura... 🔥{Cor.RESET}")
+            escrever(f"Status: {self.jogador.barra_hp()} | MP: {self.jogador._atrib.mana}")
+            escrever("[1] Descansar (Recuperar Vida e Mana) e Continuar")
+            escrever("[2] Pegar o Loot e Voltar para a Cidade (Sair)")
             
-            opcao = input("> ").strip()
+            opcao = ler("> ").strip()
             
             if opcao == "1":
-                print("\nVocê senta perto do fogo, come algo e medita...")
+                escrever("\nVocê senta perto do fogo, come algo e medita...")
                 # Recupera Vida (Cura total)
                 recuperado_vida = self.jogador.curar(9999)
                 # Recupera Mana (Simples adição, já que não temos mana_max explícito na base)
@@ -293,26 +302,26 @@ class Jogo:
                 self.jogador._atrib.mana = min(mana_max_estimada, self.jogador._atrib.mana + recuperar_mana)
                 
                 recuperado_mana = self.jogador._atrib.mana - mana_anterior      
-                time.sleep(1)
-                print(f"{Cor.VERDE}Recuperou {recuperado_vida} HP e {recuperado_mana} MP!{Cor.RESET}")
-                print("Preparando para a próxima viagem...")
+                pausar(1)
+                escrever(f"{Cor.VERDE}Recuperou {recuperado_vida} HP e {recuperado_mana} MP!{Cor.RESET}")
+                escrever("Preparando para a próxima viagem...")
                 rodada += 1
-                time.sleep(1)
+                pausar(1)
                 
             elif opcao == "2":
-                print(f"\nVocê decide que já arriscou demais por hoje.")
-                print(f"Retornando vitorioso após {rodada} rodadas!")
+                escrever(f"\nVocê decide que já arriscou demais por hoje.")
+                escrever(f"Retornando vitorioso após {rodada} rodadas!")
                 break
             else:
-                print("Opção inválida. Você fica indeciso e acaba descansando por padrão.")
+                escrever("Opção inválida. Você fica indeciso e acaba descansando por padrão.")
                 self.jogador.curar(9999)
                 rodada += 1
 
     def _ajuda_missao(self) -> None:
-        print("\nAjuda — Missão")
-        print("- Missão Única: Joga no cenário configurado e volta ao menu.")
-        print("- Sobrevivência: Enfrenta inimigos aleatórios em sequência.")
-        print("- A dificuldade afeta a força dos inimigos e a chance de chefes.")
+        escrever("\nAjuda — Missão")
+        escrever("- Missão Única: Joga no cenário configurado e volta ao menu.")
+        escrever("- Sobrevivência: Enfrenta inimigos aleatórios em sequência, em hordas cada vez maiores.")
+        escrever("- A dificuldade afeta a força dos inimigos e a chance de chefes.")
 
     # --------------------------------------------------------------------------
     # MENU: SALVAR
@@ -321,11 +330,11 @@ class Jogo:
     # ou um save com nome definido
     def menu_salvar(self) -> None:
         while True:
-            print("\n=== Salvar ===")
-            print("[1] Salvar rápido")
-            print("[2] Salvar com nome")
-            print("[0] Voltar")
-            op = input("> ").strip()
+            escrever("\n=== Salvar ===")
+            escrever("[1] Salvar rápido")
+            escrever("[2] Salvar com nome")
+            escrever("[0] Voltar")
+            op = ler("> ").strip()
 
             if op == "1":
                 self._salvar_rapido()
@@ -336,19 +345,33 @@ class Jogo:
 
     def _salvar_rapido(self) -> None:
         if not self.jogador: return
-        repo = Repositorio()
-        repo.salvar(self.jogador.to_dict(), "quick_save")
-        self._ultimo_save = "quick_save.json"
+        repo = self._repositorio()
+        repo.salvar(self.jogador.to_dict(), self.nome_quick_save)
+        self.jogador.limpar_sujos()
+        self._ultimo_save = self.nome_quick_save
 
     def _salvar_nomeado(self) -> None:
         if not self.jogador:
-            print("Nenhum personagem para salvar!")
+            escrever("Nenhum personagem para salvar!")
             return
-        nome_arquivo = input("Nome do arquivo de save (ex: save1): ").strip()
+        nome_arquivo = ler("Nome do arquivo de save (ex: save1): ").strip()
         if not nome_arquivo: nome_arquivo = "save_auto"
         
-        repo = Repositorio()
+        repo = self._repositorio()
         repo.salvar(self.jogador.to_dict(), nome_arquivo)
+        self.jogador.limpar_sujos()
+        self._ultimo_save = nome_arquivo
+
+    def _autosalvar(self) -> None:
+        # Depois de cada missão: grava só o que mudou no último save (ou cria o autosave)
+        repo = self._repositorio()
+        if not self._ultimo_save or not repo.salvar_delta(self.jogador.extrair_delta(), self._ultimo_save):
+            self._ultimo_save = self._ultimo_save or self.nome_autosave
+            repo.salvar(self.jogador.to_dict(), self._ultimo_save)
+            self.jogador.limpar_sujos()
+
+    def _repositorio(self):
+        return criar_repositorio(self.backend)
 
     # --------------------------------------------------------------------------
     # MENU: CARREGAR
@@ -356,11 +379,11 @@ class Jogo:
     # carrega um save, podendo carregar o quick save ou um save nomeado
     def menu_carregar(self) -> None:
         while True:
-            print("\n=== Carregar ===")
-            print("[1] Carregar último save")
-            print("[2] Carregar por nome")
-            print("[0] Voltar")
-            op = input("> ").strip()
+            escrever("\n=== Carregar ===")
+            escrever("[1] Carregar último save")
+            escrever("[2] Carregar por nome")
+            escrever("[0] Voltar")
+            op = ler("> ").strip()
 
             if op == "1":
                 self._carregar_ultimo()
@@ -374,21 +397,24 @@ class Jogo:
             self._carregar_arquivo(self._ultimo_save)
         else:
             # Tenta carregar o quick_save padrão
-            self._carregar_arquivo("quick_save.json")
+            self._carregar_arquivo(self.nome_quick_save)
 
     def _carregar_nomeado(self) -> None:
-        nome_arquivo = input("Nome do arquivo para carregar: ").strip()
+        nome_arquivo = ler("Nome do arquivo para carregar: ").strip()
         self._carregar_arquivo(nome_arquivo)
 
     def _carregar_arquivo(self, nome_arquivo: str) -> None:
-        repo = Repositorio()
+        repo = self._repositorio()
         dados = repo.carregar(nome_arquivo)
         if dados:
             try:
+                from models.personagem import Personagem
                 self.jogador = Personagem.from_dict(dados)
-                print(f"✔ Personagem {self.jogador.nome} carregado!")
+                self.jogador.limpar_sujos()
+                self._ultimo_save = nome_arquivo
+                escrever(f"✔ Personagem {self.jogador.nome} carregado!")
             except Exception as e:
-                print(f"Erro ao reconstruir personagem: {e}")
+                escrever(f"Erro ao reconstruir personagem: {e}")
 
     # --------------------------------------------------------------------------
     # MENU: INVENTÁRIO & RANKING
@@ -396,32 +422,34 @@ class Jogo:
     # exibe o inventario do jogador, mostrando os itens utilizaveis em batalha
     # e os itens equipaveis, podendo ser equipaveis
     def menu_inventario(self) -> None:
-        if not self.jogador: return print("Crie um personagem primeiro")
+        if not self.jogador: return escrever("Crie um personagem primeiro")
+        from models.item import Equipamento
         while True:
-            print("\n=== Inventário ===")
+            escrever("\n=== Inventário ===")
             arma = self.jogador.equipamentos['arma'].nome if self.jogador.equipamentos['arma'] else "Mãos nuas"
             armadura = self.jogador.equipamentos['armadura'].nome if self.jogador.equipamentos['armadura'] else "Roupas comuns"
             
-            print(f"Equipado: [⚔️ {arma}] [🛡️ {armadura}]")
-            print(f"Stats: ATK {self.jogador.ataque_total} | DEF {self.jogador.defesa_total}")
+            escrever(f"Equipado: [⚔️ {arma}] [🛡️ {armadura}]")
+            escrever(f"Stats: ATK {self.jogador.ataque_total} | DEF {self.jogador.defesa_total}")
             
-            print("\nMochila:")
-            if not self.jogador.inventario:
-                print("(Vazia)")
+            escrever("\nMochila:")
+            pilhas = self.jogador.inventario.pilhas() # Itens iguais aparecem uma vez, com a quantidade
+            if not pilhas:
+                escrever("(Vazia)")
             else:
-                for i, item in enumerate(self.jogador.inventario):
-                    # Verifica se é Equipamento (tem slot) ou Consumível
-                    if hasattr(item, 'slot'):
+                for i, (item, quantidade) in enumerate(pilhas):
+                    # Verifica se é Equipamento ou Consumível
+                    if isinstance(item, Equipamento):
                         tipo = "Equip"
                         
                         # --- LÓGICA DE CORREÇÃO AQUI ---
                         stats = []
                         # Verifica e adiciona Ataque se for maior que 0
-                        if hasattr(item, 'ataque_bonus') and item.ataque_bonus > 0:
+                        if item.ataque_bonus > 0:
                             stats.append(f"ATK+{item.ataque_bonus}")
                         
                         # Verifica e adiciona Defesa se for maior que 0
-                        if hasattr(item, 'defesa_bonus') and item.defesa_bonus > 0:
+                        if item.defesa_bonus > 0:
                             stats.append(f"DEF+{item.defesa_bonus}")
                         
                         # Junta os stats (ex: "ATK+5 DEF+2") ou coloca traço se não tiver nada
@@ -432,51 +460,47 @@ class Jogo:
                         tipo = "Poção"
                         detalhes = f"Efeito {item.valor_efeito}"
 
-                    print(f"[{i+1}] {item.nome} ({tipo} - {detalhes})")
+                    qtd = f" x{quantidade}" if quantidade > 1 else ""
+                    escrever(f"[{i+1}] {item.nome}{qtd} ({tipo} - {detalhes})")
 
-            print("\n[N] Usar/Equipar item | [0] Voltar")
-            op = input("> ").strip()
+            escrever("\n[N] Usar/Equipar item | [0] Voltar")
+            op = ler("> ").strip()
             if op == "0": break
             
             try:
                 idx = int(op) - 1
-                if 0 <= idx < len(self.jogador.inventario):
-                    item = self.jogador.inventario[idx]
-                    if hasattr(item, 'slot'):
+                if 0 <= idx < len(pilhas):
+                    item = pilhas[idx][0]
+                    if isinstance(item, Equipamento):
                         self.jogador.equipar_item(item)
                     else:
-                        print(item.usar(self.jogador))
-                        self.jogador.inventario.pop(idx)
+                        escrever(self.jogador.usar_item(item))
             except ValueError:
                 pass
 
 # exibe o ranking dos jogadores por xp, ignorando o lv como parametro, 
 #por exemplo um player lv 2 com xp 0 vai está abaixo de um player lv 1 com 50 de xp
-    def exibir_ranking(self) -> None:
-        print("\n=== 🏆 HALL DA FAMA 🏆 ===")
-        caminho_busca = os.path.join("dados", "*.json")
-        arquivos_saves = glob.glob(caminho_busca)
-        
-        placar = []
-
-        for arquivo in arquivos_saves:
-            try:
-                with open(arquivo, "r", encoding="utf-8") as f:
-                    dados = json.load(f)
-                    if "nome" in dados and "xp" in dados:
-                        placar.append(dados)
-            except:
-                continue
+# os dados vêm do índice do repositório (ranking.idx no backend json, consulta indexada no sqlite)
+    def exibir_ranking(self, limite: int = 20) -> None:
+        repo = self._repositorio()
+        classe = None
 
-        placar_ordenado = sorted(placar, key=lambda x: x["xp"], reverse=True)
+        while True:
+            titulo = f" ({classe})" if classe else ""
+            escrever(f"\n=== 🏆 HALL DA FAMA{titulo} 🏆 ===")
+            placar_ordenado = repo.ranking(limite, classe)
 
-        if not placar_ordenado:
-            print("Nenhum registro encontrado.")
-        else:
-            print(f"{'Pos':<4} | {'Nome':<15} | {'Nível':<5} | {'XP':<6}")
-            print("-" * 40)
-            for i, p in enumerate(placar_ordenado):
-                medalha = "🥇" if i==0 else "🥈" if i==1 else "🥉" if i==2 else ""
-                print(f"{i+1:<4} | {p['nome']:<15} | {p['nivel']:<5} | {p['xp']:<6} {medalha}")
-        
-        input("\n[Enter] Voltar...")
\ No newline at end of file
+            if not placar_ordenado:
+                escrever("Nenhum registro encontrado.")
+            else:
+                escrever(f"{'Pos':<4} | {'Nome':<15} | {'Nível':<5} | {'XP':<6}")
+                escrever("-" * 40)
+                for i, p in enumerate(placar_ordenado):
+                    medalha = "🥇" if i==0 else "🥈" if i==1 else "🥉" if i==2 else ""
+                    escrever(f"{i+1:<4} | {p['nome']:<15} | {p['nivel']:<5} | {p['xp']:<6} {medalha}")
+            
+            op = ler("\n[1] Guerreiro [2] Mago [3] Arqueiro [4] Todos | [Enter] Voltar...").strip()
+            mapa = {"1": "Guerreiro", "2": "Mago", "3": "Arqueiro", "4": None}
+            if op not in mapa:
+                break
+            classe = mapa[op]
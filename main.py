@@ -1,19 +1,23 @@
 from __future__ import annotations
+import argparse
 from jogo import Jogo
+from utils.metricas import Metricas
+from utils.backends import BACKENDS
+from utils.terminal import escrever, ler, configurar_terminal
 
 
-def menu() -> None:
-    jogo = Jogo()
+def menu(backend: str = "json", sufixo_saves: str = "") -> None:
+    jogo = Jogo(backend, sufixo_saves)
     while True:
-        print("\n=== RPG OO — Menu Principal ===")
-        print("[1] Criar personagem")
-        print("[2] Encarar missão")
-        print("[3] Inventário")
-        print("[4] Salvar")
-        print("[5] Carregar")
-        print("[6] Ranking de XP")
-        print("[0] Sair")
-        op = input("> ").strip()
+        escrever("\n=== RPG OO — Menu Principal ===")
+        escrever("[1] Criar personagem")
+        escrever("[2] Encarar missão")
+        escrever("[3] Inventário")
+        escrever("[4] Salvar")
+        escrever("[5] Carregar")
+        escrever("[6] Ranking de XP")
+        escrever("[0] Sair")
+        op = ler("> ").strip()
 
         if op == "1":
             jogo.menu_criar_personagem()
@@ -28,11 +32,24 @@ def menu() -> None:
         elif op == "6":
             jogo.exibir_ranking()
         elif op == "0":
-            print("Até logo!")
+            escrever("Até logo!")
             break
         else:
-            print("Opção inválida.")
+            escrever("Opção inválida.")
 
 
 if __name__ == "__main__":
-    menu()
+    parser = argparse.ArgumentParser(description="RPG OO")
+    parser.add_argument("--backend", choices=BACKENDS, default="json",
+                        help="onde guardar os saves (padrão: um .json por save em dados/)")
+    # Sem as opções: cores só num terminal de verdade (pipe/arquivo ou NO_COLOR saem sem ANSI)
+    parser.add_argument("--sem-cor", action="store_true", help="texto puro, sem códigos de cor ANSI")
+    parser.add_argument("--sem-quadros", action="store_true",
+                        help="não desenha o quadro de status (barras de HP) a cada turno do combate")
+    parser.add_argument("--metricas", metavar="ARQUIVO",
+                        help="coleta métricas e grava ARQUIVO.prom e ARQUIVO.json ao sair (ex: dados/metricas)")
+    args = parser.parse_args()
+    if args.metricas:
+        Metricas.ativar(args.metricas)
+    configurar_terminal(cores=False if args.sem_cor else None, quadros=not args.sem_quadros)
+    menu(args.backend)
@@ -1,23 +1,51 @@
 from __future__ import annotations
-from dataclasses import dataclass
+import random
+from dataclasses import dataclass, field, fields
+from utils.terminal import barra
 
 
-@dataclass
+@dataclass(slots=True)
 class Atributos:
     vida: int
     ataque: int
     defesa: int
     mana: int = 0
     vida_max: int | None = None
+    # Valores no último save (autosave incremental): as mudanças saem da comparação com eles
+    # na hora de salvar, e as escritas no combate não pagam nada. None = sem rastreio (inimigos)
+    _salvo: dict[str, int] | None = field(default=None, init=False, repr=False, compare=False)
+
+    def rastrear_mudancas(self) -> None:
+        #Toma os valores atuais como os salvos: daqui em diante só o que mudar conta.
+        self._salvo = self.to_dict()
+
+    def to_dict(self) -> dict[str, int]:
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+    def extrair_sujos(self) -> dict[str, int]:
+        #Só os campos que mudaram desde o último save (e passa a contar os atuais como salvos).
+        if self._salvo is None:
+            return {}
+        atual = self.to_dict()
+        alterados = {nome: valor for nome, valor in atual.items() if self._salvo.get(nome) != valor}
+        self._salvo = atual
+        return alterados
 
 
 class Entidade:
+    # __slots__ em toda a hierarquia: sem __dict__ por instância (simulações mantêm milhões de entidades vivas)
+    __slots__ = ("_nome", "_atrib", "narrador", "rng")
 
     def __init__(self, nome: str, atrib: Atributos):
         self._nome = nome
         if atrib.vida_max is None:
             atrib.vida_max = atrib.vida
         self._atrib = atrib
+        # Saída das mensagens de combate (crítico, esquiva...). None = modo silencioso
+        self.narrador = print
+        # Fonte de aleatoriedade (random.Random ou o próprio módulo random). A Missao troca
+        # pela sua, com semente, durante o combate para a batalha poder ser reproduzida
+        self.rng = random
 
     @property
     def nome(self) -> str:
@@ -27,6 +55,9 @@ class Entidade:
     def vivo(self) -> bool:
         return self._atrib.vida > 0
 
+    def _narrar(self, texto: str) -> None:
+        if self.narrador: self.narrador(texto)
+
     def atacar(self) -> int:
         return self._atrib.ataque
 
@@ -38,5 +69,6 @@ class Entidade:
     def barra_hp(self, largura: int = 20) -> str:
         v = max(0, self._atrib.vida)
         vmax = max(1, self._atrib.vida_max)
-        cheio = int(largura * v / vmax)
-        return "[" + "#" * cheio + "-" * (largura - cheio) + f"] {v}/{vmax} HP"
+        # Vida acima do máximo (cura de alguns inimigos) não estoura a barra
+        cheio = min(largura, int(largura * v / vmax))
+        return f"{barra(largura, cheio)} {v}/{vmax} HP"
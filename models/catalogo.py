@@ -0,0 +1,214 @@
+from __future__ import annotations
+import hashlib
+import marshal
+import os
+import sys
+from array import array
+from .item import Equipamento, Consumivel
+
+# Catálogo do conteúdo do jogo: classes (atributos iniciais e árvore de evolução), itens,
+# inimigos e spawn vêm dos JSON de conteudo/ e são compilados numa estrutura indexada:
+# cada espécie de inimigo e cada item ganha um ID inteiro (a posição no catálogo), as
+# referências entre arquivos (loot, spawn) já saem resolvidas para esses IDs e os status
+# dos inimigos ficam lado a lado num array de inteiros.
+#
+# O resultado compilado vai para conteudo/__cache__/ (marshal, como os .pyc), com o hash dos
+# JSON no nome: as próximas partidas só leem os bytes, conferem o hash e pulam o parse.
+# Mudou um JSON, muda o hash e o cache antigo é trocado sozinho.
+#
+# Para conferir o conteúdo depois de editar: python -m models.catalogo
+
+PASTA_CONTEUDO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "conteudo")
+ARQUIVOS = ("classes.json", "itens.json", "inimigos.json", "spawn.json")
+FORMATO = 1 # Sobe quando compilar() muda o que produz: invalida os caches antigos
+
+# Colunas de Catalogo.stats (STATS inteiros por espécie, na ordem dos IDs)
+VIDA, ATAQUE, DEFESA, XP = range(4)
+STATS = 4
+
+
+class Catalogo:
+    #Conteúdo compilado, só leitura (compartilhado por todas as missões e sessões do processo).
+    __slots__ = ("versao", "arvore", "atributos", "ids_itens", "itens", "indice_itens",
+                 "objetos_itens", "_internados", "especies", "indice_especies", "nomes", "stats",
+                 "loot", "efeitos", "especial", "comportamento", "chefes", "spawn")
+
+    def __init__(self, versao: str, dados: dict):
+        self.versao = versao
+        # Classe -> {nível: recompensa, "status_base": ganho por nível} (o antigo ARVORE_EVOLUCAO)
+        self.arvore: dict[str, dict] = dados["arvore"]
+        self.atributos: dict[str, tuple[int, int, int, int]] = dados["atributos"] # (vida, ataque, defesa, mana)
+        # Itens: ("Equipamento", nome, slot, ataque, defesa) ou ("Consumivel", nome, tipo, valor_efeito)
+        self.ids_itens: tuple[str, ...] = dados["ids_itens"]
+        self.itens: tuple[tuple, ...] = dados["itens"]
+        self.indice_itens = {ident: i for i, ident in enumerate(self.ids_itens)}
+        # Uma instância (imutável) por item: todo loot, inventário e equipamento usa a mesma
+        self.objetos_itens: tuple[Equipamento | Consumivel, ...] = tuple(
+            _montar_item(ident, definicao) for ident, definicao in zip(self.ids_itens, self.itens))
+        self._internados = {item: item for item in self.objetos_itens} # Itens comparam por valor, sem o id
+        # Inimigos: uma entrada por espécie em cada tupla, na posição do ID
+        self.especies: tuple[str, ...] = dados["especies"] # Nome da classe ("Goblin")
+        self.indice_especies = {nome: i for i, nome in enumerate(self.especies)}
+        self.nomes: tuple[str, ...] = dados["nomes"] # Nome exibido ("Goblin Saqueador")
+        self.stats = array("i")
+        self.stats.frombytes(dados["stats"])
+        self.loot: tuple[tuple[int, ...], ...] = dados["loot"] # IDs de itens
+        self.efeitos: tuple[tuple[tuple[str, float], ...], ...] = dados["efeitos"] # (status, chance)
+        self.especial: tuple[tuple | None, ...] = dados["especial"] # (mult. do ATK, dano fixo, cura, mensagem)
+        self.comportamento: tuple[str, ...] = dados["comportamento"] # "" = inimigo comum
+        self.chefes: frozenset[int] = dados["chefes"]
+        # Cenário -> dificuldade -> ((ID da espécie, peso), ...), na ordem do arquivo
+        self.spawn: dict[str, dict[str, tuple[tuple[int, float], ...]]] = dados["spawn"]
+
+    def stats_de(self, especie: int) -> tuple[int, ...]:
+        #(vida, ataque, defesa, xp) da espécie.
+        i = especie * STATS
+        return tuple(self.stats[i:i + STATS])
+
+    def item(self, indice: int) -> Equipamento | Consumivel:
+        return self.objetos_itens[indice]
+
+    def item_por_id(self, ident: str) -> Equipamento | Consumivel:
+        return self.objetos_itens[self.indice_itens[ident]]
+
+    def internar(self, item: Equipamento | Consumivel) -> Equipamento | Consumivel:
+        #A instância do catálogo igual ao item (saves antigos, itens criados à mão); avulso volta como está.
+        return self._internados.get(item, item)
+
+
+def _montar_item(ident: str, definicao: tuple) -> Equipamento | Consumivel:
+    classe, nome, *valores = definicao
+    if classe == "Equipamento":
+        slot, ataque, defesa = valores
+        return Equipamento(nome, slot, ataque=ataque, defesa=defesa, id=ident)
+    tipo, valor_efeito = valores
+    return Consumivel(nome, tipo, valor_efeito, id=ident)
+
+
+_CATALOGO: Catalogo | None = None
+
+
+def catalogo() -> Catalogo:
+    #O catálogo do processo (carregado no primeiro uso).
+    global _CATALOGO
+    if _CATALOGO is None:
+        _CATALOGO = carregar()
+    return _CATALOGO
+
+
+def carregar(pasta: str = PASTA_CONTEUDO, usar_cache: bool = True) -> Catalogo:
+    fontes = {}
+    h = hashlib.sha1(f"{FORMATO}".encode("ascii"))
+    for nome in ARQUIVOS:
+        with open(os.path.join(pasta, nome), "rb") as f:
+            fontes[nome] = f.read()
+        h.update(nome.encode("ascii"))
+        h.update(fontes[nome])
+    versao = h.hexdigest()[:16]
+
+    # O marshal muda entre versões do Python: a tag (cpython-311) vai no nome, como nos .pyc
+    pasta_cache = os.path.join(pasta, "__cache__")
+    caminho = os.path.join(pasta_cache, f"catalogo.{versao}.{sys.implementation.cache_tag}.bin")
+    dados = None
+    if usar_cache:
+        try:
+            with open(caminho, "rb") as f:
+                dados = marshal.loads(f.read()) # load(f) leria o arquivo aos pedaços
+        except (OSError, EOFError, ValueError, TypeError):
+            dados = None # Sem cache (ou corrompido): compila de novo
+    if dados is None:
+        dados = compilar(fontes)
+        if usar_cache:
+            _gravar_cache(pasta_cache, caminho, dados)
+    return Catalogo(versao, dados)
+
+
+def _gravar_cache(pasta_cache: str, caminho: str, dados: dict) -> None:
+    try:
+        os.makedirs(pasta_cache, exist_ok=True)
+        # Troca atômica: vários processos (simulador, servidor) podem compilar ao mesmo tempo
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, "wb") as f:
+            f.write(marshal.dumps(dados))
+        os.replace(temporario, caminho)
+        atual = os.path.basename(caminho)
+        for nome in os.listdir(pasta_cache):
+            if nome.startswith("catalogo.") and nome.endswith(".bin") and nome != atual:
+                os.remove(os.path.join(pasta_cache, nome)) # Conteúdo antigo
+    except OSError:
+        pass # Pasta só de leitura (instalação do sistema): segue sem cache
+
+
+# --- Compilação (só quando o cache falta) ---
+
+def compilar(fontes: dict[str, bytes]) -> dict:
+    #JSON de conteudo/ -> estrutura do catálogo (só tipos que o marshal grava).
+    import json # Só quem compila paga o import
+    classes, itens, inimigos, spawn = (json.loads(fontes[nome].decode("utf-8")) for nome in ARQUIVOS)
+
+    arvore, atributos = {}, {}
+    for classe, info in classes.items():
+        niveis = {}
+        for nivel, recompensa in info["niveis"].items():
+            recompensa = dict(recompensa)
+            if "efeito" in recompensa:
+                recompensa["efeito"] = tuple(recompensa["efeito"])
+            niveis[int(nivel)] = recompensa
+        niveis["status_base"] = info["status_base"]
+        arvore[classe] = niveis
+        a = info["atributos"]
+        atributos[classe] = (a["vida"], a["ataque"], a["defesa"], a.get("mana", 0))
+
+    ids_itens = tuple(itens)
+    lista_itens = []
+    for ident, d in itens.items():
+        if d["classe"] == "Equipamento":
+            lista_itens.append(("Equipamento", d["nome"], d["slot"], d.get("ataque", 0), d.get("defesa", 0)))
+        elif d["classe"] == "Consumivel":
+            lista_itens.append(("Consumivel", d["nome"], d["tipo"], d["valor_efeito"]))
+        else:
+            raise ValueError(f"itens.json: {ident} tem classe desconhecida ({d['classe']})")
+    indice_itens = {ident: i for i, ident in enumerate(ids_itens)}
+
+    especies = tuple(inimigos)
+    indice = {nome: i for i, nome in enumerate(especies)}
+    stats = array("i")
+    nomes, loot, efeitos, especial, comportamento, chefes = [], [], [], [], [], set()
+    for i, (chave, d) in enumerate(inimigos.items()):
+        nomes.append(d["nome"])
+        stats.extend((d["vida"], d["ataque"], d["defesa"], d.get("xp", 0)))
+        try:
+            loot.append(tuple(indice_itens[ident] for ident in d.get("loot", ())))
+        except KeyError as e:
+            raise ValueError(f"inimigos.json: {chave} dropa um item que não está em itens.json ({e.args[0]})") from None
+        efeitos.append(tuple((nome, chance) for nome, chance in d.get("efeitos", ())))
+        e = d.get("especial")
+        especial.append((e.get("mult", 0), e.get("fixo", 0), e.get("cura", 0), e["msg"]) if e else None)
+        comportamento.append(d.get("comportamento", ""))
+        if d.get("chefe"):
+            chefes.add(i)
+
+    tabelas = {}
+    for cenario, por_dificuldade in spawn.items():
+        tabelas[cenario] = {}
+        for dificuldade, pesos in por_dificuldade.items():
+            desconhecidos = [nome for nome in pesos if nome not in indice]
+            if desconhecidos:
+                raise ValueError(f"spawn.json: {cenario}/{dificuldade} usa inimigos que não estão "
+                                 f"em inimigos.json ({', '.join(desconhecidos)})")
+            tabelas[cenario][dificuldade] = tuple((indice[nome], peso) for nome, peso in pesos.items())
+
+    return {
+        "arvore": arvore, "atributos": atributos,
+        "ids_itens": ids_itens, "itens": tuple(lista_itens),
+        "especies": especies, "nomes": tuple(nomes), "stats": stats.tobytes(),
+        "loot": tuple(loot), "efeitos": tuple(efeitos), "especial": tuple(especial),
+        "comportamento": tuple(comportamento), "chefes": frozenset(chefes), "spawn": tabelas,
+    }
+
+
+if __name__ == "__main__":
+    cat = carregar(usar_cache=False)
+    print(f"Conteúdo {cat.versao}: {len(cat.arvore)} classes, {len(cat.itens)} itens, "
+          f"{len(cat.especies)} inimigos ({len(cat.chefes)} chefes), "
+          f"{sum(len(d) for d in cat.spawn.values())} tabelas de spawn")
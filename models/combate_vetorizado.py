@@ -0,0 +1,296 @@
+from __future__ import annotations
+from .personagem import Personagem, ARVORE_EVOLUCAO
+from .inimigo import Inimigo
+from .catalogo import catalogo
+
+try:
+    import numpy as np
+except ImportError as e: # Dependência opcional, só o motor vetorizado precisa dela
+    raise ImportError("O motor vetorizado precisa do numpy (pip install numpy).") from e
+
+# ==============================================================================
+# MOTOR DE COMBATE VETORIZADO
+# Mantém N batalhas simultâneas como colunas de arrays e roda um turno de todas de uma vez.
+# Segue as mesmas regras de Missao._loop_combate com a política gulosa sem itens:
+# usa a skill mais cara que a mana permite, senão ataque básico. Não há fuga nem poções.
+# ==============================================================================
+
+CLASSES = ["Guerreiro", "Mago", "Arqueiro"]
+
+# Skills de cada classe em ordem de custo: (multiplicador do ATK, hits, dano fixo, cura, efeito)
+# Espelham os métodos skill_* de personagem.py: dano = int(ATK * mult) * hits + fixo
+# Efeitos: 0 nenhum, 1 fogo (50%, 3 turnos), 2 congelar (40%, 1 turno)
+_SKILLS = {
+    "Guerreiro": [(2.0, 1, 0, 0, 0), (1.2, 1, 0, 20, 0), (4.0, 1, 0, 0, 0)],
+    "Mago":      [(1.5, 1, 40, 0, 1), (2.5, 1, 0, 0, 2), (5.0, 1, 0, 0, 1)],
+    "Arqueiro":  [(1.5, 1, 10, 0, 0), (0.7, 3, 0, 0, 0), (3.0, 1, 50, 0, 0)],
+}
+
+# Ações dos inimigos: roll < p1 -> opção A, roll < p2 -> opção B, senão C.
+# Cada opção é (multiplicador do ATK, dano fixo). Espelham realizar_acao/habilidade_especial.
+# Flags: furia (Rei Ogro), bonus por turno (Enviado), regen (Verme), roubo de vida (Lich),
+# cura na skill (Morcego), aplica veneno (Zumbi), aplica fogo (Lich)
+_COMUM = 0.25
+# Chefes, pelo comportamento (as classes de inimigo.py); os comuns saem do "especial" do catálogo
+_COMPORTAMENTOS = {
+    "furia":         dict(p=(0.2, 0.4), a=(0, 35), b=(0, 45), c=(1, 0), furia=True),
+    "cacada":        dict(p=(0.3, 0.5), a=(0, 40), b=(0, 50), c=(1, 0), bonus_turno=True),
+    "regeneracao":   dict(p=(0.3, 0.5), a=(0, 40), b=(0, 60), c=(1, 0), regen=15),
+    "roubo_de_vida": dict(p=(0.3, 0.5), a=(0, 60), b=(0, 45), c=(1, 0), roubo_vida=0.2),
+}
+
+
+def _acoes_inimigos() -> dict[str, dict]:
+    cat = catalogo()
+    acoes = {}
+    for i, nome in enumerate(cat.especies):
+        if cat.comportamento[i]:
+            d = dict(_COMPORTAMENTOS[cat.comportamento[i]])
+        else:
+            mult, fixo, cura, _ = cat.especial[i] or (1, 0, 0, "")
+            d = dict(p=(_COMUM, _COMUM), a=(mult, fixo), b=(0, 0), c=(1, 0))
+            if cura:
+                d["cura_skill"] = cura
+        status = {nome_status for nome_status, _ in cat.efeitos[i]}
+        if "veneno" in status:
+            d["veneno"] = True
+        if "fogo" in status:
+            d["fogo"] = True
+        acoes[nome] = d
+    return acoes
+
+
+_INIMIGOS = _acoes_inimigos()
+TIPOS_INIMIGO = list(_INIMIGOS)
+
+
+def _tabela_skills():
+    # Arrays [classe, skill] com custo e parâmetros de dano
+    custo = np.zeros((len(CLASSES), 3), dtype=np.int64)
+    mult = np.zeros((len(CLASSES), 3))
+    hits = np.zeros((len(CLASSES), 3), dtype=np.int64)
+    fixo = np.zeros((len(CLASSES), 3), dtype=np.int64)
+    cura = np.zeros((len(CLASSES), 3), dtype=np.int64)
+    efeito = np.zeros((len(CLASSES), 3), dtype=np.int64)
+    nomes = []
+    for c, classe in enumerate(CLASSES):
+        arvore = ARVORE_EVOLUCAO[classe]
+        skills = sorted((info for lvl, info in arvore.items() if lvl != "status_base" and info["tipo"] == "skill"),
+                        key=lambda info: info["custo"])
+        nomes.append([s["nome"] for s in skills])
+        for s, (info, params) in enumerate(zip(skills, _SKILLS[classe])):
+            custo[c, s] = info["custo"]
+            mult[c, s], hits[c, s], fixo[c, s], cura[c, s], efeito[c, s] = params
+    return nomes, custo, mult, hits, fixo, cura, efeito
+
+
+def _tabela_inimigos():
+    n = len(TIPOS_INIMIGO)
+    t = {
+        "p1": np.zeros(n), "p2": np.zeros(n),
+        "mult": np.zeros((n, 3)), "fixo": np.zeros((n, 3)),
+        "furia": np.zeros(n, dtype=bool), "bonus_turno": np.zeros(n, dtype=bool),
+        "regen": np.zeros(n, dtype=np.int64), "cura_skill": np.zeros(n, dtype=np.int64),
+        "roubo_vida": np.zeros(n), "veneno": np.zeros(n, dtype=bool), "fogo": np.zeros(n, dtype=bool),
+    }
+    for i, nome in enumerate(TIPOS_INIMIGO):
+        d = _INIMIGOS[nome]
+        t["p1"][i], t["p2"][i] = d["p"]
+        for j, k in enumerate("abc"):
+            t["mult"][i, j], t["fixo"][i, j] = d[k]
+        for flag in ("furia", "bonus_turno", "regen", "cura_skill", "roubo_vida", "veneno", "fogo"):
+            if flag in d:
+                t[flag][i] = d[flag]
+    return t
+
+
+_NOMES_SKILLS, _CUSTO, _MULT, _HITS, _FIXO, _CURA, _EFEITO = _tabela_skills()
+_TAB_INIMIGOS = _tabela_inimigos()
+
+
+class LoteCombate:
+    #N batalhas jogador x inimigo guardadas como arrays.
+    def __init__(self, personagens: list[Personagem], inimigos: list[Inimigo], semente: int | None = None):
+        if len(personagens) != len(inimigos):
+            raise ValueError("É preciso um inimigo para cada personagem.")
+        self.rng = np.random.default_rng(semente)
+        n = self.n = len(personagens)
+        i64 = np.int64
+
+        # --- Jogadores ---
+        self.classe = np.array([CLASSES.index(p.__class__.__name__) for p in personagens], dtype=i64)
+        self.vida = np.array([p._atrib.vida for p in personagens], dtype=i64)
+        self.vida_max = np.array([p._atrib.vida_max for p in personagens], dtype=i64)
+        self.mana = np.array([p._atrib.mana for p in personagens], dtype=i64)
+        self.ataque = np.array([p._atrib.ataque for p in personagens], dtype=i64)
+        self.defesa = np.array([p._atrib.defesa for p in personagens], dtype=i64)
+        # Bônus dos equipamentos (arma + armadura)
+        eq = [[e for e in p.equipamentos.values() if e] for p in personagens]
+        self.bonus_atk = np.array([sum(e.ataque_bonus for e in lista) for lista in eq], dtype=i64)
+        self.bonus_def = np.array([sum(e.defesa_bonus for e in lista) for lista in eq], dtype=i64)
+        # Skills conhecidas, na mesma ordem (por custo) das tabelas
+        self.skills = np.array([[nome in p.habilidades_conhecidas for nome in _NOMES_SKILLS[c]]
+                                for p, c in zip(personagens, self.classe)], dtype=bool).reshape(n, 3)
+
+        def passiva(nome):
+            return np.array([p.tem_passiva(nome) for p in personagens], dtype=bool)
+        self.pele_de_ferro = passiva("Pele de Ferro")
+        self.berserker = passiva("Berserker")
+        self.mente_clara = passiva("Mente Clara")
+        self.escudo_arcano = passiva("Escudo Arcano")
+        self.olhos_de_aguia = passiva("Olhos de Águia")
+        self.evasao = passiva("Evasão Ladina")
+
+        # --- Inimigos ---
+        self.tipo = np.array([TIPOS_INIMIGO.index(e.__class__.__name__) for e in inimigos], dtype=i64)
+        self.ini_vida = np.array([e._atrib.vida for e in inimigos], dtype=i64)
+        self.ini_vida_max = np.array([e._atrib.vida_max for e in inimigos], dtype=i64)
+        self.ini_ataque = np.array([e._atrib.ataque for e in inimigos], dtype=i64)
+        self.ini_defesa = np.array([e._atrib.defesa for e in inimigos], dtype=i64)
+        self.ini_turnos = np.zeros(n, dtype=i64) # Passiva acumulativa do Enviado
+
+        # --- Status (turnos restantes) ---
+        self.veneno = np.zeros(n, dtype=i64)
+        self.fogo = np.zeros(n, dtype=i64)
+        self.ini_fogo = np.zeros(n, dtype=i64)
+        self.ini_congelado = np.zeros(n, dtype=i64)
+        self.ini_atordoado = np.zeros(n, dtype=i64)
+
+        # --- Resultado ---
+        self.ativo = np.ones(n, dtype=bool)
+        self.venceu = np.zeros(n, dtype=bool)
+        self.turnos = np.zeros(n, dtype=i64)
+
+    # --- Propriedades derivadas (ataque_total / defesa_total) ---
+    def _ataque_total(self, m):
+        base = self.ataque[m]
+        furia = self.berserker[m] & (self.vida[m] < self.vida_max[m] * 0.3)
+        return np.where(furia, base * 2, base) + self.bonus_atk[m]
+
+    def _defesa_total(self, m):
+        escudo = self.escudo_arcano[m] & (self.mana[m] > 50)
+        return self.defesa[m] + self.bonus_def[m] + np.where(escudo, 5, 0)
+
+    def _encerrar(self, m, venceu: bool) -> None:
+        self.ativo[m] = False
+        self.venceu[m] = venceu
+
+    def passo(self) -> None:
+        #Roda um turno para todas as batalhas ativas.
+        rng = self.rng
+        ativo = self.ativo
+        self.turnos[ativo] += 1
+
+        # --- 1. DOTs do jogador ---
+        m = ativo & (self.veneno > 0)
+        self.vida[m] -= 5
+        self.veneno[m] -= 1
+        m = ativo & (self.fogo > 0)
+        self.vida[m] -= 8
+        self.fogo[m] -= 1
+        self._encerrar(ativo & (self.vida <= 0), False)
+
+        # --- 2. DOTs do inimigo ---
+        ativo = self.ativo
+        m = ativo & (self.ini_fogo > 0)
+        self.ini_vida[m] -= np.maximum(5, (self.ini_vida_max[m] * 0.05).astype(np.int64))
+        self.ini_fogo[m] -= 1
+        congelado = ativo & (self.ini_congelado > 0)
+        self.ini_congelado[congelado] -= 1
+        atordoado = ativo & ~congelado & (self.ini_atordoado > 0)
+        self.ini_atordoado[atordoado] -= 1
+        perde_turno = congelado | atordoado
+        self._encerrar(ativo & (self.ini_vida <= 0), True)
+
+        # --- 3. Ação do jogador ---
+        m = np.flatnonzero(self.ativo)
+        if m.size == 0: return
+        classe = self.classe[m]
+        custo = _CUSTO[classe]
+        pode = self.skills[m] & (self.mana[m][:, None] >= custo)
+        usa_skill = pode.any(axis=1)
+        # Skill mais cara possível (última coluna verdadeira)
+        escolha = 2 - np.argmax(pode[:, ::-1], axis=1)
+
+        # Ataque básico (Mente Clara regenera mana antes do cálculo, como em Mago.calcular_dano_base)
+        basico = m[~usa_skill]
+        regen = basico[self.mente_clara[basico]]
+        self.mana[regen] += 5
+        dano_basico = self._ataque_total(basico) * rng.uniform(0.9, 1.1, basico.size)
+        chance_crit = np.where(self.olhos_de_aguia[basico], 0.25, 0.05)
+        dano_basico = np.where(rng.random(basico.size) < chance_crit, dano_basico * 1.5, dano_basico)
+
+        # Skills
+        hab = m[usa_skill]
+        c, s = classe[usa_skill], escolha[usa_skill]
+        self.mana[hab] -= _CUSTO[c, s]
+        # Cura antes do ataque, como em skill_grito_de_guerra: a vida nova conta para o Berserker
+        self.vida[hab] = np.minimum(self.vida_max[hab], self.vida[hab] + _CURA[c, s])
+        atk = self._ataque_total(hab)
+        dano_skill = (atk * _MULT[c, s]).astype(np.int64) * _HITS[c, s] + _FIXO[c, s]
+        efeito = _EFEITO[c, s]
+        queima = hab[(efeito == 1) & (rng.random(hab.size) < 0.5)]
+        self.ini_fogo[queima] = 3
+        congela = hab[(efeito == 2) & (rng.random(hab.size) < 0.4)]
+        self.ini_congelado[congela] = 1
+
+        dano = np.empty(self.n, dtype=np.int64)
+        dano[basico] = dano_basico.astype(np.int64)
+        dano[hab] = dano_skill
+        # Entidade.receber_dano
+        efetivo = np.maximum(0, dano[m] - self.ini_defesa[m])
+        self.ini_vida[m] = np.maximum(0, self.ini_vida[m] - efetivo)
+        self._encerrar(m[self.ini_vida[m] <= 0], True)
+
+        # --- 4. Ação do inimigo ---
+        m = np.flatnonzero(self.ativo & ~perde_turno)
+        if m.size == 0: return
+        t = _TAB_INIMIGOS
+        tipo = self.tipo[m]
+
+        # Passivas de início de ação
+        self.ini_turnos[m] += 1
+        regen = t["regen"][tipo]
+        cura_regen = np.where(self.ini_vida[m] < self.ini_vida_max[m], regen, 0)
+        self.ini_vida[m] += cura_regen
+        furia = np.where(t["furia"][tipo] & (self.ini_vida[m] < self.ini_vida_max[m] / 2), 1.3, 1.0)
+
+        roll = rng.random(m.size)
+        opcao = np.where(roll < t["p1"][tipo], 0, np.where(roll < t["p2"][tipo], 1, 2))
+        dano_ini = np.floor((self.ini_ataque[m] * t["mult"][tipo, opcao] + t["fixo"][tipo, opcao]) * furia)
+        dano_ini = dano_ini.astype(np.int64) + np.where(t["bonus_turno"][tipo], self.ini_turnos[m] * 2, 0)
+        # Morcego cura ao usar a habilidade especial
+        self.ini_vida[m] += np.where(opcao == 0, t["cura_skill"][tipo], 0)
+        # Lich: roubo de vida limitado à vida máxima
+        roubo = (dano_ini * t["roubo_vida"][tipo]).astype(np.int64)
+        self.ini_vida[m] = np.where(roubo > 0, np.minimum(self.ini_vida_max[m], self.ini_vida[m] + roubo), self.ini_vida[m])
+
+        # Status aplicados no jogador
+        envenena = t["veneno"][tipo] & (rng.random(m.size) < 0.2) & (self.veneno[m] == 0)
+        self.veneno[m[envenena]] = 3
+        incendeia = t["fogo"][tipo] & (rng.random(m.size) < 0.2) & (self.fogo[m] == 0)
+        self.fogo[m[incendeia]] = 3
+
+        # Variação de ±10% e Personagem.receber_dano
+        dano_var = (dano_ini * rng.uniform(0.9, 1.1, m.size)).astype(np.int64)
+        desviou = self.evasao[m] & (rng.random(m.size) < 0.2)
+        efetivo = np.maximum(0, dano_var - self._defesa_total(m))
+        efetivo = np.where(self.pele_de_ferro[m], (efetivo * 0.85).astype(np.int64), efetivo)
+        efetivo = np.where(desviou, 0, efetivo)
+        self.vida[m] = np.maximum(0, self.vida[m] - efetivo)
+        self._encerrar(m[self.vida[m] <= 0], False)
+
+    def executar(self, limite_turnos: int = 1000) -> LoteCombate:
+        #Roda até todas as batalhas terminarem (ou até o limite de turnos).
+        for _ in range(limite_turnos):
+            if not self.ativo.any(): break
+            self.passo()
+        return self
+
+    def resumo(self) -> dict[str, float]:
+        return {
+            "batalhas": self.n,
+            "taxa_vitoria": float(self.venceu.mean()),
+            "turnos_medio": float(self.turnos.mean()),
+            "hp_restante": float((np.maximum(self.vida, 0) / self.vida_max).mean()),
+        }
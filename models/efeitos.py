@@ -0,0 +1,147 @@
+from __future__ import annotations
+from utils.terminal import Cor
+
+# ==============================================================================
+# EFEITOS DE STATUS (veneno, queimadura, congelamento, atordoamento)
+# Cada efeito ativo é uma instância com os próprios turnos restantes. Skills (Skill.efeito)
+# e inimigos (Inimigo.efeitos_ataque) declaram o tipo; a AgendaEfeitos de cada lado da
+# batalha guarda só os efeitos ativos e processa todos no começo do turno.
+# ==============================================================================
+
+class Efeito:
+    __slots__ = ("turnos",)
+    nome = ""
+    duracao = 1
+    ordem = 0 # Ordem de processamento no turno (menor primeiro)
+    impede_acao = False # Congelado/atordoado: o alvo perde a ação (só um por turno)
+    icone = "" # Mostrado no status do inimigo (vazio = não aparece)
+    aviso_inimigo = "" # Mensagem ao aplicar no inimigo
+    aviso_jogador = "" # Mensagem ao aplicar no jogador
+
+    def __init__(self, turnos: int | None = None):
+        self.turnos = self.duracao if turnos is None else turnos
+
+    def dano(self, alvo, no_jogador: bool) -> int:
+        return 0
+
+    def mensagem(self, alvo, dano: int, no_jogador: bool) -> str:
+        return ""
+
+    @classmethod
+    def chave_relatorio(cls, no_jogador: bool) -> str:
+        # Nome usado em RelatorioCombate.status_aplicados
+        return f"{cls.nome}_jogador" if no_jogador else cls.nome
+
+
+class Veneno(Efeito):
+    __slots__ = ()
+    nome = "veneno"
+    duracao = 3
+    ordem = 0
+    aviso_jogador = f"{Cor.VERMELHO}!!! O inimigo te envenenou! !!!{Cor.RESET}"
+
+    def dano(self, alvo, no_jogador: bool) -> int:
+        return 5
+
+    def mensagem(self, alvo, dano: int, no_jogador: bool) -> str:
+        if no_jogador:
+            return f"{Cor.VERMELHO}☠️ O veneno te causou {dano} de dano!{Cor.RESET}"
+        return f"{Cor.VERMELHO}☠️ {alvo.nome} sofreu {dano} de veneno!{Cor.RESET}"
+
+    @classmethod
+    def chave_relatorio(cls, no_jogador: bool) -> str:
+        return cls.nome # Só inimigos envenenam
+
+
+class Queimadura(Efeito):
+    __slots__ = ()
+    nome = "fogo"
+    duracao = 3
+    ordem = 1
+    icone = f"{Cor.AMARELO}🔥 Queimando{Cor.RESET}"
+    aviso_inimigo = f"{Cor.AMARELO}>>> Você incendeia o inimigo! (Dano contínuo) <<<{Cor.RESET}"
+    aviso_jogador = f"{Cor.AMARELO}!!! O inimigo te incendiou! !!!{Cor.RESET}"
+
+    def dano(self, alvo, no_jogador: bool) -> int:
+        # No jogador é fixo; no inimigo depende da vida máx (mín 5)
+        if no_jogador:
+            return 8
+        return max(5, int(alvo._atrib.vida_max * 0.05))
+
+    def mensagem(self, alvo, dano: int, no_jogador: bool) -> str:
+        if no_jogador:
+            return f"{Cor.AMARELO}🔥 Você está queimando! Sofreu {dano} de dano.{Cor.RESET}"
+        return f"{Cor.AMARELO}🔥 {alvo.nome} sofreu {dano} por queimadura!{Cor.RESET}"
+
+
+class Congelamento(Efeito):
+    __slots__ = ()
+    nome = "congelado"
+    duracao = 1
+    ordem = 2
+    impede_acao = True
+    icone = f"{Cor.CIANO}❄️ Congelado{Cor.RESET}"
+    aviso_inimigo = f"{Cor.CIANO}>>> O inimigo congelou! (Perderá o próximo turno) <<<{Cor.RESET}"
+
+    def mensagem(self, alvo, dano: int, no_jogador: bool) -> str:
+        return f"{Cor.CIANO}❄️ {alvo.nome} está CONGELADO e não pode se mover!{Cor.RESET}"
+
+
+class Atordoamento(Efeito):
+    __slots__ = ()
+    nome = "atordoado"
+    duracao = 1
+    ordem = 3
+    impede_acao = True
+    aviso_inimigo = ">>> O impacto atordoou o inimigo! <<<"
+
+    def mensagem(self, alvo, dano: int, no_jogador: bool) -> str:
+        return f"💫 {alvo.nome} está ATORDOADO!"
+
+
+# Nome usado em ARVORE_EVOLUCAO ("efeito": (nome, chance)) -> tipo
+EFEITOS: dict[str, type[Efeito]] = {e.nome: e for e in (Veneno, Queimadura, Congelamento, Atordoamento)}
+
+
+class AgendaEfeitos:
+    #Efeitos ativos em uma entidade durante uma batalha, já na ordem de processamento.
+    __slots__ = ("alvo", "no_jogador", "ativos")
+
+    def __init__(self, alvo, no_jogador: bool):
+        self.alvo = alvo
+        self.no_jogador = no_jogador
+        self.ativos: list[Efeito] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.ativos)
+
+    def ativo(self, tipo: type[Efeito]) -> bool:
+        return any(type(e) is tipo for e in self.ativos)
+
+    def aplicar(self, efeito: Efeito) -> None:
+        # Um efeito do mesmo tipo é substituído (renova a duração)
+        self.ativos = [e for e in self.ativos if type(e) is not type(efeito)]
+        self.ativos.append(efeito)
+        self.ativos.sort(key=lambda e: e.ordem)
+
+    def icones(self) -> list[str]:
+        return [e.icone for e in self.ativos if e.icone]
+
+    def processar(self, out) -> tuple[int, bool]:
+        #Aplica um turno de todos os efeitos ativos. Retorna (dano total, perdeu a ação).
+        total = 0
+        perde_acao = False
+        for efeito in self.ativos:
+            if efeito.impede_acao:
+                if perde_acao:
+                    continue # Só um efeito de controle conta (e gasta turno) por vez
+                perde_acao = True
+            dano = efeito.dano(self.alvo, self.no_jogador)
+            if dano:
+                self.alvo._atrib.vida -= dano
+                total += dano
+            efeito.turnos -= 1
+            out(efeito.mensagem(self.alvo, dano, self.no_jogador))
+        if self.ativos:
+            self.ativos = [e for e in self.ativos if e.turnos > 0]
+        return total, perde_acao
@@ -1,73 +1,89 @@
 from __future__ import annotations
-import random
 from .base import Entidade, Atributos
 from .item import Equipamento, Consumivel
+from .efeitos import Efeito, EFEITOS
+from .catalogo import STATS, XP, catalogo
+from utils.terminal import Cor
+
+# As espécies de inimigo (nome, status, XP, loot, status que aplicam e a habilidade especial)
+# vêm de conteudo/inimigos.json. Cada uma vira uma subclasse montada a partir do catálogo
+# (models/catalogo.py) no fim deste módulo, com o nome da chave do JSON: Goblin, Orc, Lich...
+# O código daqui é só o comportamento: o do inimigo comum (Inimigo) e o de cada chefe.
+
+_CATALOGO = catalogo()
+_STATS = _CATALOGO.stats # Status de todas as espécies num array só (vida, ataque, defesa, xp)
 
 class Inimigo(Entidade):
-    def __init__(self, nome: str, vida: int, ataque: int, defesa: int):
-        super().__init__(nome, Atributos(vida=vida, ataque=ataque, defesa=defesa, vida_max=vida))
-        self.xp_recompensa = 0 
-        self.loot_especifico = [] # Lista de itens possíveis
+    __slots__ = ()
+    # Recompensa, loot e habilidade são da espécie, não de cada instância: ficam na classe
+    especie = -1 # ID no catálogo; nome_especie só existe nas classes das espécies
+    xp_recompensa = 0
+    loot_especifico: tuple[Equipamento | Consumivel, ...] = () # Itens possíveis (as instâncias do catálogo)
+    efeitos_ataque: tuple[tuple[type[Efeito], float], ...] = () # (efeito, chance) a cada ação
+    especial: tuple[float, int, int, str] | None = None # (multiplicador do ATK, dano fixo, cura, mensagem)
+
+    def __init__(self):
+        i = self.especie * STATS
+        vida = _STATS[i]
+        super().__init__(self.nome_especie, Atributos(vida=vida, ataque=_STATS[i + 1], defesa=_STATS[i + 2],
+                                                      vida_max=vida))
 
     def realizar_acao(self) -> tuple[int, str]:
         #Decide se ataca normal ou usa habilidade.
         # 25% de chance de usar habilidade especial em inimigos comuns
-        if random.random() < 0.25:
+        if self.rng.random() < 0.25:
             return self.habilidade_especial()
         return self.atacar(), "atacou normalmente"
 
     def habilidade_especial(self) -> tuple[int, str]:
-        #Sobrescrito pelas subclasses.
-        return self.atacar(), "tentou algo mas falhou"
+        #dano = int(ATK * mult) + fixo; a cura (ex: Drenar Sangue) não respeita a vida máxima.
+        if self.especial is None:
+            return self.atacar(), "tentou algo mas falhou"
+        mult, fixo, cura, mensagem = self.especial
+        if cura:
+            self._atrib.vida += cura
+        return int(self._atrib.ataque * mult) + fixo, mensagem
 
     def gerar_loot(self) -> list:
         #Gera loot baseado na tabela da criatura.
         drops = []
-        if random.random() < 0.4: # 40% de chance de drop genérico
-            drops.append(Consumivel("Poção Pequena", "vida", 20))
+        if self.rng.random() < 0.4: # 40% de chance de drop genérico
+            drops.append(_POCAO) # Item imutável: o drop é a própria instância do catálogo
         
         # Chance de drop raro específico
-        if self.loot_especifico and random.random() < 0.2:
-            item = random.choice(self.loot_especifico)
-            drops.append(item)
+        if self.loot_especifico and self.rng.random() < 0.2:
+            drops.append(self.rng.choice(self.loot_especifico))
             
         return drops
 
-# ==============================================================================
-# ÁREA 1: FLORESTA (Clássicos)
-# ==============================================================================
+_POCAO = _CATALOGO.item_por_id("pocao_pequena")
 
-class Goblin(Inimigo):
-    def __init__(self):
-        super().__init__("Goblin Saqueador", 35, 9, 1)
-        self.xp_recompensa = 40
-        self.loot_especifico = [Equipamento("Adaga Enferrujada", "arma", ataque=4)]
 
-    def habilidade_especial(self):
-        return int(self._atrib.ataque * 1.5), "usou Ataque Sorrateiro!"
+def dano_em_area(alvos: list[Inimigo], dano: int) -> list[int]:
+    #Aplica o mesmo dano bruto em todos os alvos numa passada só (skills de área em hordas).
+    # É a conta de Entidade.receber_dano feita direto nos atributos, sem uma chamada por inimigo.
+    recebidos = []
+    for alvo in alvos:
+        if type(alvo).receber_dano is not Entidade.receber_dano:
+            recebidos.append(alvo.receber_dano(dano)) # Inimigo com defesa especial
+            continue
+        a = alvo._atrib
+        efetivo = dano - a.defesa
+        if efetivo < 0:
+            efetivo = 0
+        vida = a.vida - efetivo
+        a.vida = vida if vida > 0 else 0
+        recebidos.append(efetivo)
+    return recebidos
 
-class Lobo(Inimigo):
-    def __init__(self):
-        super().__init__("Lobo Selvagem", 55, 12, 2)
-        self.xp_recompensa = 60
-
-    def habilidade_especial(self):
-        return int(self._atrib.ataque * 1.2) + 5, "usou Mordida Crítica!"
-
-class Orc(Inimigo):
-    def __init__(self):
-        super().__init__("Orc Guerreiro", 90, 16, 5)
-        self.xp_recompensa = 110
-        self.loot_especifico = [Equipamento("Machado de Orc", "arma", ataque=12)]
 
-    def habilidade_especial(self):
-        return int(self._atrib.ataque * 2), "usou Esmagar Crânio!"
+# ==============================================================================
+# COMPORTAMENTOS DOS CHEFES
+# Escolhidos por "comportamento" em conteudo/inimigos.json; os status e o loot vêm de lá
+# ==============================================================================
 
-class ReiOgro(Inimigo): # CHEFE
-    def __init__(self):
-        super().__init__("Rei dos Ogros", 250, 28, 10)
-        self.xp_recompensa = 600
-        self.loot_especifico = [Equipamento("Clava do Rei", "arma", ataque=25)]
+class Furia(Inimigo): # Rei dos Ogros
+    __slots__ = ()
 
     def realizar_acao(self):
         # PASSIVA: Fúria (Dano aumenta quando HP < 50%)
@@ -77,7 +93,7 @@ class ReiOgro(Inimigo): # CHEFE
 
         dano_base = int(self._atrib.ataque * fator_furia)
         
-        roll = random.random()
+        roll = self.rng.random()
         if roll < 0.2: # Skill 1
             return int(35 * fator_furia), "usou Pisotão Sísmico (Area)!"
         elif roll < 0.4: # Skill 2
@@ -86,42 +102,11 @@ class ReiOgro(Inimigo): # CHEFE
             msg = "atacou furiosamente!" if fator_furia > 1 else "atacou com sua clava"
             return dano_base, msg
 
-# ==============================================================================
-# ÁREA 2: TRILHA (Humanoides/Bandidos)
-# ==============================================================================
-
-class Ladrao(Inimigo):
-    def __init__(self):
-        super().__init__("Ladrão de Estrada", 45, 14, 2)
-        self.xp_recompensa = 55
-        self.loot_especifico = [Consumivel("Elixir de Agilidade", "mana", 30)]
-
-    def habilidade_especial(self):
-        return int(self._atrib.ataque) + 10, "usou Golpe nas Costas!"
-
-class Cacador(Inimigo):
-    def __init__(self):
-        super().__init__("Caçador de Recompensas", 70, 18, 6)
-        self.xp_recompensa = 90
-        self.loot_especifico = [Equipamento("Capa de Viagem", "armadura", defesa=5)]
+class Cacada(Inimigo): # Enviado da Caçada Selvagem
+    __slots__ = ("turnos",)
 
-    def habilidade_especial(self):
-        return 25, "disparou Tiro na Perna!"
-
-class Elfo(Inimigo):
-    def __init__(self):
-        super().__init__("Patrulheiro Elfo", 60, 20, 3)
-        self.xp_recompensa = 100
-        self.loot_especifico = [Equipamento("Arco Elfico", "arma", ataque=15)]
-
-    def habilidade_especial(self):
-        return 30, "lançou Flecha Encantada!"
-
-class EnviadoCacada(Inimigo): # CHEFE
     def __init__(self):
-        super().__init__("Enviado da Caçada Selvagem", 220, 35, 8)
-        self.xp_recompensa = 700
-        self.loot_especifico = [Equipamento("Lança Espectral", "arma", ataque=30)]
+        super().__init__()
         self.turnos = 0
 
     def realizar_acao(self):
@@ -129,7 +114,7 @@ class EnviadoCacada(Inimigo): # CHEFE
         # PASSIVA: Ganha ataque a cada turno (Acumulativo)
         bonus_passiva = self.turnos * 2 
         
-        roll = random.random()
+        roll = self.rng.random()
         if roll < 0.3: # Skill 1
             return 40 + bonus_passiva, "invocou Mastins Fantasmas!"
         elif roll < 0.5: # Skill 2
@@ -137,51 +122,17 @@ class EnviadoCacada(Inimigo): # CHEFE
         
         return self.atacar() + bonus_passiva, "atacou com precisão sobrenatural"
 
-# ==============================================================================
-# ÁREA 3: CAVERNA (Monstros Subterrâneos)
-# ==============================================================================
-
-class MorcegoGigante(Inimigo):
-    def __init__(self):
-        super().__init__("Morcego Gigante", 40, 12, 0)
-        self.xp_recompensa = 50
-
-    def habilidade_especial(self):
-        self._atrib.vida += 10
-        return 15, "usou Drenar Sangue (Curou 10 HP)!"
-
-class Gargula(Inimigo):
-    def __init__(self):
-        super().__init__("Gárgula de Pedra", 80, 15, 15)
-        self.xp_recompensa = 100
-        self.loot_especifico = [Equipamento("Elmo de Pedra", "armadura", defesa=10)]
-
-    def habilidade_especial(self):
-        return 25, "caiu em Investida Aérea!"
-
-class Kobold(Inimigo):
-    def __init__(self):
-        super().__init__("Kobold Mineiro", 30, 10, 2)
-        self.xp_recompensa = 35
-        self.loot_especifico = [Consumivel("Bomba de Fumaça", "vida", -5)] # Item satanico
-
-    def habilidade_especial(self):
-        return 20, "jogou uma picareta!"
-
-class VermeColossal(Inimigo): # CHEFE
-    def __init__(self):
-        super().__init__("Verme Colossal", 400, 20, 5) # So mago pra fazer isso facil
-        self.xp_recompensa = 800
-        self.loot_especifico = [Equipamento("Placa Quitina", "armadura", defesa=18)]
+class Regeneracao(Inimigo): # Verme Colossal
+    __slots__ = ()
 
     def realizar_acao(self):
         # PASSIVA: Regeneração constante
         cura = 15
         if self._atrib.vida < self._atrib.vida_max:
             self._atrib.vida += cura
-            print(f"\033[90m(O Verme regenerou {cura} HP na escuridão...)\033[0m")
+            self._narrar(f"{Cor.CINZA}(O {self.nome} regenerou {cura} HP na escuridão...){Cor.RESET}")
 
-        roll = random.random()
+        roll = self.rng.random()
         if roll < 0.3: # Skill 1
             return 40, "causou um Terremoto Subterrâneo!"
         elif roll < 0.5: # Skill 2
@@ -189,44 +140,11 @@ class VermeColossal(Inimigo): # CHEFE
         
         return self.atacar(), "mordeu brutalmente"
 
-# ==============================================================================
-# ÁREA 4: RUÍNAS (Mortos-Vivos)
-# ==============================================================================
-
-class SoldadoZumbi(Inimigo):
-    def __init__(self):
-        super().__init__("Soldado Zumbi", 60, 10, 5)
-        self.xp_recompensa = 70
-        self.loot_especifico = [Equipamento("Espada Antiga", "arma", ataque=8)]
-
-    def habilidade_especial(self):
-        return 15, "usou Mordida Infectada (Dano Venenoso)!"
-
-class Ghoul(Inimigo):
-    def __init__(self):
-        super().__init__("Ghoul Devorador", 70, 18, 3)
-        self.xp_recompensa = 90
-
-    def habilidade_especial(self):
-        return 25, "entrou em Frenesi Sangrento!"
-
-class EspiritoSombrio(Inimigo):
-    def __init__(self):
-        super().__init__("Espírito Sombrio", 40, 25, 0) # Vidro canhão (muito dano, pouca vida)
-        self.xp_recompensa = 110
-        self.loot_especifico = [Consumivel("Essência de Mana", "mana", 50)]
-
-    def habilidade_especial(self):
-        return 35, "soltou um Grito da Morte!"
-
-class Lich(Inimigo): # CHEFE
-    def __init__(self):
-        super().__init__("Arquimago Lich", 300, 40, 10)
-        self.xp_recompensa = 1000
-        self.loot_especifico = [Equipamento("Cajado do Vazio", "arma", ataque=40)]
+class RouboDeVida(Inimigo): # Arquimago Lich
+    __slots__ = ()
 
     def realizar_acao(self):
-        roll = random.random()
+        roll = self.rng.random()
         dano_causado = 0
         msg = ""
 
@@ -246,4 +164,43 @@ class Lich(Inimigo): # CHEFE
         if cura > 0:
             msg += f" (Drenou {cura} HP)"
         
-        return dano_causado, msg
\ No newline at end of file
+        return dano_causado, msg
+
+COMPORTAMENTOS: dict[str, type[Inimigo]] = {
+    "": Inimigo, # Comum: 25% de chance da habilidade especial do JSON
+    "furia": Furia,
+    "cacada": Cacada,
+    "regeneracao": Regeneracao,
+    "roubo_de_vida": RouboDeVida,
+}
+
+# ==============================================================================
+# ESPÉCIES (uma classe por entrada de conteudo/inimigos.json)
+# ==============================================================================
+
+def _montar_especies() -> dict[str, type[Inimigo]]:
+    especies = {}
+    cat = _CATALOGO
+    for i, chave in enumerate(cat.especies):
+        base = COMPORTAMENTOS.get(cat.comportamento[i])
+        if base is None:
+            raise ValueError(f"inimigos.json: {chave} tem comportamento desconhecido ({cat.comportamento[i]})")
+        try:
+            efeitos = tuple((EFEITOS[nome], chance) for nome, chance in cat.efeitos[i])
+        except KeyError as e:
+            raise ValueError(f"inimigos.json: {chave} aplica um status desconhecido ({e.args[0]})") from None
+        especies[chave] = type(chave, (base,), {
+            "__slots__": (),
+            "__module__": __name__,
+            "especie": i,
+            "nome_especie": cat.nomes[i],
+            "xp_recompensa": _STATS[i * STATS + XP],
+            "loot_especifico": tuple(cat.item(j) for j in cat.loot[i]),
+            "efeitos_ataque": efeitos,
+            "especial": cat.especial[i],
+        })
+    return especies
+
+# Nome da classe -> classe, na ordem dos IDs do catálogo. As espécies só existem aqui
+# (não viram nomes do módulo): procure sempre por ESPECIES["Goblin"]
+ESPECIES = _montar_especies()
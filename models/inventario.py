@@ -0,0 +1,87 @@
+from __future__ import annotations
+from typing import Iterable, Iterator
+from .item import Consumivel, Equipamento
+
+# Mochila do personagem. Itens são imutáveis e comparam por valor (models/item.py), então o
+# próprio item é a chave: itens iguais viram uma pilha (item -> quantidade), e cem poções
+# ocupam uma entrada só. Cada pilha também fica no balde do seu tipo ("vida", "mana") ou do
+# seu slot ("arma", "armadura"): adicionar, remover, usar e achar as poções de um tipo não
+# percorrem a mochila.
+#
+# A ordem é a de chegada das pilhas; uma pilha que acaba e volta entra no fim. Os menus
+# numeram as pilhas nessa ordem (e o replay grava esse índice, ver utils/replay.py).
+
+class Inventario:
+    __slots__ = ("_pilhas", "_consumiveis", "_equipamentos", "_total")
+
+    def __init__(self, itens: Iterable[Consumivel | Equipamento] = ()):
+        self._pilhas: dict[Consumivel | Equipamento, int] = {}
+        # Baldes: tipo/slot -> pilhas daquele tipo (dict usado como conjunto ordenado)
+        self._consumiveis: dict[str, dict[Consumivel, None]] = {}
+        self._equipamentos: dict[str, dict[Equipamento, None]] = {}
+        self._total = 0
+        for item in itens:
+            self.adicionar(item)
+
+    def _balde(self, item: Consumivel | Equipamento) -> dict:
+        if isinstance(item, Equipamento):
+            return self._equipamentos.setdefault(item.slot, {})
+        return self._consumiveis.setdefault(item.tipo, {})
+
+    def adicionar(self, item: Consumivel | Equipamento, quantidade: int = 1) -> None:
+        if quantidade <= 0: return
+        atual = self._pilhas.get(item)
+        if atual is None:
+            self._pilhas[item] = quantidade
+            self._balde(item)[item] = None
+        else:
+            self._pilhas[item] = atual + quantidade
+        self._total += quantidade
+
+    def remover(self, item: Consumivel | Equipamento, quantidade: int = 1) -> None:
+        # Como o list.remove: ValueError se não tiver o suficiente
+        atual = self._pilhas.get(item, 0)
+        if atual < quantidade:
+            raise ValueError(f"Inventario.remover: {quantidade}x {item.nome} não está no inventário")
+        if atual == quantidade:
+            del self._pilhas[item]
+            del self._balde(item)[item]
+        else:
+            self._pilhas[item] = atual - quantidade
+        self._total -= quantidade
+
+    def quantidade(self, item: Consumivel | Equipamento) -> int:
+        return self._pilhas.get(item, 0)
+
+    @property
+    def total(self) -> int:
+        #Itens na mochila, contando cada unidade das pilhas.
+        return self._total
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._pilhas
+
+    def __len__(self) -> int:
+        # Número de pilhas (o que os menus listam); o de itens é total
+        return len(self._pilhas)
+
+    def __iter__(self) -> Iterator[Consumivel | Equipamento]:
+        return iter(self._pilhas)
+
+    def pilhas(self) -> list[tuple[Consumivel | Equipamento, int]]:
+        #[(item, quantidade)] na ordem de chegada.
+        return list(self._pilhas.items())
+
+    def consumiveis(self, tipo: str | None = None) -> list[Consumivel]:
+        #Pilhas de consumíveis (só as do tipo, se pedido), na ordem de chegada.
+        if tipo is not None:
+            return list(self._consumiveis.get(tipo, ()))
+        return [item for item in self._pilhas if not isinstance(item, Equipamento)]
+
+    def equipamentos(self, slot: str | None = None) -> list[Equipamento]:
+        if slot is not None:
+            return list(self._equipamentos.get(slot, ()))
+        return [item for item in self._pilhas if isinstance(item, Equipamento)]
+
+    def __repr__(self) -> str:
+        return f"Inventario({self._total} itens em {len(self._pilhas)} pilhas)"
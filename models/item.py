@@ -1,17 +1,36 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-@dataclass
+# Itens são imutáveis: os de conteudo/itens.json existem uma vez só por processo
+# (models/catalogo.py) e o mesmo objeto é dividido por todo loot, inventário e equipamento.
+# O id é a chave do item no catálogo; é ele que vai para o save. Item criado fora do
+# catálogo (id vazio) ainda é salvo com todos os campos.
+
+@dataclass(frozen=True, slots=True)
 class Item:
     nome: str
     valor: int # Preço de venda (futuro) ou raridade (depois faço a loja)
+    id: str = field(default="", compare=False) # Chave em conteudo/itens.json ("" = item avulso)
+
+    _CAMPOS = ("nome", "valor") # Ordem dos campos no save
+
+    def to_dict(self) -> dict:
+        return {campo: getattr(self, campo) for campo in self._CAMPOS}
 
+@dataclass(frozen=True, slots=True, init=False)
 class Consumivel(Item):
     #Poções e itens de uso único.
-    def __init__(self, nome: str, tipo: str, valor_efeito: int):
-        super().__init__(nome, valor=10)
-        self.tipo = tipo  # "vida" ou "mana"
-        self.valor_efeito = valor_efeito # Quanto cura
+    tipo: str # "vida" ou "mana"
+    valor_efeito: int # Quanto cura
+    _CAMPOS = Item._CAMPOS + ("tipo", "valor_efeito")
+
+    def __init__(self, nome: str, tipo: str, valor_efeito: int, id: str = ""):
+        # Congelado: os campos só podem ser escritos por object.__setattr__
+        object.__setattr__(self, "nome", nome)
+        object.__setattr__(self, "valor", 10)
+        object.__setattr__(self, "id", id)
+        object.__setattr__(self, "tipo", tipo)
+        object.__setattr__(self, "valor_efeito", valor_efeito)
 
     def usar(self, personagem) -> str:
         if self.tipo == "vida":
@@ -22,10 +41,18 @@ class Consumivel(Item):
             return f"Usou {self.nome} e recuperou {self.valor_efeito} MP."
         return "Item sem efeito."
 
+@dataclass(frozen=True, slots=True, init=False)
 class Equipamento(Item):
     #Armas e Armaduras.
-    def __init__(self, nome: str, slot: str, ataque: int = 0, defesa: int = 0):
-        super().__init__(nome, valor=50)
-        self.slot = slot # "arma" ou "armadura"
-        self.ataque_bonus = ataque
-        self.defesa_bonus = defesa
\ No newline at end of file
+    slot: str # "arma" ou "armadura"
+    ataque_bonus: int
+    defesa_bonus: int
+    _CAMPOS = Item._CAMPOS + ("slot", "ataque_bonus", "defesa_bonus")
+
+    def __init__(self, nome: str, slot: str, ataque: int = 0, defesa: int = 0, id: str = ""):
+        object.__setattr__(self, "nome", nome)
+        object.__setattr__(self, "valor", 50)
+        object.__setattr__(self, "id", id)
+        object.__setattr__(self, "slot", slot)
+        object.__setattr__(self, "ataque_bonus", ataque)
+        object.__setattr__(self, "defesa_bonus", defesa)
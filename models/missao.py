@@ -1,271 +1,455 @@
 from __future__ import annotations
-import time
+import hashlib
+import json
 import random
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from time import perf_counter
 from utils.logger import Logger
-from .personagem import Personagem
-from .inimigo import (
-    Inimigo, 
-    Goblin, Lobo, Orc, ReiOgro,                  
-    Ladrao, Cacador, Elfo, EnviadoCacada,        
-    MorcegoGigante, Gargula, Kobold, VermeColossal, 
-    SoldadoZumbi, Ghoul, EspiritoSombrio, Lich   
-)
-from .item import Equipamento, Consumivel
-
-class Cor:
-    VERMELHO = '\033[91m'
-    VERDE = '\033[92m'
-    AMARELO = '\033[93m'
-    AZUL = '\033[94m'
-    CIANO = '\033[96m' # Cor nova para Gelo
-    RESET = '\033[0m'
+from utils.metricas import Metricas
+from utils.replay import salvar_replay
+from utils.terminal import Cor, escrever, pausar, console_atual
+from .personagem import Personagem, ARVORE_EVOLUCAO
+from .inimigo import Inimigo, ESPECIES, dano_em_area
+from .catalogo import catalogo
+from .efeitos import EFEITOS, AgendaEfeitos
+from .spawn import TabelaSpawn
+from .politicas import Politica, PoliticaInterativa, PoliticaGravadora
+
+@dataclass
+class RelatorioCombate:
+    # Resultado estruturado de uma batalha (usado pelo modo headless e simulações)
+    inimigo: str
+    venceu: bool = False
+    fugiu: bool = False
+    turnos: int = 0
+    dano_causado: int = 0
+    dano_recebido: int = 0
+    status_aplicados: dict[str, int] = field(default_factory=dict) # status : vezes aplicado
+    loot: list[str] = field(default_factory=list)
+    xp: int = 0
+    abatidos: int = 0 # Inimigos derrotados (hordas)
 
 @dataclass
 class ResultadoMissao:
     venceu: bool
     detalhes: str
+    relatorio: RelatorioCombate | None = None
+
+# Pesos de spawn por cenário e dificuldade (chance = peso / soma dos pesos), de conteudo/spawn.json.
+# As tabelas de sorteio são montadas uma vez, no primeiro uso (ver tabela_spawn/definir_pesos).
+_CATALOGO = catalogo()
+PESOS_SPAWN: dict[str, dict[str, dict[type[Inimigo], float]]] = {
+    cenario: {dificuldade: {ESPECIES[_CATALOGO.especies[i]]: peso for i, peso in pesos}
+              for dificuldade, pesos in por_dificuldade.items()}
+    for cenario, por_dificuldade in _CATALOGO.spawn.items()
+}
+CHEFES = frozenset(ESPECIES[_CATALOGO.especies[i]] for i in _CATALOGO.chefes)
+
+# Modo sobrevivência: a onda cresce a cada 2 rodadas, até ONDA_MAXIMA inimigos por luta
+ONDA_MAXIMA = 40
+
+def tamanho_onda(rodada: int) -> int:
+    return min(1 + (rodada - 1) // 2, ONDA_MAXIMA)
+
+_TABELAS_SPAWN: dict[tuple[str, str], TabelaSpawn] = {}
+
+def tabela_spawn(cenario: str, dificuldade: str) -> TabelaSpawn:
+    chave = (cenario, dificuldade)
+    tabela = _TABELAS_SPAWN.get(chave)
+    if tabela is None:
+        # Cenário desconhecido usa a Floresta; dificuldade desconhecida conta como Difícil
+        # (ou a primeira do cenário, se o spawn.json não definir a Difícil)
+        por_dificuldade = PESOS_SPAWN.get(cenario, PESOS_SPAWN["Floresta"])
+        pesos = por_dificuldade.get(dificuldade)
+        if pesos is None:
+            pesos = por_dificuldade.get("Difícil") or next(iter(por_dificuldade.values()))
+        tabela = _TABELAS_SPAWN[chave] = TabelaSpawn(pesos)
+    return tabela
+
+def definir_pesos(cenario: str, dificuldade: str, pesos: dict[type[Inimigo], float]) -> None:
+    #Troca os pesos de uma combinação em tempo de execução (ex: testes de balanceamento).
+    PESOS_SPAWN.setdefault(cenario, {})[dificuldade] = dict(pesos)
+    _TABELAS_SPAWN.clear() # Cenários desconhecidos podem ter herdado a tabela antiga
+
+_VERSAO_CONTEUDO: str | None = None
+
+def versao_conteudo() -> str:
+    #Hash curto do conteúdo que muda o resultado de uma batalha (árvore de evolução, spawn e
+    # status dos inimigos). Vai no replay: outro valor = a batalha pode não se repetir igual.
+    global _VERSAO_CONTEUDO
+    if _VERSAO_CONTEUDO is None:
+        inimigos = {}
+        for por_dificuldade in PESOS_SPAWN.values():
+            for pesos in por_dificuldade.values():
+                for classe in pesos:
+                    if classe.__name__ not in inimigos:
+                        e = classe()
+                        a = e._atrib
+                        inimigos[classe.__name__] = [e.nome, a.vida, a.ataque, a.defesa, e.xp_recompensa,
+                                                     [i.nome for i in e.loot_especifico]]
+        conteudo = {
+            "arvore": {c: {str(k): v for k, v in d.items()} for c, d in ARVORE_EVOLUCAO.items()},
+            "spawn": {c: {d: {k.__name__: v for k, v in pesos.items()} for d, pesos in por_dif.items()}
+                      for c, por_dif in PESOS_SPAWN.items()},
+            "inimigos": inimigos,
+        }
+        bruto = json.dumps(conteudo, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        _VERSAO_CONTEUDO = hashlib.sha1(bruto).hexdigest()[:12]
+    return _VERSAO_CONTEUDO
+
+def _sem_saida(*args, **kwargs) -> None:
+    pass
 
 class Missao:
-    def __init__(self, dificuldade: str, cenario: str = "Floresta"):
+    def __init__(self, dificuldade: str, cenario: str = "Floresta", inimigo: Inimigo | None = None,
+                 semente: int | None = None, quantidade: int = 1, inimigos: list[Inimigo] | None = None):
         self.dificuldade = dificuldade
         self.cenario = cenario
-        self.inimigo = self._gerar_inimigo(dificuldade, cenario)
-        self.titulo = f"Batalha contra {self.inimigo.nome}"
-
-    def _gerar_inimigo(self, dif: str, cenario: str) -> Inimigo:
-        #Seleciona o inimigo correto baseando-se no Cenário e na Dificuldade
-        mapa_comuns = {
-            "Trilha":   [Ladrao, Cacador, Elfo],
-            "Floresta": [Goblin, Lobo, Orc],
-            "Caverna":  [Kobold, MorcegoGigante, Gargula],
-            "Ruínas":   [SoldadoZumbi, Ghoul, EspiritoSombrio]
-        }
-        mapa_chefes = {
-            "Trilha": EnviadoCacada, "Floresta": ReiOgro,
-            "Caverna": VermeColossal, "Ruínas": Lich
-        }
+        self.chefe = False
+        # Cada missão tem o próprio gerador (sorteio do inimigo + todo o combate): com a mesma
+        # semente e as mesmas decisões do jogador a batalha se repete igual (ver replay.py)
+        self.semente = semente if semente is not None else random.getrandbits(63)
+        self.rng = random.Random(self.semente)
+        # Os inimigos podem ser fixados (ex: simulações que varrem todos os inimigos);
+        # senão são sorteados: 1 por padrão, ou uma horda de 'quantidade'
+        if inimigo is not None:
+            inimigos = [inimigo]
+        self.inimigo_sorteado = inimigos is None
+        self.inimigos: list[Inimigo] = inimigos if inimigos is not None else self._gerar_inimigos(dificuldade, cenario, quantidade)
+        if len(self.inimigos) == 1:
+            self.titulo = f"Batalha contra {self.inimigo.nome}"
+        else:
+            self.titulo = f"Horda de {len(self.inimigos)} inimigos"
 
-        lista_inimigos = mapa_comuns.get(cenario, [Goblin, Lobo, Orc])
-        classe_chefe = mapa_chefes.get(cenario, ReiOgro)
-        
-        if dif == "Fácil":
-            return random.choice(lista_inimigos[:2])()
-        elif dif == "Média":
-            return random.choice(lista_inimigos)()
-        else: # Difícil
-            if random.random() < 0.30:
-                print(f"{Cor.VERMELHO}!!! UM CHEFE APARECEU !!!{Cor.RESET}")
-                return classe_chefe()
-            else:
-                return random.choice(lista_inimigos[1:])()
+    @property
+    def inimigo(self) -> Inimigo:
+        #O primeiro inimigo (o único, fora das hordas).
+        return self.inimigos[0]
+
+    @staticmethod
+    def inimigos_possiveis(dif: str, cenario: str) -> list[type[Inimigo]]:
+        #Todas as classes de inimigo que _gerar_inimigo pode sortear nessa combinação
+        return list(tabela_spawn(cenario, dif).itens)
+
+    @staticmethod
+    def sortear_encontros(dif: str, cenario: str, k: int) -> list[type[Inimigo]]:
+        #K inimigos sorteados de uma vez (para passar em Missao(..., inimigo=classe()))
+        return tabela_spawn(cenario, dif).amostrar(k)
+
+    def _gerar_inimigos(self, dif: str, cenario: str, quantidade: int = 1) -> list[Inimigo]:
+        #Seleciona os inimigos corretos baseando-se no Cenário e na Dificuldade
+        tabela = tabela_spawn(cenario, dif)
+        classes = tabela.amostrar(quantidade, self.rng)
+        chefes = [i for i, classe in enumerate(classes) if classe in CHEFES]
+        if chefes:
+            self.chefe = True # O aviso de chefe é mostrado no início do combate
+        if len(chefes) > 1:
+            # Uma horda tem no máximo um chefe: os outros sorteios viram inimigos comuns
+            comuns = [(c, peso) for c, peso in zip(tabela.itens, tabela.pesos) if c not in CHEFES]
+            if comuns:
+                novos = self.rng.choices([c for c, _ in comuns], [peso for _, peso in comuns], k=len(chefes) - 1)
+                for i, classe in zip(chefes[1:], novos):
+                    classes[i] = classe
+        return [classe() for classe in classes]
+
+    def executar(self, p: Personagem, gravar: bool = True) -> ResultadoMissao:
+        #Combate interativo no terminal. Grava o replay da batalha em dados/replays/.
+        inicial = p.to_dict() if gravar else None
+        politica = PoliticaGravadora(PoliticaInterativa())
+        rel = self._combater(p, politica, interativo=True)
+        if gravar:
+            self._gravar_replay(inicial, politica.decisoes, rel, p)
+        if rel.venceu:
+            detalhes = "Vitória."
+        elif rel.fugiu:
+            detalhes = "Fugiu."
+        else:
+            detalhes = "Derrota."
+        return ResultadoMissao(rel.venceu, detalhes, rel)
+
+    def _gravar_replay(self, inicial: dict, decisoes: list[list], rel: RelatorioCombate, p: Personagem) -> None:
+        try:
+            salvar_replay({
+                "conteudo": versao_conteudo(),
+                "semente": self.semente,
+                "dificuldade": self.dificuldade,
+                "cenario": self.cenario,
+                "inimigos": [type(e).__name__ for e in self.inimigos],
+                "inimigo_sorteado": self.inimigo_sorteado,
+                "personagem": inicial,
+                "decisoes": decisoes,
+                "resultado": {"venceu": rel.venceu, "fugiu": rel.fugiu, "turnos": rel.turnos,
+                              "dano_causado": rel.dano_causado, "dano_recebido": rel.dano_recebido,
+                              "vida": p._atrib.vida, "vida_inimigos": [e._atrib.vida for e in self.inimigos]},
+            })
+        except OSError as e:
+            Logger.registrar(f"Falha ao gravar replay: {e}", "AVISO")
+
+    def simular(self, p: Personagem, politica: Politica, limite_turnos: int = 1000) -> RelatorioCombate:
+        #Combate headless: sem input, print, sleep ou log. As ações vêm da política.
+        return self._combater(p, politica, interativo=False, limite_turnos=limite_turnos)
+
+    def _combater(self, p: Personagem, politica: Politica, interativo: bool,
+                  limite_turnos: int | None = None) -> RelatorioCombate:
+        out = escrever if interativo else _sem_saida
+        esperar = pausar if interativo else _sem_saida
+        rel = RelatorioCombate(self.inimigo.nome if len(self.inimigos) == 1 else self.titulo)
 
-    def executar(self, p: Personagem) -> ResultadoMissao:
-        Logger.registrar(f"Iniciando missão ({self.cenario}): {p.nome} vs {self.inimigo.nome}")
+        # As entidades também narram (crítico, esquiva...), então seguem a mesma saída,
+        # e sorteiam com o gerador da missão
+        entidades = [p, *self.inimigos]
+        anteriores = [(e.narrador, e.rng) for e in entidades]
+        narrador = escrever if interativo else None
+        for e in entidades:
+            e.narrador = narrador
+            e.rng = self.rng
+        try:
+            self._loop_combate(p, politica, interativo, limite_turnos, out, esperar, rel)
+        finally:
+            for e, (narrador, rng) in zip(entidades, anteriores):
+                e.narrador, e.rng = narrador, rng
+        if Metricas.ativo:
+            resultado = ("vitoria" if rel.venceu else "fuga" if rel.fugiu
+                         else "derrota" if not p.vivo else "limite")
+            Metricas.contar("rpg_batalhas_total", resultado=resultado)
+            Metricas.observar("rpg_batalha_turnos", rel.turnos)
+        return rel
+
+    def _loop_combate(self, p, politica, interativo, limite_turnos, out, esperar, rel) -> None:
+        horda = len(self.inimigos) > 1
+        if interativo:
+            Logger.registrar(f"Iniciando missão ({self.cenario}): {p.nome} vs {rel.inimigo}")
         
-        print(f"\n{Cor.AMARELO}{'='*40}{Cor.RESET}")
-        print(f"CENÁRIO: {self.cenario}")
-        print(f"PERIGO: Você encontrou um {Cor.VERMELHO}{self.inimigo.nome}{Cor.RESET}!")
-        print(f"{Cor.AMARELO}{'='*40}{Cor.RESET}\n")
-        time.sleep(1)
+        if self.chefe:
+            out(f"{Cor.VERMELHO}!!! UM CHEFE APARECEU !!!{Cor.RESET}")
+        out(f"\n{Cor.AMARELO}{'='*40}{Cor.RESET}")
+        out(f"CENÁRIO: {self.cenario}")
+        if horda:
+            out(f"PERIGO: Uma {Cor.VERMELHO}horda de {len(self.inimigos)} inimigos{Cor.RESET} te cercou!")
+        else:
+            out(f"PERIGO: Você encontrou um {Cor.VERMELHO}{self.inimigo.nome}{Cor.RESET}!")
+        out(f"{Cor.AMARELO}{'='*40}{Cor.RESET}\n")
+        esperar(1)
 
         turnos = 0
+        # Quadro de status (barras de HP) a cada turno; o console pode desligar (--sem-quadros)
+        quadros = interativo and console_atual().quadros
+        # Tempo de cada fase do turno (utils/metricas.py); desligado não custa nada além deste teste
+        medir = Metricas.ativo
         
-        # Dicionários de Status (Nome do status : Turnos restantes) isso também funciona para os jogador
-        status_jogador = {"veneno": 0, "fogo": 0}
-        status_inimigo = {"fogo": 0, "congelado": 0, "atordoado": 0}
+        # Efeitos de status ativos de cada lado (models/efeitos.py). Os inimigos ficam em 'vivos'
+        # junto com a agenda de cada um; quem morre sai da lista e não é mais visitado
+        status_jogador = AgendaEfeitos(p, no_jogador=True)
+        vivos = [(e, AgendaEfeitos(e, no_jogador=False)) for e in self.inimigos if e.vivo]
+        aplicados = rel.status_aplicados
 
-        while p.vivo and self.inimigo.vivo:
+        while p.vivo and vivos:
+            if limite_turnos is not None and turnos >= limite_turnos: break
             turnos += 1
-            self._mostrar_status(p, self.inimigo)
-            
-            # Mostra ícones de status se houver
-            stats_msg = []
-            if status_inimigo['fogo'] > 0: stats_msg.append(f"{Cor.AMARELO}🔥 Queimando{Cor.RESET}")
-            if status_inimigo['congelado'] > 0: stats_msg.append(f"{Cor.CIANO}❄️ Congelado{Cor.RESET}")
-            if stats_msg: print(f"Status Inimigo: {' '.join(stats_msg)}")
-
-            print(f"\n--- Turno {turnos} ---")
+            rel.turnos = turnos
+            if quadros:
+                self._mostrar_status(p, vivos, turnos)
+            elif interativo:
+                escrever(f"\n--- Turno {turnos} ---")
 
             # --- 1. PROCESSAR STATUS (DOTs) DO JOGADOR ---
-            if status_jogador["veneno"] > 0:
-                dano = 5
-                p._atrib.vida -= dano
-                status_jogador["veneno"] -= 1
-                print(f"{Cor.VERMELHO}☠️ O veneno te causou {dano} de dano!{Cor.RESET}")
-            
-            if status_jogador["fogo"] > 0:
-                dano = 8
-                p._atrib.vida -= dano
-                status_jogador["fogo"] -= 1
-                print(f"{Cor.AMARELO}🔥 Você está queimando! Sofreu {dano} de dano.{Cor.RESET}")
+            if medir: inicio_fase = perf_counter()
+            if status_jogador:
+                rel.dano_recebido += status_jogador.processar(out)[0]
+                if not p.vivo: break
 
-            if not p.vivo: break
-
-            # --- 2. PROCESSAR STATUS (DOTs) DO INIMIGO ---
-            inimigo_perde_turno = False
-            
-            if status_inimigo["fogo"] > 0:
-                # Dano de queimadura baseado na vida máx do inimigo (min 5, max 20)
-                dano_burn = max(5, int(self.inimigo._atrib.vida_max * 0.05))
-                self.inimigo._atrib.vida -= dano_burn
-                status_inimigo["fogo"] -= 1
-                print(f"{Cor.AMARELO}🔥 {self.inimigo.nome} sofreu {dano_burn} por queimadura!{Cor.RESET}")
-
-            if status_inimigo["congelado"] > 0:
-                inimigo_perde_turno = True
-                status_inimigo["congelado"] -= 1
-                print(f"{Cor.CIANO}❄️ {self.inimigo.nome} está CONGELADO e não pode se mover!{Cor.RESET}")
-            
-            elif status_inimigo["atordoado"] > 0: # Else if, para não perder 2 turnos seguidos no mesmo print
-                inimigo_perde_turno = True
-                status_inimigo["atordoado"] -= 1
-                print(f"💫 {self.inimigo.nome} está ATORDOADO!")
-
-            if not self.inimigo.vivo: break
+            # --- 2. PROCESSAR STATUS (DOTs) DOS INIMIGOS ---
+            sem_acao = set() # Congelados/atordoados neste turno
+            morreu = False
+            for inimigo, agenda in vivos:
+                if agenda:
+                    dano_status, perde_turno = agenda.processar(out)
+                    rel.dano_causado += dano_status
+                    if perde_turno: sem_acao.add(inimigo)
+                    if not inimigo.vivo: morreu = True
+            if morreu:
+                vivos = self._remover_mortos(vivos, rel, horda, out)
+            if medir:
+                agora = perf_counter()
+                Metricas.observar("rpg_turno_fase_segundos", agora - inicio_fase, fase="efeitos")
+                inicio_fase = agora
+            if not vivos: break
 
             # --- 3. TURNO DO JOGADOR ---
-            print("[1] Atacar")
-            print("[2] Habilidade Especial")
-            print("[3] Usar Item")
-            print("[4] Fugir")
-            acao = input("> ").strip()
+            acao = politica.escolher_acao(p, vivos[0][0], turnos)
             
             dano_causado = 0
             msg_acao = ""
             passou_turno = True
+            alvos = vivos
 
             if acao == "1":
+                alvos = [vivos[self._escolher_alvo(p, politica, vivos)]]
                 dano_causado = p.calcular_dano_base()
                 msg_acao = f"atacou com {p.equipamentos['arma'].nome if p.equipamentos['arma'] else 'punhos'}"
             
             elif acao == "2":
-                dano, msg = p.habilidade_especial()
+                opcoes = p.skills_disponiveis()
+                if not opcoes:
+                    dano, msg = 0, "não conhece nenhuma habilidade."
+                else:
+                    nome_skill = politica.escolher_habilidade(p, opcoes)
+                    dano, msg = p._executar_skill(nome_skill) if nome_skill else (0, "cancelou a habilidade.")
                 if dano > 0:
                     dano_causado = dano
                     msg_acao = msg
+                    # O registro de skills da classe (ARVORE_EVOLUCAO) diz se é de área e qual status aplica
+                    skill = p.skill(nome_skill)
+                    if not (skill and skill.area):
+                        alvos = [vivos[self._escolher_alvo(p, politica, vivos)]]
                     
                     # --- APLICAR STATUS BASEADO NA HABILIDADE USADA ---
-                    # Verifica palavras chaves na mensagem retornada pela classe
-                    msg_lower = msg.lower()
-                    
-                    # Mago: Bola de Fogo / Meteoro
-                    if "fogo" in msg_lower or "meteoro" in msg_lower:
-                        if random.random() < 0.5: # 50% de chance de queimar
-                            status_inimigo["fogo"] = 3 # Dura 3 turnos
-                            print(f"{Cor.AMARELO}>>> Você incendeia o inimigo! (Dano contínuo) <<<{Cor.RESET}")
-
-                    # Mago: Raio Congelante
-                    if "congelante" in msg_lower or "gelo" in msg_lower:
-                        if random.random() < 0.4: # 40% chance de congelar
-                            status_inimigo["congelado"] = 1 # Perde 1 turno
-                            print(f"{Cor.CIANO}>>> O inimigo congelou! (Perderá o próximo turno) <<<{Cor.RESET}")
-
-                    # Guerreiro/Outros: Atordoar (Ex: Grito ou Escudo)
-                    if "atordoar" in msg_lower or "esmagar" in msg_lower:
-                         if random.random() < 0.3:
-                            status_inimigo["atordoado"] = 1
-                            print(">>> O impacto atordoou o inimigo! <<<")
+                    if skill and skill.efeito:
+                        nome_efeito, chance = skill.efeito
+                        tipo = EFEITOS[nome_efeito]
+                        chave = tipo.chave_relatorio(no_jogador=False)
+                        for _, agenda in alvos:
+                            if self.rng.random() < chance:
+                                agenda.aplicar(tipo())
+                                aplicados[chave] = aplicados.get(chave, 0) + 1
+                                out(tipo.aviso_inimigo)
 
                 else:
-                    print(f"{Cor.AMARELO}{msg}{Cor.RESET}")
+                    out(f"{Cor.AMARELO}{msg}{Cor.RESET}")
                     passou_turno = False
 
             elif acao == "3":
-                if self._menu_item(p):
+                if self._usar_item(p, politica, out):
                     dano_causado = 0
                     msg_acao = "usou um item"
                 else:
                     passou_turno = False
             
             elif acao == "4":
-                chance = 0.4 if "Rei" not in self.inimigo.nome else 0.15
-                if random.random() < chance:
-                    print(f"{Cor.VERDE}Você fugiu!{Cor.RESET}")
-                    return ResultadoMissao(False, "Fugiu.")
+                chance = 0.15 if any("Rei" in inimigo.nome for inimigo, _ in vivos) else 0.4
+                if self.rng.random() < chance:
+                    out(f"{Cor.VERDE}Você fugiu!{Cor.RESET}")
+                    rel.fugiu = True
+                    return
                 else:
-                    print(f"{Cor.VERMELHO}Falha ao fugir!{Cor.RESET}")
+                    out(f"{Cor.VERMELHO}Falha ao fugir!{Cor.RESET}")
             
             else:
-                print("Opção inválida.")
+                out("Opção inválida.")
                 passou_turno = False
 
-            # --- 4. APLICAÇÃO DO DANO NO INIMIGO ---
+            # --- 4. APLICAÇÃO DO DANO NOS INIMIGOS ---
             if passou_turno:
                 if dano_causado > 0:
-                    real = self.inimigo.receber_dano(dano_causado)
-                    print(f"--> Você {msg_acao} causando {Cor.VERDE}{real}{Cor.RESET} de dano!")
-                    Logger.log_combate(turnos, p.nome, self.inimigo.nome, real)
+                    if len(alvos) == 1:
+                        alvo = alvos[0][0]
+                        real = alvo.receber_dano(dano_causado)
+                        contra = f" em {alvo.nome}" if horda else ""
+                        out(f"--> Você {msg_acao}{contra} causando {Cor.VERDE}{real}{Cor.RESET} de dano!")
+                        if interativo: Logger.log_combate(turnos, p.nome, alvo.nome, real)
+                    else:
+                        # Skill de área: o mesmo dano em todos os vivos numa passada só
+                        real = sum(dano_em_area([inimigo for inimigo, _ in alvos], dano_causado))
+                        out(f"--> Você {msg_acao} atingindo {len(alvos)} inimigos: {Cor.VERDE}{real}{Cor.RESET} de dano no total!")
+                        if interativo: Logger.log_combate(turnos, p.nome, f"{len(alvos)} inimigos", real)
+                    rel.dano_causado += real
+                    if any(not inimigo.vivo for inimigo, _ in alvos):
+                        vivos = self._remover_mortos(vivos, rel, horda, out)
+                if medir:
+                    Metricas.observar("rpg_turno_fase_segundos", perf_counter() - inicio_fase, fase="jogador")
                 
-                if not self.inimigo.vivo: break
+                if not vivos: break
 
-                # --- 5. TURNO DO INIMIGO ---
-                time.sleep(0.5)
+                # --- 5. TURNO DOS INIMIGOS ---
+                esperar(0.5)
+                if medir: inicio_fase = perf_counter()
                 
-                if inimigo_perde_turno:
-                    print(f"{Cor.CIANO}O {self.inimigo.nome} não pode atacar neste turno!{Cor.RESET}")
-                else:
+                for inimigo, _ in vivos:
+                    if inimigo in sem_acao:
+                        out(f"{Cor.CIANO}O {inimigo.nome} não pode atacar neste turno!{Cor.RESET}")
+                        continue
+
                     # Inimigo age
-                    dano_ini, msg_ini = self.inimigo.realizar_acao()
-                    
-                    # -- Inimigo aplicando status no Jogador --
-                    if "Zumbi" in self.inimigo.nome or "Aranha" in self.inimigo.nome:
-                        if random.random() < 0.2 and status_jogador["veneno"] == 0:
-                            status_jogador["veneno"] = 3
-                            print(f"{Cor.VERMELHO}!!! O inimigo te envenenou! !!!{Cor.RESET}")
+                    dano_ini, msg_ini = inimigo.realizar_acao()
                     
-                    if "Lich" in self.inimigo.nome or "Dragão" in self.inimigo.nome:
-                         if random.random() < 0.2 and status_jogador["fogo"] == 0:
-                            status_jogador["fogo"] = 3
-                            print(f"{Cor.AMARELO}!!! O inimigo te incendiou! !!!{Cor.RESET}")
+                    # -- Inimigo aplicando status no Jogador (declarado em Inimigo.efeitos_ataque) --
+                    for tipo, chance in inimigo.efeitos_ataque:
+                        if self.rng.random() < chance and not status_jogador.ativo(tipo):
+                            status_jogador.aplicar(tipo())
+                            chave = tipo.chave_relatorio(no_jogador=True)
+                            aplicados[chave] = aplicados.get(chave, 0) + 1
+                            out(tipo.aviso_jogador)
 
-                    dano_var = int(dano_ini * random.uniform(0.9, 1.1))
+                    dano_var = int(dano_ini * self.rng.uniform(0.9, 1.1))
                     recebido = p.receber_dano(dano_var)
+                    rel.dano_recebido += recebido
                     
-                    print(f"<-- O {self.inimigo.nome} {msg_ini}! Você sofreu {Cor.VERMELHO}{recebido}{Cor.RESET} de dano.")
-                    Logger.log_combate(turnos, self.inimigo.nome, p.nome, recebido)
+                    out(f"<-- O {inimigo.nome} {msg_ini}! Você sofreu {Cor.VERMELHO}{recebido}{Cor.RESET} de dano.")
+                    if interativo: Logger.log_combate(turnos, inimigo.nome, p.nome, recebido)
+                    if not p.vivo: break
+                if medir:
+                    Metricas.observar("rpg_turno_fase_segundos", perf_counter() - inicio_fase, fase="inimigos")
 
         # --- FIM DO COMBATE ---
-        if p.vivo:
-            print(f"\n{Cor.VERDE}VITÓRIA! O inimigo caiu.{Cor.RESET}")
-            xp = self.inimigo.xp_recompensa
-            msgs = p.ganhar_xp(xp)
-            print(f"Ganhou {Cor.AMARELO}{xp} XP{Cor.RESET}.")
-            for m in msgs: print(f"{Cor.AZUL}{m}{Cor.RESET}")
-            self._dropar_loot(p)
-            return ResultadoMissao(True, "Vitória.")
-        else:
-            print(f"\n{Cor.VERMELHO}DERROTA...{Cor.RESET}")
-            return ResultadoMissao(False, "Derrota.")
+        if p.vivo and not vivos:
+            out(f"\n{Cor.VERDE}VITÓRIA! {'A horda caiu' if horda else 'O inimigo caiu'}.{Cor.RESET}")
+            rel.venceu = True
+            rel.xp = sum(inimigo.xp_recompensa for inimigo in self.inimigos)
+            msgs = p.ganhar_xp(rel.xp)
+            out(f"Ganhou {Cor.AMARELO}{rel.xp} XP{Cor.RESET}.")
+            for m in msgs: out(f"{Cor.AZUL}{m}{Cor.RESET}")
+            rel.loot = self._dropar_loot(p, out)
+        elif not p.vivo:
+            out(f"\n{Cor.VERMELHO}DERROTA...{Cor.RESET}")
+
+    def _escolher_alvo(self, p, politica: Politica, vivos: list) -> int:
+        # Com um inimigo só não há o que escolher (e nada vai para o replay)
+        if len(vivos) == 1:
+            return 0
+        return politica.escolher_alvo(p, [inimigo for inimigo, _ in vivos])
+
+    def _remover_mortos(self, vivos: list, rel: RelatorioCombate, horda: bool, out) -> list:
+        restantes = []
+        for par in vivos:
+            if par[0].vivo:
+                restantes.append(par)
+            else:
+                rel.abatidos += 1
+                if horda: out(f"{Cor.VERDE}✝ {par[0].nome} caiu!{Cor.RESET}")
+        return restantes
 
-    def _mostrar_status(self, p, e):
-        print(f"\n{Cor.AZUL}{p.nome}{Cor.RESET}: {p.barra_hp()} | MP: {p._atrib.mana}")
-        print(f"{Cor.VERMELHO}{e.nome}{Cor.RESET}: {e.barra_hp()}")
+    def _mostrar_status(self, p, vivos: list, turno: int):
+        # O quadro inteiro é montado antes e vai ao console de uma vez
+        linhas = [f"\n{Cor.AZUL}{p.nome}{Cor.RESET}: {p.barra_hp()} | MP: {p._atrib.mana}"]
+        if len(self.inimigos) == 1:
+            e, agenda = vivos[0]
+            linhas.append(f"{Cor.VERMELHO}{e.nome}{Cor.RESET}: {e.barra_hp()}")
+            # Mostra ícones de status se houver
+            icones = agenda.icones()
+            if icones: linhas.append(f"Status Inimigo: {' '.join(icones)}")
+        else:
+            for i, (e, agenda) in enumerate(vivos, 1):
+                linhas.append(f"[{i}] {Cor.VERMELHO}{e.nome}{Cor.RESET}: {e.barra_hp(10)} {' '.join(agenda.icones())}")
+        linhas.append(f"\n--- Turno {turno} ---")
+        escrever("\n".join(linhas))
 
-    def _menu_item(self, p: Personagem) -> bool:
-        potions = [i for i in p.inventario if isinstance(i, Consumivel)]
+    def _usar_item(self, p: Personagem, politica: Politica, out) -> bool:
+        potions = p.inventario.consumiveis() # Uma entrada por pilha
         if not potions:
-            print("Sem poções!")
+            out("Sem poções!")
             return False
-        print("\n--- Itens ---")
-        for i, item in enumerate(potions):
-            print(f"[{i+1}] {item.nome}")
-        print("[0] Cancelar")
-        try:
-            op = int(input("> "))
-            if op > 0 and op <= len(potions):
-                item = potions[op-1]
-                print(f"{Cor.VERDE}{item.usar(p)}{Cor.RESET}")
-                p.inventario.remove(item)
-                return True
-        except: pass
-        return False
-
-    def _dropar_loot(self, p: Personagem):
-        itens = self.inimigo.gerar_loot()
+        item = politica.escolher_item(p, potions)
+        if item is None:
+            return False
+        out(f"{Cor.VERDE}{p.usar_item(item)}{Cor.RESET}")
+        return True
+
+    def _dropar_loot(self, p: Personagem, out=escrever) -> list[str]:
+        itens = [item for inimigo in self.inimigos for item in inimigo.gerar_loot()]
         if itens:
             for item in itens:
-                print(f"{Cor.AMARELO}LOOT! {item.nome}{Cor.RESET}")
-                p.inventario.append(item)
+                out(f"{Cor.AMARELO}LOOT! {item.nome}{Cor.RESET}")
+                p.adicionar_item(item)
         else:
-            print("Sem loot.")
\ No newline at end of file
+            out("Sem loot.")
+        return [item.nome for item in itens]
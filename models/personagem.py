@@ -1,109 +1,233 @@
 from __future__ import annotations
-import random
+import math
+import unicodedata
+from dataclasses import dataclass
+from typing import Callable
 from .base import Entidade, Atributos
 from .item import Equipamento, Consumivel
+from .inventario import Inventario
+from .catalogo import catalogo
+from utils.formato_binario import decodificar
+from utils.logger import Logger
+from utils.metricas import Metricas
+from utils.terminal import Cor, escrever, ler
 
 # --- TABELA DE PROGRESSÃO (LIVRO DE REGRAS) ---
-# Define o que cada classe ganha em cada nível, vai ser puxada pela função de preview
-ARVORE_EVOLUCAO = {
-    "Guerreiro": {
-        1:  {"tipo": "skill", "nome": "Golpe Devastador", "custo": 10, "desc": "Ataque pesado (200% ATK)."},
-        5:  {"tipo": "passiva", "nome": "Pele de Ferro", "desc": "Reduz todo dano recebido em 15%."},
-        10: {"tipo": "skill", "nome": "Grito de Guerra", "custo": 20, "desc": "Causa dano e recupera 20 HP."},
-        15: {"tipo": "passiva", "nome": "Berserker", "desc": "Se HP < 30%, seu ataque dobra."},
-        20: {"tipo": "skill", "nome": "Execução Final", "custo": 50, "desc": "Golpe massivo (400% ATK)."},
-        "status_base": {"vida": 15, "mana": 5, "ataque": 2, "defesa": 1} # Ganho padrão por nível
-    },
-    "Mago": {
-        1:  {"tipo": "skill", "nome": "Bola de Fogo", "custo": 25, "desc": "Dano mágico alto (40 fixo + 150% ATK)."},
-        5:  {"tipo": "passiva", "nome": "Mente Clara", "desc": "Recupera 5 Mana por turno automaticamente."},
-        10: {"tipo": "skill", "nome": "Raio Congelante", "custo": 40, "desc": "Dano alto + Chance de atordoar (turno perdido)."},
-        15: {"tipo": "passiva", "nome": "Escudo Arcano", "desc": "Se Mana > 50%, ganha +5 Defesa extra."},
-        20: {"tipo": "skill", "nome": "Meteoro", "custo": 100, "desc": "Destruição total em área (500% ATK)."},
-        "status_base": {"vida": 8, "mana": 15, "ataque": 1, "defesa": 0}
-    },
-    "Arqueiro": {
-        1:  {"tipo": "skill", "nome": "Flecha Precisa", "custo": 15, "desc": "Tiro focado (150% ATK + Crítico garantido)."},
-        5:  {"tipo": "passiva", "nome": "Olhos de Águia", "desc": "Aumenta chance de crítico base em 20%."},
-        10: {"tipo": "skill", "nome": "Chuva de Flechas", "custo": 30, "desc": "3 ataques rápidos de 70% ATK cada."},
-        15: {"tipo": "passiva", "nome": "Evasão Ladina", "desc": "20% de chance de desviar completamente de um ataque."},
-        20: {"tipo": "skill", "nome": "Flecha Fantasma", "custo": 60, "desc": "Ignora defesa do inimigo (300% Dano Real)."},
-        "status_base": {"vida": 10, "mana": 8, "ataque": 3, "defesa": 1}
-    }
+# Define o que cada classe ganha em cada nível, vai ser puxada pela função de preview.
+# Vem de conteudo/classes.json (models/catalogo.py): {classe: {nível: recompensa, "status_base": ganho por nível}}
+ARVORE_EVOLUCAO = catalogo().arvore
+
+# --- PASSIVAS (bitset) ---
+# Cada passiva é um bit em Personagem._passivas. Os modificadores fixos são compilados quando
+# a passiva é ativada (_compilar_passivas); as condicionais (Berserker, Escudo Arcano) testam o bit.
+PASSIVAS: dict[str, tuple[int, dict[str, float]]] = {
+    "Pele de Ferro":  (1 << 0, {"dano_recebido": 0.85}),
+    "Berserker":      (1 << 1, {}),
+    "Mente Clara":    (1 << 2, {"regen_mana": 5}),
+    "Escudo Arcano":  (1 << 3, {}),
+    "Olhos de Águia": (1 << 4, {"chance_crit": 0.20}),
+    "Evasão Ladina":  (1 << 5, {"esquiva": 0.20}),
 }
+BERSERKER = PASSIVAS["Berserker"][0]
+ESCUDO_ARCANO = PASSIVAS["Escudo Arcano"][0]
+CHANCE_CRITICO_BASE = 0.05
+
+
+class ContadorCache:
+    #Acertos/falhas do cache de ataque_total/defesa_total (todas as instâncias juntas).
+    __slots__ = ("acertos", "falhas")
+
+    def __init__(self):
+        self.zerar()
+
+    def zerar(self) -> None:
+        self.acertos = self.falhas = 0
+
+    @property
+    def taxa_acerto(self) -> float:
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
+
+    def __repr__(self) -> str:
+        return f"ContadorCache(acertos={self.acertos}, falhas={self.falhas}, taxa={self.taxa_acerto:.1%})"
+
+
+ESTATISTICAS_CACHE = ContadorCache()
+
+
+def xp_para_nivel(nivel: int) -> int:
+    # XP acumulado para sair do nível 1 e chegar em 'nivel' (100 + 200 + ... + 100 * (nivel - 1))
+    return 50 * nivel * (nivel - 1)
+
+
+def nivel_por_xp(xp_total: int) -> tuple[int, int]:
+    #Inverso de xp_para_nivel em O(1): (nível alcançado, XP que sobra dentro dele).
+    # 50n(n-1) <= xp  <=>  n(n-1) <= xp // 50  <=>  n <= (1 + sqrt(1 + 4 * (xp // 50))) / 2
+    nivel = (1 + math.isqrt(1 + 4 * (max(0, xp_total) // 50))) // 2
+    return nivel, xp_total - xp_para_nivel(nivel)
+
+
+def id_skill(nome: str) -> str:
+    # "Execução Final" -> "execucao_final" (é também o sufixo do método skill_*)
+    sem_acento = unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode("ascii")
+    return sem_acento.lower().replace(" ", "_")
+
+
+@dataclass(frozen=True, slots=True)
+class Skill:
+    #Entrada do registro de skills de uma classe (montado uma vez, na definição da classe).
+    id: str
+    nome: str
+    custo: int
+    desc: str
+    nivel: int
+    efeito: tuple[str, float] | None # (status aplicado no inimigo, chance)
+    area: bool # Atinge todos os inimigos vivos (hordas)
+    executar: Callable[[Personagem], tuple[int, str]] # o método skill_* da classe
+
+    def __getitem__(self, chave: str):
+        # Compatível com o formato antigo (dicts da ARVORE_EVOLUCAO): skill["nome"], skill["custo"]...
+        return getattr(self, chave)
+
 
 class Personagem(Entidade):
+    __slots__ = ("_sujos", "_salvos", "nivel", "xp", "inventario", "equipamentos",
+                 "habilidades_conhecidas", "_passivas_nomes", "_passivas",
+                 "_chance_crit", "_esquiva", "_mult_dano_recebido", "_regen_mana",
+                 "_cache_ataque", "_cache_defesa")
+
+    # Campos simples que vão para o save: o autosave incremental compara com os valores do
+    # último save (_salvos) e grava os que mudaram. Listas/dicts são marcados por marcar_sujo.
+    _CAMPOS_RASTREADOS = frozenset({"nivel", "xp"})
+
+    # Registro de skills da classe (preenchido em __init_subclass__): id -> Skill, nome -> Skill,
+    # e todas ordenadas por custo para o menu
+    _SKILLS: dict[str, Skill] = {}
+    _SKILLS_POR_NOME: dict[str, Skill] = {}
+    _SKILLS_ORDENADAS: tuple[Skill, ...] = ()
+
+    # Tabela de progressão da classe: ganho fixo por nível e recompensas em ordem de nível
+    _GANHO_NIVEL: dict[str, int] = {}
+    _DESBLOQUEIOS: tuple[tuple[int, dict], ...] = ()
+    _ATRIBUTOS_INICIAIS: tuple[int, int, int, int] = (100, 10, 0, 0) # (vida, ataque, defesa, mana) no nível 1
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        arvore = ARVORE_EVOLUCAO.get(cls.__name__, {})
+        cls._ATRIBUTOS_INICIAIS = catalogo().atributos.get(cls.__name__, cls._ATRIBUTOS_INICIAIS)
+        cls._GANHO_NIVEL = arvore.get("status_base", {})
+        cls._DESBLOQUEIOS = tuple(sorted((nivel, info) for nivel, info in arvore.items() if nivel != "status_base"))
+
+        registro = []
+        for nivel, info in cls._DESBLOQUEIOS:
+            if info["tipo"] != "skill":
+                continue
+            ident = id_skill(info["nome"])
+            metodo = getattr(cls, f"skill_{ident}", None)
+            if metodo is None:
+                raise TypeError(f"{cls.__name__} não implementa skill_{ident} ({info['nome']})")
+            registro.append(Skill(ident, info["nome"], info["custo"], info["desc"], nivel,
+                                  info.get("efeito"), info.get("area", False), metodo))
+        cls._SKILLS = {s.id: s for s in registro}
+        cls._SKILLS_POR_NOME = {s.nome: s for s in registro}
+        cls._SKILLS_ORDENADAS = tuple(sorted(registro, key=lambda s: s.custo))
+
     def __init__(self, nome: str, atrib: Atributos):
+        self._sujos: set[str] = set()
+        self._salvos: dict[str, int] = {} # Vazio: personagem novo, nível e XP ainda não salvos
+        self._cache_ataque = self._cache_defesa = None
         super().__init__(nome, atrib)
+        atrib.rastrear_mudancas()
         self.nivel = 1
         self.xp = 0
         
-        self.inventario: list[Consumivel | Equipamento] = []
+        self.inventario = Inventario() # Pilhas de itens iguais, com baldes por tipo/slot
         self.equipamentos: dict[str, Equipamento | None] = {"arma": None, "armadura": None}
         
         # Novas listas para guardar o progresso
         self.habilidades_conhecidas: list[str] = [] 
-        self.passivas_ativas: list[str] = []
+        self.passivas_ativas = []
         
         # Inicializa skill nível 1
-        self._desbloquear_nivel(1, logs=False)
+        self._subir_niveis(0, 1)
 
     # --- Propriedades de Combate ---
+    # ataque_total/defesa_total ficam em cache: (estado do limiar da passiva, valor).
+    # O cache é invalidado por equipar_item, level up, passivas novas e from_dict (invalidar_stats),
+    # e se recalcula sozinho quando o HP/mana cruza o limiar do Berserker ou do Escudo Arcano.
     @property
     def ataque_total(self) -> int:
-        base = self._atrib.ataque
-        bonus = 0
-        if self.equipamentos["arma"]: bonus += self.equipamentos["arma"].ataque_bonus
-        if self.equipamentos["armadura"]: bonus += self.equipamentos["armadura"].ataque_bonus
-        
         # Passiva: Berserker (Guerreiro Lv 15)
-        if "Berserker" in self.passivas_ativas and (self._atrib.vida < self._atrib.vida_max * 0.3):
+        furia = bool(self._passivas & BERSERKER) and self._atrib.vida < self._atrib.vida_max * 0.3
+        cache = self._cache_ataque
+        if cache is not None and cache[0] == furia:
+            ESTATISTICAS_CACHE.acertos += 1
+            return cache[1]
+        ESTATISTICAS_CACHE.falhas += 1
+
+        base = self._atrib.ataque
+        bonus = sum(item.ataque_bonus for item in self.equipamentos.values() if item)
+        if furia:
             base *= 2
-            
-        return int(base + bonus)
+        valor = int(base + bonus)
+        self._cache_ataque = (furia, valor)
+        return valor
 
     @property
     def defesa_total(self) -> int:
-        base = self._atrib.defesa
-        bonus = 0
-        if self.equipamentos["armadura"]: bonus += self.equipamentos["armadura"].defesa_bonus
-        if self.equipamentos["arma"]: bonus += self.equipamentos["arma"].defesa_bonus
-        
         # Passiva: Escudo Arcano (Mago Lv 15)
-        if "Escudo Arcano" in self.passivas_ativas and self._atrib.mana > 50:
+        escudo = bool(self._passivas & ESCUDO_ARCANO) and self._atrib.mana > 50
+        cache = self._cache_defesa
+        if cache is not None and cache[0] == escudo:
+            ESTATISTICAS_CACHE.acertos += 1
+            return cache[1]
+        ESTATISTICAS_CACHE.falhas += 1
+
+        bonus = sum(item.defesa_bonus for item in self.equipamentos.values() if item)
+        if escudo:
             bonus += 5
-            
-        return base + bonus
+        valor = self._atrib.defesa + bonus
+        self._cache_defesa = (escudo, valor)
+        return valor
+
+    def invalidar_stats(self) -> None:
+        #Chamar depois de mexer direto em equipamentos ou em ataque/defesa base.
+        self._cache_ataque = self._cache_defesa = None
 
     # --- Ações ---
 
     def calcular_dano_base(self) -> int:
-        dano = self.ataque_total * random.uniform(0.9, 1.1)
-        
-        # Chance de Crítico Padrão (5%)
-        chance_crit = 0.05
-        # Passiva: Olhos de Águia (Arqueiro Lv 5)
-        if "Olhos de Águia" in self.passivas_ativas:
-            chance_crit += 0.20 # +20%
+        dano = self.ataque_total * self.rng.uniform(0.9, 1.1)
+        medir = Metricas.ativo
+        if medir and self._cache_ataque[0]: # O cache diz se o Berserker entrou neste cálculo
+            Metricas.contar("rpg_passivas_total", passiva="Berserker")
         
-        if random.random() < chance_crit:
-            print(f"\033[93mCRÍTICO! {self.nome} acertou um ponto vital!\033[0m")
+        # Chance de Crítico: 5% padrão, +20% com Olhos de Águia (Arqueiro Lv 5)
+        if self.rng.random() < self._chance_crit:
+            self._narrar(f"{Cor.AMARELO}CRÍTICO! {self.nome} acertou um ponto vital!{Cor.RESET}")
             dano *= 1.5
+            if medir: Metricas.contar("rpg_criticos_total", classe=type(self).__name__)
             
         return int(dano)
 
     def receber_dano(self, dano: int) -> int:
         # Passiva: Evasão Ladina (Arqueiro Lv 15)
-        if "Evasão Ladina" in self.passivas_ativas:
-            if random.random() < 0.20: # 20% chance
-                print(f"\033[94m{self.nome} DESVIOU do ataque com agilidade!\033[0m")
+        if self._esquiva:
+            if self.rng.random() < self._esquiva: # 20% chance
+                self._narrar(f"{Cor.AZUL}{self.nome} DESVIOU do ataque com agilidade!{Cor.RESET}")
+                if Metricas.ativo:
+                    Metricas.contar("rpg_esquivas_total", classe=type(self).__name__)
+                    Metricas.contar("rpg_passivas_total", passiva="Evasão Ladina")
                 return 0
 
         efetivo = max(0, dano - self.defesa_total)
+        if Metricas.ativo and self._cache_defesa[0]:
+            Metricas.contar("rpg_passivas_total", passiva="Escudo Arcano")
         
         # Passiva: Pele de Ferro (Guerreiro Lv 5)
-        if "Pele de Ferro" in self.passivas_ativas:
-            efetivo = int(efetivo * 0.85) # Reduz 15%
+        if self._mult_dano_recebido != 1.0:
+            efetivo = int(efetivo * self._mult_dano_recebido) # Reduz 15%
+            if Metricas.ativo: Metricas.contar("rpg_passivas_total", passiva="Pele de Ferro")
 
         self._atrib.vida = max(0, self._atrib.vida - efetivo)
         return efetivo
@@ -113,138 +237,274 @@ class Personagem(Entidade):
         self._atrib.vida = min(self._atrib.vida_max, self._atrib.vida + valor)
         return self._atrib.vida - vida_antiga
 
+    def adicionar_item(self, item: Consumivel | Equipamento, quantidade: int = 1) -> None:
+        self.inventario.adicionar(item, quantidade)
+        self._sujos.add("inventario")
+
+    def remover_item(self, item: Consumivel | Equipamento, quantidade: int = 1) -> None:
+        self.inventario.remover(item, quantidade)
+        self._sujos.add("inventario")
+
+    def usar_item(self, item: Consumivel) -> str:
+        #Usa uma unidade da pilha e devolve a mensagem do efeito.
+        mensagem = item.usar(self)
+        self.remover_item(item)
+        return mensagem
+
     def equipar_item(self, item: Equipamento):
         if item not in self.inventario: return
         atual = self.equipamentos.get(item.slot)
-        if atual: self.inventario.append(atual)
+        if atual: self.inventario.adicionar(atual)
         self.equipamentos[item.slot] = item
-        self.inventario.remove(item)
-        print(f"Você equipou: {item.nome}")
+        self.inventario.remover(item)
+        self.invalidar_stats()
+        self._sujos.update(("inventario", "equipamentos"))
+        escrever(f"Você equipou: {item.nome}")
 
     # --- Sistema de Level Up e Desbloqueio ---
 
-    def ganhar_xp(self, quantidade: int) -> list[str]:
-        self.xp += quantidade
+    @classmethod
+    def no_nivel(cls, nome: str, nivel: int = 1) -> Personagem:
+        #Cria o personagem direto no nível pedido, com as skills/passivas do caminho
+        # (mesmo resultado de ganhar_xp(xp_para_nivel(nivel)), mas sem as mensagens).
+        p = cls(nome)
+        if nivel > 1:
+            p.nivel = nivel
+            p._subir_niveis(1, nivel)
+        return p
+
+    def ganhar_xp(self, quantidade: int, logs: bool = True) -> list[str]:
+        # Resolve o XP em O(1) (nível final + sobra) e aplica todos os níveis ganhos de uma vez
+        antigo = self.nivel
+        nivel, resto = nivel_por_xp(xp_para_nivel(antigo) + self.xp + quantidade)
+        if nivel <= antigo:
+            self.xp += quantidade
+            return []
+        self.nivel = nivel
+        self.xp = resto
+        novos = self._subir_niveis(antigo, nivel)
+        if not logs:
+            return []
+
         mensagens = []
-        while True:
-            xp_nec = self.nivel * 100
-            if self.xp >= xp_nec:
-                self.xp -= xp_nec
-                self.nivel += 1
-                msg_up = self._desbloquear_nivel(self.nivel)
-                mensagens.append(f"SUBIU PARA O NÍVEL {self.nivel}!")
-                mensagens.extend(msg_up)
-            else:
-                break
+        for n in range(antigo + 1, nivel + 1):
+            mensagens.append(f"SUBIU PARA O NÍVEL {n}!")
+            mensagens.extend(self._mensagens_nivel(n, novos))
         return mensagens
 
-    def _desbloquear_nivel(self, nivel: int, logs: bool = True) -> list[str]:
-        msgs = []
-        classe_nome = self.__class__.__name__
-        dados_classe = ARVORE_EVOLUCAO.get(classe_nome, {})
-        
-        stats = dados_classe.get("status_base", {})
-        self._atrib.vida_max += stats.get("vida", 10)
-        self._atrib.mana += stats.get("mana", 5)
-        self._atrib.ataque += stats.get("ataque", 1)
-        self._atrib.defesa += stats.get("defesa", 0)
+    def _subir_niveis(self, de: int, ate: int) -> dict[int, dict]:
+        # Aplica os níveis de+1..ate de uma vez: os ganhos de status são lineares no número de níveis.
+        # Devolve as recompensas (skills/passivas) que eram novas, por nível.
+        k = ate - de
+        stats = self._GANHO_NIVEL
+        self._atrib.vida_max += k * stats.get("vida", 10)
+        self._atrib.mana += k * stats.get("mana", 5)
+        self._atrib.ataque += k * stats.get("ataque", 1)
+        self._atrib.defesa += k * stats.get("defesa", 0)
         self._atrib.vida = self._atrib.vida_max # Cura ao upar
-        
-        if logs:
-            msgs.append(f"Atributos: +{stats['vida']} HP, +{stats['mana']} MP, +{stats['ataque']} Atk")
+        self.invalidar_stats()
 
-        recompensa = dados_classe.get(nivel)
-        if recompensa:
-            tipo = recompensa["tipo"]
+        novos = {}
+        for nivel, recompensa in self._DESBLOQUEIOS:
+            if nivel <= de:
+                continue
+            if nivel > ate:
+                break
             nome = recompensa["nome"]
-            
-            if tipo == "skill":
+            if recompensa["tipo"] == "skill":
                 if nome not in self.habilidades_conhecidas:
                     self.habilidades_conhecidas.append(nome)
-                    if logs: msgs.append(f"NOVA HABILIDADE: [{nome}] - {recompensa['desc']}")
-            
-            elif tipo == "passiva":
-                if nome not in self.passivas_ativas:
-                    self.passivas_ativas.append(nome)
-                    if logs: msgs.append(f"NOVA PASSIVA: [{nome}] - {recompensa['desc']}")
-        
+                    self._sujos.add("skills")
+                    novos[nivel] = recompensa
+            elif recompensa["tipo"] == "passiva":
+                if nome not in self._passivas_nomes:
+                    self._passivas_nomes.append(nome)
+                    self._sujos.add("passivas")
+                    novos[nivel] = recompensa
+        if any(r["tipo"] == "passiva" for r in novos.values()):
+            self._compilar_passivas()
+        return novos
+
+    def _mensagens_nivel(self, nivel: int, novos: dict[int, dict]) -> list[str]:
+        stats = self._GANHO_NIVEL
+        msgs = [f"Atributos: +{stats['vida']} HP, +{stats['mana']} MP, +{stats['ataque']} Atk"]
+        recompensa = novos.get(nivel)
+        if recompensa:
+            rotulo = "NOVA HABILIDADE" if recompensa["tipo"] == "skill" else "NOVA PASSIVA"
+            msgs.append(f"{rotulo}: [{recompensa['nome']}] - {recompensa['desc']}")
         return msgs
 
-    # --- MENU DE HABILIDADES EM COMBATE ---
-    def habilidade_especial(self) -> tuple[int, str]:
-        if not self.habilidades_conhecidas:
-            return 0, "não conhece nenhuma habilidade."
-        
-        if len(self.habilidades_conhecidas) == 1:
-            return self._executar_skill(self.habilidades_conhecidas[0])
-        
-        print("\n--- Escolha sua Habilidade ---")
-        
-        dados_classe = ARVORE_EVOLUCAO.get(self.__class__.__name__, {})
-        
-        mapa_skills = []
-        for lvl, info in dados_classe.items():
-            if lvl == "status_base": continue
-            if info["tipo"] == "skill" and info["nome"] in self.habilidades_conhecidas:
-                mapa_skills.append(info)
+    # --- Passivas ---
 
-        # Ordena por custo de mana
-        mapa_skills.sort(key=lambda x: x["custo"])
+    @property
+    def passivas_ativas(self) -> list[str]:
+        return self._passivas_nomes
+
+    @passivas_ativas.setter
+    def passivas_ativas(self, nomes: list[str]) -> None:
+        self._passivas_nomes = nomes
+        self._compilar_passivas()
+
+    def tem_passiva(self, nome: str) -> bool:
+        bit = PASSIVAS.get(nome, (0,))[0]
+        return bool(self._passivas & bit)
+
+    def _compilar_passivas(self) -> None:
+        # Recalcula o bitset e os modificadores fixos a partir da lista de nomes
+        # (só quando uma passiva é ativada ou carregada, nunca durante o combate)
+        bits, crit, esquiva, mult, regen = 0, 0.0, 0.0, 1.0, 0
+        for nome in self._passivas_nomes:
+            bit, mods = PASSIVAS.get(nome, (0, {}))
+            bits |= bit
+            crit += mods.get("chance_crit", 0.0)
+            esquiva += mods.get("esquiva", 0.0)
+            mult *= mods.get("dano_recebido", 1.0)
+            regen += mods.get("regen_mana", 0)
+        self._passivas = bits
+        self._chance_crit = CHANCE_CRITICO_BASE + crit
+        self._esquiva = esquiva
+        self._mult_dano_recebido = mult
+        self._regen_mana = regen
+        self.invalidar_stats()
 
+    # --- MENU DE HABILIDADES EM COMBATE ---
+    def skills_disponiveis(self) -> list[Skill]:
+        # Skills conhecidas pela classe, ordenadas por custo de mana
+        conhecidas = self.habilidades_conhecidas
+        return [s for s in self._SKILLS_ORDENADAS if s.nome in conhecidas]
+
+    @classmethod
+    def skill(cls, chave: str) -> Skill | None:
+        #Busca no registro da classe pelo nome ("Bola de Fogo") ou pelo id ("bola_de_fogo").
+        return cls._SKILLS_POR_NOME.get(chave) or cls._SKILLS.get(chave)
+
+    def escolher_habilidade(self) -> str | None:
+        #Menu interativo de skills, retorna o nome escolhido (None se cancelou).
+        mapa_skills = self.skills_disponiveis()
+        if len(mapa_skills) == 1:
+            return mapa_skills[0].nome
+        
+        escrever("\n--- Escolha sua Habilidade ---")
         for i, skill in enumerate(mapa_skills):
-            print(f"[{i+1}] {skill['nome']} (MP: {skill['custo']}) - {skill['desc']}")
-        print("[0] Cancelar")
+            escrever(f"[{i+1}] {skill.nome} (MP: {skill.custo}) - {skill.desc}")
+        escrever("[0] Cancelar")
         
         try:
-            op = int(input("> ")) - 1
+            op = int(ler("> ")) - 1
             if 0 <= op < len(mapa_skills):
-                nome_skill = mapa_skills[op]["nome"]
-                return self._executar_skill(nome_skill)
-            return 0, "cancelou a habilidade."
+                return mapa_skills[op].nome
         except ValueError:
-            return 0, "opção inválida."
+            pass
+        return None
+
+    def habilidade_especial(self) -> tuple[int, str]:
+        if not self.habilidades_conhecidas:
+            return 0, "não conhece nenhuma habilidade."
+        
+        nome_skill = self.escolher_habilidade()
+        if nome_skill:
+            return self._executar_skill(nome_skill)
+        return 0, "cancelou a habilidade."
 
     def _executar_skill(self, nome_skill: str) -> tuple[int, str]:
         """Roteador central que chama a lógica de cada classe."""
-        metodo_limpo = nome_skill.lower().replace(" ", "_")
-        if hasattr(self, f"skill_{metodo_limpo}"):
-            return getattr(self, f"skill_{metodo_limpo}")()
-        return 0, "habilidade não implementada."
+        skill = self._SKILLS_POR_NOME.get(nome_skill) or self._SKILLS.get(nome_skill)
+        if skill is None:
+            return 0, "habilidade não implementada."
+        if Metricas.ativo: Metricas.contar("rpg_skills_total", skill=skill.nome)
+        return skill.executar(self)
+
+    # --- Autosave incremental ---
+
+    def marcar_sujo(self, secao: str) -> None:
+        # Para mudanças feitas direto nas listas (ex: "inventario", "skills")
+        self._sujos.add(secao)
+
+    def limpar_sujos(self) -> None:
+        #Chamado depois de um save completo: a partir daqui só as mudanças contam.
+        self._sujos.clear()
+        self._salvos = {campo: getattr(self, campo) for campo in self._CAMPOS_RASTREADOS}
+        self._atrib.rastrear_mudancas()
+
+    def extrair_delta(self) -> dict:
+        #Só as seções do to_dict() que mudaram desde o último save (e limpa as marcas).
+        delta = {}
+        for campo in self._CAMPOS_RASTREADOS:
+            valor = getattr(self, campo)
+            if self._salvos.get(campo) != valor:
+                delta[campo] = self._salvos[campo] = valor
+        for secao in self._sujos:
+            delta[secao] = self._serializar_secao(secao)
+        atributos = self._atrib.extrair_sujos()
+        if atributos:
+            delta["atributos"] = atributos
+        self._sujos.clear()
+        return delta
 
-    def to_dict(self) -> dict:
-        def salvar_item(item):
-            if not item: return None
-            tipo = "equip" if isinstance(item, Equipamento) else "pot"
-            dados = item.__dict__.copy()
-            dados["classe_item"] = tipo
-            return dados
+    @staticmethod
+    def _salvar_item(item):
+        if not item: return None
+        if item.id: return item.id # Item do catálogo: só a chave de conteudo/itens.json
+        tipo = "equip" if isinstance(item, Equipamento) else "pot"
+        dados = item.to_dict()
+        dados["classe_item"] = tipo
+        return dados
 
+    @staticmethod
+    def _carregar_item(d, dono: str = ""):
+        if not d: return None
+        cat = catalogo()
+        if isinstance(d, str): # Save atual: a chave do item no catálogo
+            indice = cat.indice_itens.get(d)
+            if indice is None: # Item tirado de conteudo/itens.json depois do save
+                Logger.registrar(f"Item desconhecido no save de {dono}: {d}", "AVISO")
+                return None
+            return cat.item(indice)
+        # Save antigo, com o item inteiro: vira a instância do catálogo quando ela existe
+        tipo = d.get("classe_item", "pot") # get, não pop: o dict do save não é alterado
+        if tipo == "equip": item = Equipamento(d["nome"], d["slot"], d["ataque_bonus"], d["defesa_bonus"])
+        else: item = Consumivel(d["nome"], d["tipo"], d["valor_efeito"])
+        return cat.internar(item)
+
+    def _serializar_secao(self, secao: str):
+        if secao == "nivel": return self.nivel
+        if secao == "xp": return self.xp
+        if secao == "skills": return list(self.habilidades_conhecidas)
+        if secao == "passivas": return list(self.passivas_ativas)
+        if secao == "inventario": # Uma entrada por pilha: o item, ou [item, quantidade] se tiver mais de um
+            return [self._salvar_item(i) if qtd == 1 else [self._salvar_item(i), qtd] for i, qtd in self.inventario.pilhas()]
+        if secao == "equipamentos": return {k: self._salvar_item(v) for k, v in self.equipamentos.items()}
+        raise KeyError(secao)
+
+    def to_dict(self) -> dict:
         return {
             "classe": self.__class__.__name__,
             "nome": self.nome,
             "nivel": self.nivel,
             "xp": self.xp,
-            "atributos": self._atrib.__dict__,
-            "skills": self.habilidades_conhecidas, # Salva skills
-            "passivas": self.passivas_ativas,      # Salva passivas
-            "inventario": [salvar_item(i) for i in self.inventario],
-            "equipamentos": {k: salvar_item(v) for k, v in self.equipamentos.items()}
+            "atributos": self._atrib.to_dict(),
+            # Cópias: o dict é um retrato (ex: o replay guarda o do início da batalha, e um
+            # level up no fim dela não pode aparecer nele)
+            "skills": self._serializar_secao("skills"),
+            "passivas": self._serializar_secao("passivas"),
+            "inventario": self._serializar_secao("inventario"),
+            "equipamentos": self._serializar_secao("equipamentos")
         }
 
     @staticmethod
-    def from_dict(dados: dict) -> Personagem:
+    def from_dict(dados: dict | bytes) -> Personagem:
+        # Aceita também o save binário direto (utils/formato_binario.py)
+        if isinstance(dados, (bytes, bytearray, memoryview)):
+            dados = decodificar(dados)
         classe_nome = dados.get("classe")
         nome = dados.get("nome")
         
-        if classe_nome == "Guerreiro": p = Guerreiro(nome)
-        elif classe_nome == "Mago": p = Mago(nome)
-        elif classe_nome == "Arqueiro": p = Arqueiro(nome)
-        else: p = Guerreiro(nome)
+        p = CLASSES.get(classe_nome, Guerreiro)(nome)
         
         p.nivel = dados.get("nivel", 1)
         p.xp = dados.get("xp", 0)
-        p.habilidades_conhecidas = dados.get("skills", [])
-        p.passivas_ativas = dados.get("passivas", [])
+        p.habilidades_conhecidas = list(dados.get("skills", []))
+        p.passivas_ativas = list(dados.get("passivas", []))
         
         ats = dados.get("atributos", {})
         p._atrib.vida = ats.get("vida", 100)
@@ -253,16 +513,19 @@ class Personagem(Entidade):
         p._atrib.defesa = ats.get("defesa", 0)
         p._atrib.mana = ats.get("mana", 0)
 
-        def carregar_item(d):
-            if not d: return None
-            tipo = d.pop("classe_item", "pot")
-            if tipo == "equip": return Equipamento(d["nome"], d["slot"], d["ataque_bonus"], d["defesa_bonus"])
-            else: return Consumivel(d["nome"], d["tipo"], d["valor_efeito"])
-
-        p.inventario = [carregar_item(i) for i in dados.get("inventario", [])]
+        # Inventário: cada entrada é um item ou [item, quantidade]; saves antigos têm uma
+        # entrada por unidade (as repetidas se empilham aqui)
+        for entrada in dados.get("inventario", []):
+            quantidade = 1
+            if isinstance(entrada, list):
+                entrada, quantidade = entrada
+            item = Personagem._carregar_item(entrada, nome)
+            if item is not None:
+                p.inventario.adicionar(item, quantidade)
         eq = dados.get("equipamentos", {})
-        p.equipamentos["arma"] = carregar_item(eq.get("arma"))
-        p.equipamentos["armadura"] = carregar_item(eq.get("armadura"))
+        p.equipamentos["arma"] = Personagem._carregar_item(eq.get("arma"), nome)
+        p.equipamentos["armadura"] = Personagem._carregar_item(eq.get("armadura"), nome)
+        p.invalidar_stats()
         
         return p
 
@@ -270,7 +533,8 @@ class Personagem(Entidade):
 # --- SUBCLASSES COM A LÓGICA DAS SKILLS ---
 
 class Guerreiro(Personagem):
-    def __init__(self, nome): super().__init__(nome, Atributos(120, 15, 5, 20))
+    __slots__ = ()
+    def __init__(self, nome): super().__init__(nome, Atributos(*self._ATRIBUTOS_INICIAIS))
     #algumas skills dão stun/atordoamento
     def skill_golpe_devastador(self):
         custo = 10
@@ -288,7 +552,7 @@ class Guerreiro(Personagem):
             return int(self.ataque_total * 1.2), "usou Grito de Guerra (Curou 20 HP)!"
         return 0, "sem mana suficiente (20)."
 
-    def skill_execução_final(self):
+    def skill_execucao_final(self):
         custo = 50
         if self._atrib.mana >= custo:
             self._atrib.mana -= custo
@@ -296,14 +560,16 @@ class Guerreiro(Personagem):
         return 0, "sem mana suficiente (50)."
 
 class Mago(Personagem):
-    def __init__(self, nome): super().__init__(nome, Atributos(70, 5, 2, 100))
+    __slots__ = ()
+    def __init__(self, nome): super().__init__(nome, Atributos(*self._ATRIBUTOS_INICIAIS))
 
     # as skills possuem efeitos extras
     # Passiva Mente Clara: Regen mana
     def calcular_dano_base(self) -> int:
-        if "Mente Clara" in self.passivas_ativas:
-            self._atrib.mana += 5
-            # print("Recuperou 5 mana") # Opcional
+        if self._regen_mana:
+            self._atrib.mana += self._regen_mana
+            if Metricas.ativo: Metricas.contar("rpg_passivas_total", passiva="Mente Clara")
+            # escrever("Recuperou 5 mana") # Opcional
         return super().calcular_dano_base()
 
     def skill_bola_de_fogo(self):
@@ -329,7 +595,8 @@ class Mago(Personagem):
         return 0, "sem mana suficiente (100)."
 
 class Arqueiro(Personagem):
-    def __init__(self, nome): super().__init__(nome, Atributos(90, 12, 3, 40))
+    __slots__ = ()
+    def __init__(self, nome): super().__init__(nome, Atributos(*self._ATRIBUTOS_INICIAIS))
 
     def skill_flecha_precisa(self):
         custo = 15
@@ -353,4 +620,12 @@ class Arqueiro(Personagem):
             # Ignora defesa (simulado com dano verdadeiro alto)
             dano = int(self.ataque_total * 3) + 50
             return dano, "disparou Flecha Fantasma (Dano Verdadeiro)!"
-        return 0, "sem mana suficiente (60)."
\ No newline at end of file
+        return 0, "sem mana suficiente (60)."
+
+
+CLASSES: dict[str, type[Personagem]] = {"Guerreiro": Guerreiro, "Mago": Mago, "Arqueiro": Arqueiro}
+
+
+def criar_personagem(classe: str, nome: str, nivel: int = 1) -> Personagem:
+    #Fábrica por nome da classe, já no nível pedido (ver Personagem.no_nivel).
+    return CLASSES[classe].no_nivel(nome, nivel)
\ No newline at end of file
@@ -0,0 +1,149 @@
+from __future__ import annotations
+from utils.terminal import escrever, ler
+from .item import Consumivel
+from .personagem import Skill
+
+# Políticas decidem as ações do jogador dentro do combate:
+# "1" atacar, "2" habilidade, "3" item, "4" fugir. Contra hordas também escolhem o alvo.
+# A interativa lê do terminal; as outras são usadas no modo headless (simulação).
+
+class Politica:
+    def escolher_acao(self, p, inimigo, turno: int) -> str:
+        return "1"
+
+    def escolher_habilidade(self, p, opcoes: list[Skill]) -> str | None:
+        # Por padrão usa a skill mais cara que a mana permite (opcoes vem ordenada por custo)
+        for skill in reversed(opcoes):
+            if p._atrib.mana >= skill.custo:
+                return skill.nome
+        return None
+
+    def escolher_item(self, p, itens: list[Consumivel]) -> Consumivel | None:
+        return itens[0] if itens else None
+
+    def escolher_alvo(self, p, inimigos: list) -> int:
+        # Índice em inimigos (só os vivos). Por padrão termina o mais ferido
+        return min(range(len(inimigos)), key=lambda i: inimigos[i]._atrib.vida)
+
+
+class PoliticaInterativa(Politica):
+    #Jogador humano no terminal.
+    def escolher_acao(self, p, inimigo, turno: int) -> str:
+        escrever("[1] Atacar")
+        escrever("[2] Habilidade Especial")
+        escrever("[3] Usar Item")
+        escrever("[4] Fugir")
+        return ler("> ").strip()
+
+    def escolher_habilidade(self, p, opcoes: list[Skill]) -> str | None:
+        return p.escolher_habilidade()
+
+    def escolher_item(self, p, itens: list[Consumivel]) -> Consumivel | None:
+        escrever("\n--- Itens ---")
+        for i, item in enumerate(itens):
+            quantidade = p.inventario.quantidade(item)
+            escrever(f"[{i+1}] {item.nome}" + (f" x{quantidade}" if quantidade > 1 else ""))
+        escrever("[0] Cancelar")
+        try:
+            op = int(ler("> "))
+            if op > 0 and op <= len(itens):
+                return itens[op-1]
+        except ValueError:
+            pass
+        return None
+
+    def escolher_alvo(self, p, inimigos: list) -> int:
+        escrever("\n--- Alvo ---")
+        for i, inimigo in enumerate(inimigos):
+            escrever(f"[{i+1}] {inimigo.nome} {inimigo.barra_hp(10)}")
+        try:
+            op = int(ler("> "))
+            if 0 < op <= len(inimigos):
+                return op - 1
+        except ValueError:
+            pass
+        return 0 # Opção inválida: ataca o primeiro
+
+
+class PoliticaAtacar(Politica):
+    #Só usa ataque básico (linha de base para balanceamento).
+    pass
+
+
+class PoliticaGulosa(Politica):
+    #Cura com poção quando a vida está baixa, usa skill se tiver mana, senão ataca.
+    def __init__(self, limite_cura: float = 0.35):
+        self.limite_cura = limite_cura
+
+    def escolher_acao(self, p, inimigo, turno: int) -> str:
+        if p._atrib.vida < p._atrib.vida_max * self.limite_cura and self._melhor_pocao(p.inventario.consumiveis("vida")):
+            return "3"
+        if self.escolher_habilidade(p, p.skills_disponiveis()):
+            return "2"
+        return "1"
+
+    def escolher_item(self, p, itens: list[Consumivel]) -> Consumivel | None:
+        return self._melhor_pocao(itens)
+
+    def _melhor_pocao(self, itens) -> Consumivel | None:
+        pocoes = [i for i in itens if isinstance(i, Consumivel) and i.tipo == "vida" and i.valor_efeito > 0]
+        return max(pocoes, key=lambda i: i.valor_efeito) if pocoes else None
+
+
+class PoliticaGravadora(Politica):
+    #Repassa as decisões para outra política e anota cada uma (para o replay da batalha).
+    # Cada decisão vira [turno, tipo, valor]: "a" ação, "h" habilidade, "i" índice do item,
+    # "t" índice do alvo.
+    def __init__(self, politica: Politica):
+        self.politica = politica
+        self.decisoes: list[list] = []
+        self._turno = 0
+
+    def escolher_acao(self, p, inimigo, turno: int) -> str:
+        self._turno = turno
+        acao = self.politica.escolher_acao(p, inimigo, turno)
+        self.decisoes.append([turno, "a", acao])
+        return acao
+
+    def escolher_habilidade(self, p, opcoes: list[Skill]) -> str | None:
+        nome = self.politica.escolher_habilidade(p, opcoes)
+        self.decisoes.append([self._turno, "h", nome])
+        return nome
+
+    def escolher_item(self, p, itens: list[Consumivel]) -> Consumivel | None:
+        item = self.politica.escolher_item(p, itens)
+        self.decisoes.append([self._turno, "i", None if item is None else itens.index(item)])
+        return item
+
+    def escolher_alvo(self, p, inimigos: list) -> int:
+        indice = self.politica.escolher_alvo(p, inimigos)
+        self.decisoes.append([self._turno, "t", indice])
+        return indice
+
+
+class PoliticaReplay(Politica):
+    #Devolve as decisões gravadas por PoliticaGravadora, na mesma ordem.
+    def __init__(self, decisoes: list[list]):
+        self._decisoes = iter(decisoes)
+
+    def _proxima(self, tipo: str):
+        try:
+            _, tipo_gravado, valor = next(self._decisoes)
+        except StopIteration:
+            raise ValueError("Replay terminou antes da batalha (gravação incompleta).") from None
+        if tipo_gravado != tipo:
+            raise ValueError(f"Replay divergiu: esperava decisão '{tipo}', gravado '{tipo_gravado}'.")
+        return valor
+
+    def escolher_acao(self, p, inimigo, turno: int) -> str:
+        return self._proxima("a")
+
+    def escolher_habilidade(self, p, opcoes: list[Skill]) -> str | None:
+        return self._proxima("h")
+
+    def escolher_item(self, p, itens: list[Consumivel]) -> Consumivel | None:
+        indice = self._proxima("i")
+        return None if indice is None else itens[indice]
+
+    def escolher_alvo(self, p, inimigos: list) -> int:
+        return self._proxima("t")
@@ -0,0 +1,54 @@
+from __future__ import annotations
+import random
+from typing import Any, Sequence
+
+class TabelaSpawn:
+    #Sorteio ponderado em O(1) pelo método alias (Vose): a tabela é montada uma vez
+    # e cada sorteio gasta um único random() (uma coluna + a moeda da coluna).
+    __slots__ = ("itens", "pesos", "_prob", "_alias")
+
+    def __init__(self, pesos: dict[Any, float]):
+        itens = [item for item, peso in pesos.items() if peso > 0]
+        if not itens:
+            raise ValueError("Tabela de spawn sem nenhum peso positivo.")
+        self.itens: tuple[Any, ...] = tuple(itens)
+        self.pesos: tuple[float, ...] = tuple(pesos[item] for item in itens)
+        self._prob, self._alias = self._montar(self.pesos)
+
+    @staticmethod
+    def _montar(pesos: Sequence[float]) -> tuple[list[float], list[int]]:
+        n = len(pesos)
+        total = sum(pesos)
+        escala = [p * n / total for p in pesos]
+        prob = [1.0] * n
+        alias = list(range(n))
+        pequenos = [i for i, p in enumerate(escala) if p < 1.0]
+        grandes = [i for i, p in enumerate(escala) if p >= 1.0]
+        while pequenos and grandes:
+            menor, maior = pequenos.pop(), grandes.pop()
+            prob[menor] = escala[menor]
+            alias[menor] = maior
+            escala[maior] -= 1.0 - escala[menor]
+            (pequenos if escala[maior] < 1.0 else grandes).append(maior)
+        # O que sobrar (erro de arredondamento) fica com probabilidade 1
+        return prob, alias
+
+    def probabilidades(self) -> dict[Any, float]:
+        total = sum(self.pesos)
+        return {item: peso / total for item, peso in zip(self.itens, self.pesos)}
+
+    def sortear(self, rng=random) -> Any:
+        x = rng.random() * len(self.itens)
+        coluna = int(x)
+        return self.itens[coluna] if x - coluna < self._prob[coluna] else self.itens[self._alias[coluna]]
+
+    def amostrar(self, k: int, rng=random) -> list[Any]:
+        #K sorteios de uma vez (ex: todos os encontros de uma sobrevivência ou de uma simulação).
+        itens, prob, alias = self.itens, self._prob, self._alias
+        n = len(itens)
+        saida = []
+        for _ in range(k):
+            x = rng.random() * n
+            coluna = int(x)
+            saida.append(itens[coluna] if x - coluna < prob[coluna] else itens[alias[coluna]])
+        return saida
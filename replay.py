@@ -0,0 +1,107 @@
+from __future__ import annotations
+import argparse
+import time
+from models.personagem import Personagem
+from models.inventario import Inventario
+from models.item import Consumivel
+from models.missao import Missao, versao_conteudo
+from models.inimigo import ESPECIES
+from models.politicas import PoliticaReplay
+from utils.replay import VERSAO_REPLAY, carregar_replay, listar_replays
+
+# Reprodutor de replays: refaz sem terminal (modo headless de Missao) a batalha gravada por
+# Missao.executar, a partir da semente e das decisões do jogador. Pode parar em qualquer turno.
+
+
+def reproduzir(dados: dict, ate_turno: int | None = None) -> tuple[Personagem, Missao, object]:
+    #Refaz a batalha até o fim (ou até ate_turno). Devolve (personagem, missão, relatório).
+    p = Personagem.from_dict(dados["personagem"])
+    nomes = dados["inimigos"]
+    inimigos = None if dados["inimigo_sorteado"] else [ESPECIES[n]() for n in nomes]
+    missao = Missao(dados["dificuldade"], dados["cenario"], semente=dados["semente"],
+                    quantidade=len(nomes), inimigos=inimigos)
+    sorteados = [type(e).__name__ for e in missao.inimigos]
+    if sorteados != nomes:
+        raise ValueError(f"Replay divergiu: sorteou {sorteados}, gravado {nomes}.")
+    limite = ate_turno if ate_turno is not None else 1_000_000
+    decisoes = dados["decisoes"]
+    if dados.get("versao", VERSAO_REPLAY) < 3:
+        decisoes = _itens_por_pilha(dados["personagem"], decisoes)
+    rel = missao.simular(p, PoliticaReplay(decisoes), limite_turnos=limite)
+    return p, missao, rel
+
+
+def _itens_por_pilha(personagem: dict, decisoes: list[list]) -> list[list]:
+    #Replays até a versão 2: troca o índice na lista de poções (com as repetidas) pelo da pilha.
+    # Durante a batalha a mochila só perde poções, então as duas listas se refazem a partir do
+    # inventário do início, na ordem do save
+    itens = (Personagem._carregar_item(d) for d in personagem.get("inventario", []))
+    lista = [item for item in itens if isinstance(item, Consumivel)]
+    pilhas = Inventario(lista)
+    convertidas = []
+    for turno, tipo, valor in decisoes:
+        if tipo == "i" and valor is not None:
+            item = lista.pop(valor)
+            valor = pilhas.consumiveis().index(item)
+            pilhas.remover(item)
+        convertidas.append([turno, tipo, valor])
+    return convertidas
+
+
+def conferir(dados: dict, p: Personagem, missao: Missao, rel) -> list[str]:
+    #Diferenças entre o resultado refeito e o gravado (vazio = reproduziu igual).
+    gravado = dados["resultado"]
+    # O dano vale mais que a vida final: um level up no fim da batalha cura tudo e esconde diferenças
+    obtido = {"venceu": rel.venceu, "fugiu": rel.fugiu, "turnos": rel.turnos,
+              "dano_causado": rel.dano_causado, "dano_recebido": rel.dano_recebido,
+              "vida": p._atrib.vida, "vida_inimigos": [e._atrib.vida for e in missao.inimigos]}
+    return [f"{chave}: gravado {gravado[chave]}, refeito {obtido[chave]}"
+            for chave in gravado if gravado[chave] != obtido.get(chave)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reproduz um replay de batalha (headless)")
+    parser.add_argument("arquivo", nargs="?", help="arquivo .replay (padrão: o mais recente)")
+    parser.add_argument("--turno", type=int, default=None, help="para no turno indicado")
+    parser.add_argument("--listar", action="store_true", help="lista os replays gravados")
+    args = parser.parse_args()
+
+    replays = listar_replays()
+    if args.listar:
+        for caminho in replays:
+            print(caminho)
+        return
+    caminho = args.arquivo or (replays[-1] if replays else None)
+    if caminho is None:
+        parser.error("nenhum replay gravado em dados/replays/")
+
+    dados = carregar_replay(caminho)
+    if dados["conteudo"] != versao_conteudo():
+        print(f"Aviso: replay gravado com outro conteúdo ({dados['conteudo']} != {versao_conteudo()}); "
+              "a batalha pode não se repetir igual.")
+
+    inicio = time.perf_counter()
+    p, missao, rel = reproduzir(dados, args.turno)
+    duracao = time.perf_counter() - inicio
+
+    a = p._atrib
+    print(f"{caminho}: {p.nome} vs {missao.titulo} ({dados['cenario']}, {dados['dificuldade']}, "
+          f"semente {dados['semente']})")
+    print(f"Turno {rel.turnos}: {p.nome} {a.vida}/{a.vida_max} HP {a.mana} MP")
+    for e in missao.inimigos:
+        print(f"  {e.nome} {e._atrib.vida}/{e._atrib.vida_max} HP")
+    print(f"Dano causado {rel.dano_causado}, recebido {rel.dano_recebido} ({duracao * 1000:.2f} ms)")
+
+    if args.turno is None:
+        diferencas = conferir(dados, p, missao, rel)
+        if diferencas:
+            print("Replay NÃO reproduziu a batalha gravada:")
+            for d in diferencas:
+                print(f"  {d}")
+            raise SystemExit(1)
+        desfecho = "vitória" if rel.venceu else "fuga" if rel.fugiu else "derrota"
+        print(f"Reproduzido igual ao gravado ({desfecho}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from main import menu
+from utils.logger import Logger
+from utils.metricas import Metricas
+from utils.backends import BACKENDS
+from utils.terminal import Console, usar_console, restaurar_console
+
+# Servidor TCP (protocolo de linhas, dá para jogar com telnet/nc): cada conexão é uma sessão
+# com o próprio Jogo. O event loop só cuida dos sockets; os menus (código síncrono, o mesmo do
+# terminal) rodam numa thread por sessão, com a entrada e a saída ligadas à conexão pela
+# ContextVar de utils/terminal.py. Saves, replays e log ficam nessa thread, fora do loop.
+#
+# A saída é juntada até o jogo pedir entrada e vai de uma vez, terminada pelo prompt e por
+# IAC GA (o "sua vez" do telnet, o mesmo que os MUDs usam para marcar o prompt).
+# As pausas do jogo (time.sleep no terminal) viram asyncio.sleep na tarefa que envia a saída:
+# a thread da sessão não dorme, só o texto chega ao jogador com o mesmo ritmo.
+
+FIM_PROMPT = b"\xff\xf9" # IAC GA
+TAMANHO_PILHA = 512 * 1024 # Por thread de sessão: os menus não são recursivos
+INTERVALO_METRICAS = 15.0 # Segundos entre as exportações de --metricas (o textfile collector relê sozinho)
+
+
+class SessaoRemota(Console):
+    #Console de uma conexão. escrever/ler/pausar rodam na thread da sessão; as filas fazem a ponte com o loop.
+    def __init__(self, loop: asyncio.AbstractEventLoop, escala_pausas: float, cores: bool = True):
+        super().__init__(cores=cores)
+        self._loop = loop
+        self._escala = escala_pausas
+        self.saida: asyncio.Queue = asyncio.Queue() # bytes, float (pausa) ou None (fim); só o loop lê
+        self.entradas: queue.SimpleQueue = queue.SimpleQueue() # linhas do jogador, None = desconectou
+
+    def _enviar(self, item) -> None:
+        self._loop.call_soon_threadsafe(self.saida.put_nowait, item)
+
+    def descarregar(self, fim: str = "", marca: bytes = b"") -> None:
+        texto = self.formatar("".join(self._buffer) + fim)
+        self._buffer.clear()
+        if texto or marca:
+            self._enviar(texto.replace("\n", "\r\n").encode("utf-8") + marca)
+
+    def escrever(self, texto: str) -> None:
+        self._buffer.append(texto)
+
+    def pausar(self, segundos: float) -> None:
+        if self._escala > 0:
+            self.descarregar()
+            self._enviar(segundos * self._escala)
+
+    def ler(self, prompt: str) -> str:
+        self.descarregar(prompt, FIM_PROMPT)
+        linha = self.entradas.get()
+        if linha is None:
+            raise EOFError("conexão encerrada")
+        return linha
+
+    def rodar(self, backend: str, sufixo_saves: str) -> None:
+        #Corpo da thread da sessão: o menu principal inteiro, como no terminal.
+        token = usar_console(self)
+        try:
+            menu(backend, sufixo_saves)
+        except EOFError:
+            pass # O jogador desconectou no meio de um menu
+        except Exception as e:
+            Logger.registrar(f"Sessão remota encerrada por erro: {e!r}", "ERRO")
+        finally:
+            self.descarregar()
+            self._enviar(None)
+            # As threads do executor são reaproveitadas: o console não pode vazar para a próxima sessão
+            restaurar_console(token)
+
+
+class Servidor:
+    def __init__(self, backend: str = "json", max_sessoes: int = 2000, escala_pausas: float = 1.0,
+                 cores: bool = True):
+        self.backend = backend
+        self.max_sessoes = max_sessoes
+        self.escala_pausas = escala_pausas
+        self.cores = cores # Os clientes de telnet entendem ANSI; --sem-cor para robôs e clientes crus
+        self.sessoes: set[SessaoRemota] = set()
+        self._numero = 0 # Sessões atendidas (separa o save rápido/autosave de cada uma)
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def iniciar(self, host: str, porta: int) -> asyncio.Server:
+        # A pilha menor vale para as threads criadas daqui em diante (as das sessões)
+        threading.stack_size(TAMANHO_PILHA)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_sessoes, thread_name_prefix="sessao")
+        return await asyncio.start_server(self._atender, host, porta, limit=4096,
+                                          backlog=min(self.max_sessoes, 4096))
+
+    def encerrar(self) -> None:
+        # Destrava as sessões paradas num ler (como se todos tivessem desconectado)
+        for sessao in self.sessoes:
+            sessao.entradas.put(None)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if len(self.sessoes) >= self.max_sessoes:
+            writer.write("Servidor cheio, tente mais tarde.\r\n".encode("utf-8"))
+            await self._fechar(writer)
+            return
+
+        loop = asyncio.get_running_loop()
+        sessao = SessaoRemota(loop, self.escala_pausas, self.cores)
+        self.sessoes.add(sessao)
+        self._numero += 1
+        enviando = asyncio.create_task(self._enviar_saida(sessao, writer))
+        recebendo = asyncio.create_task(self._receber_entradas(sessao, reader))
+        try:
+            await loop.run_in_executor(self._executor, sessao.rodar, self.backend, f"_{self._numero}")
+            await enviando
+        finally:
+            self.sessoes.discard(sessao)
+            recebendo.cancel()
+            sessao.entradas.put(None)
+            await self._fechar(writer)
+
+    @staticmethod
+    async def _enviar_saida(sessao: SessaoRemota, writer: asyncio.StreamWriter) -> None:
+        while (item := await sessao.saida.get()) is not None:
+            if isinstance(item, float):
+                await asyncio.sleep(item)
+                continue
+            writer.write(item)
+            try:
+                await writer.drain()
+            except ConnectionError:
+                return # O jogador caiu; a thread descobre no próximo ler
+
+    @staticmethod
+    async def _receber_entradas(sessao: SessaoRemota, reader: asyncio.StreamReader) -> None:
+        try:
+            while linha := await reader.readline():
+                sessao.entradas.put(linha.decode("utf-8", errors="replace").rstrip("\r\n"))
+        except (ConnectionError, ValueError): # ValueError: linha maior que o limite
+            pass
+        sessao.entradas.put(None)
+
+    @staticmethod
+    async def _fechar(writer: asyncio.StreamWriter) -> None:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def _exportar_metricas(destino: str) -> None:
+    while True:
+        await asyncio.sleep(INTERVALO_METRICAS)
+        await asyncio.to_thread(Metricas.exportar, destino)
+
+
+async def servir(host: str, porta: int, backend: str, max_sessoes: int, escala_pausas: float,
+                 cores: bool = True, metricas: str | None = None) -> None:
+    servidor = Servidor(backend, max_sessoes, escala_pausas, cores)
+    tcp = await servidor.iniciar(host, porta)
+    enderecos = ", ".join(str(s.getsockname()) for s in tcp.sockets)
+    print(f"Servidor ouvindo em {enderecos} (até {max_sessoes} sessões)", flush=True)
+    exportando = None
+    if metricas:
+        Metricas.ativar(metricas) # Grava também na saída
+        exportando = asyncio.create_task(_exportar_metricas(metricas))
+    try:
+        async with tcp:
+            await tcp.serve_forever()
+    finally:
+        if exportando is not None:
+            exportando.cancel()
+        servidor.encerrar()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor TCP multi-sessão do RPG OO")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=4000)
+    parser.add_argument("--backend", choices=BACKENDS, default="json")
+    parser.add_argument("--max-sessoes", type=int, default=2000, help="conexões simultâneas")
+    parser.add_argument("--pausas", type=float, default=1.0,
+                        help="escala das pausas do jogo (0 = sem pausas, ex: testes de carga)")
+    parser.add_argument("--sem-cor", action="store_true", help="não envia os códigos de cor ANSI")
+    parser.add_argument("--metricas", metavar="ARQUIVO",
+                        help=f"grava ARQUIVO.prom e ARQUIVO.json a cada {INTERVALO_METRICAS:.0f}s e ao encerrar")
+    args = parser.parse_args()
+    try:
+        asyncio.run(servir(args.host, args.porta, args.backend, args.max_sessoes, args.pausas,
+                           not args.sem_cor, args.metricas))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
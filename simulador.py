@@ -0,0 +1,152 @@
+from __future__ import annotations
+import argparse
+import csv
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from models.personagem import Personagem, CLASSES, criar_personagem
+from models.missao import Missao
+from models.inimigo import ESPECIES
+from models.politicas import PoliticaGulosa, PoliticaAtacar
+from utils.metricas import Metricas
+
+# Simulador de balanceamento: roda a grade classe x nível x cenário x dificuldade x inimigo
+# em todos os núcleos, usando o modo headless de Missao.
+
+CENARIOS = ["Floresta", "Trilha", "Caverna", "Ruínas"]
+DIFICULDADES = ["Fácil", "Média", "Difícil"]
+POLITICAS = {"gulosa": PoliticaGulosa, "atacar": PoliticaAtacar}
+
+# Estado de cada processo trabalhador (preenchido no inicializador)
+_POLITICA = None
+
+
+def _inicializar_trabalhador(politica: str, metricas: bool = False) -> None:
+    global _POLITICA
+    _POLITICA = POLITICAS[politica]()
+    if metricas:
+        Metricas.ativar()
+
+
+def _novo_personagem(nome_classe: str, nivel: int) -> Personagem:
+    # Direto no nível (sem passar XP nível a nível)
+    return criar_personagem(nome_classe, "Simulado", nivel)
+
+
+def _rodar_bloco(tarefa: tuple) -> tuple:
+    #Roda um bloco de batalhas de uma célula e devolve só os agregados.
+    chave, n_batalhas, semente = tarefa
+    nome_classe, nivel, cenario, dificuldade, nome_inimigo = chave
+    # Semente derivada da tarefa: fluxos independentes e reprodutíveis, não importa qual processo rode
+    random.seed(semente)
+    classe_inimigo = ESPECIES[nome_inimigo]
+
+    vitorias = soma_turnos = 0
+    soma_hp = 0.0
+    for _ in range(n_batalhas):
+        p = _novo_personagem(nome_classe, nivel)
+        rel = Missao(dificuldade, cenario, inimigo=classe_inimigo()).simular(p, _POLITICA)
+        vitorias += rel.venceu
+        soma_turnos += rel.turnos
+        soma_hp += p._atrib.vida / p._atrib.vida_max
+    # As métricas do bloco voltam junto (cada processo tem as suas; o principal soma)
+    metricas = Metricas.coletar() if Metricas.ativo else None
+    return chave, n_batalhas, vitorias, soma_turnos, soma_hp, metricas
+
+
+def montar_grade(niveis: list[int]) -> list[tuple]:
+    grade = []
+    for nome_classe in CLASSES:
+        for nivel in niveis:
+            for cenario in CENARIOS:
+                for dificuldade in DIFICULDADES:
+                    for classe_inimigo in Missao.inimigos_possiveis(dificuldade, cenario):
+                        grade.append((nome_classe, nivel, cenario, dificuldade, classe_inimigo.__name__))
+    return grade
+
+
+def simular_grade(batalhas: int, niveis: list[int], processos: int | None = None,
+                  semente: int = 0, politica: str = "gulosa", lote: int = 500,
+                  metricas: bool = False) -> dict[tuple, dict]:
+    #Executa a grade inteira e devolve {célula: {batalhas, taxa_vitoria, turnos_medio, hp_restante}}.
+    tarefas = []
+    for indice, chave in enumerate(montar_grade(niveis)):
+        for inicio in range(0, batalhas, lote):
+            tarefas.append((chave, min(lote, batalhas - inicio), f"{semente}:{indice}:{inicio}"))
+
+    totais: dict[tuple, list] = {}
+    # Os trabalhadores herdam o catálogo de conteúdo já montado (fork) ou o leem do cache
+    # compilado em conteudo/__cache__ (spawn): nenhum deles volta a ler os JSON
+    with ProcessPoolExecutor(max_workers=processos, initializer=_inicializar_trabalhador,
+                             initargs=(politica, metricas)) as executor:
+        chunk = max(1, len(tarefas) // ((processos or os.cpu_count() or 1) * 8))
+        for chave, n, vitorias, turnos, hp, parcial in executor.map(_rodar_bloco, tarefas, chunksize=chunk):
+            if parcial:
+                Metricas.mesclar(parcial)
+            acc = totais.setdefault(chave, [0, 0, 0, 0.0])
+            acc[0] += n
+            acc[1] += vitorias
+            acc[2] += turnos
+            acc[3] += hp
+
+    return {
+        chave: {
+            "batalhas": n,
+            "taxa_vitoria": vitorias / n,
+            "turnos_medio": turnos / n,
+            "hp_restante": hp / n,
+        }
+        for chave, (n, vitorias, turnos, hp) in totais.items()
+    }
+
+
+def _ler_niveis(texto: str) -> list[int]:
+    # "1-20" ou "1,5,10"
+    if "-" in texto:
+        ini, fim = texto.split("-")
+        return list(range(int(ini), int(fim) + 1))
+    return [int(n) for n in texto.split(",")]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulador de balanceamento (grade de batalhas headless)")
+    parser.add_argument("--batalhas", type=int, default=200, help="batalhas por célula")
+    parser.add_argument("--niveis", default="1-20", help="ex: 1-20 ou 1,5,10")
+    parser.add_argument("--processos", type=int, default=None, help="padrão: todos os núcleos")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--politica", choices=sorted(POLITICAS), default="gulosa")
+    parser.add_argument("--lote", type=int, default=500, help="batalhas por tarefa enviada aos processos")
+    parser.add_argument("--csv", help="arquivo CSV de saída")
+    parser.add_argument("--metricas", metavar="ARQUIVO", help="grava as métricas em ARQUIVO.prom e ARQUIVO.json")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    resultado = simular_grade(args.batalhas, _ler_niveis(args.niveis), args.processos,
+                              args.semente, args.politica, args.lote, metricas=bool(args.metricas))
+    duracao = time.perf_counter() - inicio
+    total = sum(c["batalhas"] for c in resultado.values())
+
+    colunas = ["classe", "nivel", "cenario", "dificuldade", "inimigo"]
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(colunas + ["batalhas", "taxa_vitoria", "turnos_medio", "hp_restante"])
+            for chave, c in sorted(resultado.items()):
+                w.writerow(list(chave) + [c["batalhas"], f"{c['taxa_vitoria']:.4f}",
+                                          f"{c['turnos_medio']:.2f}", f"{c['hp_restante']:.4f}"])
+    else:
+        print(f"{'Classe':<10} {'Nv':>2} {'Cenário':<9} {'Dific.':<8} {'Inimigo':<15} {'Vitória':>7} {'Turnos':>6} {'HP':>5}")
+        for chave, c in sorted(resultado.items()):
+            classe, nivel, cenario, dificuldade, inimigo = chave
+            print(f"{classe:<10} {nivel:>2} {cenario:<9} {dificuldade:<8} {inimigo:<15} "
+                  f"{c['taxa_vitoria']:>7.1%} {c['turnos_medio']:>6.1f} {c['hp_restante']:>5.0%}")
+
+    print(f"\n{total} batalhas em {duracao:.1f}s ({total / duracao:.0f} batalhas/s)")
+    if args.metricas:
+        Metricas.exportar(args.metricas)
+        print(f"Métricas em {args.metricas}.prom e {args.metricas}.json")
+
+
+if __name__ == "__main__":
+    main()
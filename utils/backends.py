@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+# Escolha do backend de saves. Fica fora de utils/repositorio.py para os pontos de entrada
+# (main.py, servidor.py) montarem a linha de comando sem carregar a persistência: o módulo
+# do backend só é importado quando o primeiro repositório é criado.
+
+BACKENDS = ("json", "binario", "sqlite")
+
+
+def criar_repositorio(backend: str = "json"):
+    #Escolhe onde os saves ficam: um arquivo por save (.json ou .sav binário) ou o banco SQLite.
+    if backend == "binario":
+        from .repositorio import Repositorio
+        return Repositorio(formato="binario")
+    if backend == "sqlite":
+        from .repositorio_sqlite import RepositorioSQLite
+        return RepositorioSQLite()
+    if backend != "json":
+        raise ValueError(f"Backend desconhecido: {backend} (use {' ou '.join(BACKENDS)})")
+    from .repositorio import Repositorio
+    return Repositorio()
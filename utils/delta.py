@@ -0,0 +1,30 @@
+from __future__ import annotations
+import json
+import os
+from typing import Any
+
+# Autosave incremental: cada save pode ter ao lado um arquivo .delta (uma linha JSON por autosave)
+# com só as seções do to_dict() que mudaram. Carregar = snapshot + deltas aplicados em ordem.
+EXTENSAO_DELTA = ".delta"
+
+
+def aplicar_delta(dados: dict[str, Any], delta: dict[str, Any]) -> dict[str, Any]:
+    for chave, valor in delta.items():
+        if chave == "atributos":
+            dados.setdefault("atributos", {}).update(valor)
+        else:
+            dados[chave] = valor
+    return dados
+
+
+def ler_deltas(caminho: str) -> list[dict[str, Any]]:
+    if not os.path.exists(caminho):
+        return []
+    deltas = []
+    with open(caminho, "r", encoding="utf-8") as f:
+        for linha in f:
+            try:
+                deltas.append(json.loads(linha))
+            except ValueError:
+                break # Linha cortada no fim (queda durante a escrita): ignora dali em diante
+    return deltas
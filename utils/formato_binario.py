@@ -0,0 +1,202 @@
+from __future__ import annotations
+import json
+import struct
+from typing import Any
+
+# ==============================================================================
+# FORMATO BINÁRIO COMPACTO DE SAVE (.sav)
+# Codifica o dicionário de Personagem.to_dict() com campos de tamanho fixo (struct),
+# para o decodificador ler blocos inteiros de uma vez. Cada texto (nomes, slots, skills...)
+# aparece uma única vez numa tabela de strings e o resto do arquivo usa o índice dela.
+#
+# Layout (little-endian), versão 3:
+#   cabeçalho    "RPGB" + u8 versão
+#   strings      u16 quantidade, u16[quantidade] tamanhos, bytes UTF-8 concatenados
+#   personagem   u16 classe, u16 nome, i32 nivel, xp, vida, vida_max, ataque, defesa, mana
+#   skills       u8 quantidade, u16[quantidade]
+#   passivas     u8 quantidade, u16[quantidade]
+#   avulsos      u16 quantidade, ITEM[quantidade] (itens fora do catálogo, com todos os campos)
+#   inventario   u16 quantidade, (REF, u16 unidades)[quantidade] (uma entrada por pilha)
+#   equipamentos u8 quantidade, (u16 slot, REF)[quantidade]
+#   REF          u16: 0xFFFF vazio, 0x8000 | i o avulso i, senão a string com o id do item
+#                (conteudo/itens.json): um item do catálogo ocupa 2 bytes
+#   ITEM         u8 tipo (0 vazio, 1 equip, 2 pot), u16 nome, i32 valor,
+#                equip: u16 slot, i32 ataque_bonus, i32 defesa_bonus
+#                pot:   u16 tipo, i32 valor_efeito, i32 0
+# Versões antigas (ainda lidas): a 2 tinha um REF por unidade no inventário, sem pilhas; a 1
+# não tinha os avulsos: inventário e equipamentos eram ITEM direto.
+# ==============================================================================
+
+MAGICO = b"RPGB"
+VERSAO = 3
+EXTENSAO = ".sav"
+
+_CABECALHO = struct.Struct("<4sB")
+_PERSONAGEM = struct.Struct("<HH7i")
+_ITEM = struct.Struct("<BHiHii")
+_SLOT = struct.Struct("<H")
+_SLOT_REF = struct.Struct("<HH")
+_PILHA = struct.Struct("<HH") # REF, unidades
+_ATRIBUTOS = ("vida", "vida_max", "ataque", "defesa", "mana")
+_VAZIO, _EQUIP, _POT = 0, 1, 2
+_REF_VAZIO, _REF_AVULSO = 0xFFFF, 0x8000
+
+
+def eh_binario(dados: bytes) -> bool:
+    return dados[:4] == MAGICO
+
+
+def codificar(dados: dict[str, Any]) -> bytes:
+    #Personagem.to_dict() -> bytes
+    strings: dict[str, int] = {}
+
+    def s(texto: str) -> int:
+        idx = strings.get(texto)
+        if idx is None:
+            idx = strings[texto] = len(strings)
+        return idx
+
+    avulsos: list[bytes] = []
+
+    def ref(d: str | dict | None) -> int:
+        if not d:
+            return _REF_VAZIO
+        if isinstance(d, str): # id de item do catálogo
+            return s(d)
+        if d.get("classe_item") == "equip":
+            avulsos.append(_ITEM.pack(_EQUIP, s(d["nome"]), d.get("valor", 50), s(d["slot"]),
+                                      d.get("ataque_bonus", 0), d.get("defesa_bonus", 0)))
+        else:
+            avulsos.append(_ITEM.pack(_POT, s(d["nome"]), d.get("valor", 10), s(d["tipo"]), d["valor_efeito"], 0))
+        return _REF_AVULSO | (len(avulsos) - 1)
+
+    ats = dados.get("atributos", {})
+    corpo = [_PERSONAGEM.pack(s(dados.get("classe", "")), s(dados.get("nome", "")),
+                              dados.get("nivel", 1), dados.get("xp", 0),
+                              *(ats.get(campo) or 0 for campo in _ATRIBUTOS))]
+    for lista in (dados.get("skills", []), dados.get("passivas", [])):
+        corpo.append(struct.pack(f"<B{len(lista)}H", len(lista), *(s(n) for n in lista)))
+    inventario = []
+    for entrada in dados.get("inventario", []): # item ou [item, quantidade]
+        item, unidades = entrada if isinstance(entrada, list) else (entrada, 1)
+        inventario.append((ref(item), unidades))
+    equipamentos = [_SLOT_REF.pack(s(slot), ref(equipado)) for slot, equipado in dados.get("equipamentos", {}).items()]
+    if (len(strings) > _REF_AVULSO or len(avulsos) > _REF_VAZIO - _REF_AVULSO
+            or len(inventario) > 0xFFFF or any(unidades > 0xFFFF for _, unidades in inventario)):
+        raise ValueError("Save grande demais para o formato binário.")
+    corpo.append(struct.pack("<H", len(avulsos)))
+    corpo.extend(avulsos)
+    corpo.append(struct.pack("<H", len(inventario)))
+    corpo.extend(_PILHA.pack(*pilha) for pilha in inventario)
+    corpo.append(struct.pack("<B", len(equipamentos)))
+    corpo.extend(equipamentos)
+
+    textos = [t.encode("utf-8") for t in strings]
+    tabela = struct.pack(f"<H{len(textos)}H", len(textos), *(len(t) for t in textos)) + b"".join(textos)
+    return _CABECALHO.pack(MAGICO, VERSAO) + tabela + b"".join(corpo)
+
+
+def decodificar(dados: bytes) -> dict[str, Any]:
+    #bytes -> dicionário no mesmo formato de Personagem.to_dict()
+    magico, versao = _CABECALHO.unpack_from(dados, 0)
+    if magico != MAGICO:
+        raise ValueError("Não é um save binário.")
+    if versao not in (1, 2, VERSAO):
+        raise ValueError(f"Versão de save binário não suportada: {versao}")
+    pos = _CABECALHO.size
+
+    # Tabela de strings: decodifica o bloco todo de uma vez e fatia
+    (qtd,) = struct.unpack_from("<H", dados, pos)
+    tamanhos = struct.unpack_from(f"<{qtd}H", dados, pos + 2)
+    pos += 2 + 2 * qtd
+    fim = pos + sum(tamanhos)
+    strings = _fatiar(bytes(dados[pos:fim]), tamanhos)
+    pos = fim
+
+    classe, nome, nivel, xp, *ats = _PERSONAGEM.unpack_from(dados, pos)
+    pos += _PERSONAGEM.size
+
+    listas = []
+    for _ in range(2):
+        qtd = dados[pos]
+        listas.append([strings[i] for i in struct.unpack_from(f"<{qtd}H", dados, pos + 1)])
+        pos += 1 + 2 * qtd
+
+    def item(tipo, n, valor, a, b, c):
+        if tipo == _EQUIP:
+            return {"nome": strings[n], "valor": valor, "slot": strings[a],
+                    "ataque_bonus": b, "defesa_bonus": c, "classe_item": "equip"}
+        if tipo == _POT:
+            return {"nome": strings[n], "valor": valor, "tipo": strings[a],
+                    "valor_efeito": b, "classe_item": "pot"}
+        return None
+
+    # Versões 2 e 3: os ITEM inteiros ficam na tabela de avulsos; versão 1: no lugar de cada REF
+    (qtd,) = struct.unpack_from("<H", dados, pos)
+    pos += 2
+    fim = pos + qtd * _ITEM.size
+    itens = [item(*campos) for campos in _ITEM.iter_unpack(dados[pos:fim])]
+    pos = fim
+    if versao == 1:
+        inventario = itens
+    else:
+        def resolver(r: int):
+            if r == _REF_VAZIO:
+                return None
+            return itens[r & ~_REF_AVULSO] if r & _REF_AVULSO else strings[r]
+
+        (qtd,) = struct.unpack_from("<H", dados, pos)
+        pos += 2
+        if versao == 2:
+            inventario = [resolver(r) for r in struct.unpack_from(f"<{qtd}H", dados, pos)]
+            pos += 2 * qtd
+        else:
+            fim = pos + qtd * _PILHA.size
+            inventario = [resolver(r) if unidades == 1 else [resolver(r), unidades]
+                          for r, unidades in _PILHA.iter_unpack(dados[pos:fim])]
+            pos = fim
+
+    equipamentos = {}
+    qtd = dados[pos]
+    pos += 1
+    for _ in range(qtd):
+        if versao == 1:
+            (slot,) = _SLOT.unpack_from(dados, pos)
+            equipamentos[strings[slot]] = item(*_ITEM.unpack_from(dados, pos + _SLOT.size))
+            pos += _SLOT.size + _ITEM.size
+        else:
+            slot, r = _SLOT_REF.unpack_from(dados, pos)
+            equipamentos[strings[slot]] = resolver(r)
+            pos += _SLOT_REF.size
+
+    return {
+        "classe": strings[classe],
+        "nome": strings[nome],
+        "nivel": nivel,
+        "xp": xp,
+        "atributos": dict(zip(_ATRIBUTOS, ats)),
+        "skills": listas[0],
+        "passivas": listas[1],
+        "inventario": inventario,
+        "equipamentos": equipamentos,
+    }
+
+
+def _fatiar(bruto: bytes, tamanhos) -> list[str]:
+    texto = bruto.decode("utf-8")
+    saida, ini = [], 0
+    # Tudo ASCII: os tamanhos em bytes valem como índices no texto já decodificado
+    fonte = texto if len(texto) == len(bruto) else bruto
+    for tam in tamanhos:
+        saida.append(fonte[ini:ini + tam])
+        ini += tam
+    if fonte is bruto:
+        saida = [b.decode("utf-8") for b in saida]
+    return saida
+
+
+def ler_save(conteudo: bytes) -> dict[str, Any]:
+    #Detecta o formato pelo conteúdo (binário pelo cabeçalho, senão JSON).
+    if eh_binario(conteudo):
+        return decodificar(conteudo)
+    return json.loads(conteudo.decode("utf-8"))
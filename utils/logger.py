@@ -1,30 +1,149 @@
 from __future__ import annotations
+import atexit
 import os
-from datetime import datetime
+import queue
+import threading
+import time
+from .metricas import Metricas
+
+# Níveis de log (quanto maior, mais importante). COMBATE fica abaixo de INFO
+# para poder ser desligado em sessões longas sem perder o resto.
+NIVEIS = {"DEBUG": 10, "COMBATE": 15, "INFO": 20, "AVISO": 30, "ERRO": 40}
 
 class Logger:
     #Responsável por registrar eventos do jogo em dados/jogo.log.
+    # As linhas vão para uma fila e uma thread escreve em lotes, com o arquivo sempre aberto.
     # Define a pasta onde os arquivos ficarão
     DIR_LOG = "dados"
+    ARQUIVO = "jogo.log"
+
+    nivel_minimo = NIVEIS["DEBUG"] # Mensagens abaixo disso são descartadas antes de formatar
+    tamanho_lote = 256             # Descarrega quando juntar essa quantidade de linhas...
+    intervalo = 0.5                # ...ou quando passar esse tempo (segundos)
+
+    _fila: queue.SimpleQueue | None = None
+    _thread: threading.Thread | None = None
+    _trava = threading.Lock()
+
+    @staticmethod
+    def configurar(nivel: str | None = None, tamanho_lote: int | None = None, intervalo: float | None = None) -> None:
+        if nivel is not None: Logger.nivel_minimo = NIVEIS[nivel]
+        if tamanho_lote is not None: Logger.tamanho_lote = tamanho_lote
+        if intervalo is not None: Logger.intervalo = intervalo
+
+    @staticmethod
+    def registrar(mensagem: str, nivel: str = "INFO", *args) -> None:
+        # Formatação preguiçosa: registrar("Turno %d ...", "COMBATE", turno) só formata se o nível passar
+        if NIVEIS.get(nivel, 20) < Logger.nivel_minimo:
+            return
+        fila = Logger._fila or Logger._iniciar()
+        fila.put((time.time(), nivel, mensagem, args))
+
+    @staticmethod
+    def log_combate(turno: int, atacante: str, defensor: str, dano: int):
+        if NIVEIS["COMBATE"] < Logger.nivel_minimo:
+            return
+        Logger.registrar("Turno %d: %s causou %d de dano em %s.", "COMBATE", turno, atacante, dano, defensor)
+
+    @staticmethod
+    def descarregar() -> None:
+        #Bloqueia até tudo o que já foi registrado estar gravado no arquivo.
+        if Logger._fila is None or not Logger._thread.is_alive():
+            return
+        pronto = threading.Event()
+        Logger._fila.put(pronto)
+        pronto.wait()
+
+    @staticmethod
+    def encerrar() -> None:
+        #Grava o que falta e para a thread (chamado automaticamente na saída).
+        with Logger._trava:
+            if Logger._fila is None:
+                return
+            Logger._fila.put(None)
+            Logger._thread.join()
+            Logger._fila = Logger._thread = None
 
     @staticmethod
-    def registrar(mensagem: str, nivel: str = "INFO") -> None:
-        data_hora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        linha_log = f"[{data_hora}] [{nivel}] {mensagem}"
-        
+    def _apos_fork() -> None:
+        # O processo filho não herda a thread de escrita: começa com uma fila nova
+        Logger._fila = Logger._thread = None
+        Logger._trava = threading.Lock()
+
+    # --- Thread de escrita ---
+
+    @staticmethod
+    def _iniciar() -> queue.SimpleQueue:
+        with Logger._trava:
+            if Logger._fila is None:
+                fila = queue.SimpleQueue()
+                Logger._thread = threading.Thread(target=Logger._escritor, args=(fila,),
+                                                  name="logger", daemon=True)
+                Logger._thread.start()
+                Logger._fila = fila
+                atexit.register(Logger.encerrar)
+            return Logger._fila
+
+    @staticmethod
+    def _escritor(fila: queue.SimpleQueue) -> None:
         # Cria a pasta 'dados' se ela não existir
         os.makedirs(Logger.DIR_LOG, exist_ok=True)
-        
         # Define o caminho completo: dados/jogo.log
-        caminho_arquivo = os.path.join(Logger.DIR_LOG, "jogo.log")
-
+        caminho_arquivo = os.path.join(Logger.DIR_LOG, Logger.ARQUIVO)
         try:
-            with open(caminho_arquivo, "a", encoding="utf-8") as f:
-                f.write(linha_log + "\n")
+            arquivo = open(caminho_arquivo, "a", encoding="utf-8")
         except Exception as e:
             print(f"Erro ao gravar log: {e}")
+            arquivo = None
 
-    @staticmethod
-    def log_combate(turno: int, atacante: str, defensor: str, dano: int):
-        msg = f"Turno {turno}: {atacante} causou {dano} de dano em {defensor}."
-        Logger.registrar(msg, "COMBATE")
\ No newline at end of file
+        lote: list[str] = []
+        avisos: list[threading.Event] = []
+        ultimo_segundo, data_hora = -1, ""
+        limite = 0.0
+        rodando = True
+
+        while rodando:
+            # Com o lote vazio não há prazo, a thread dorme até chegar algo
+            espera = max(0.0, limite - time.monotonic()) if lote else None
+            try:
+                item = fila.get(timeout=espera)
+            except queue.Empty:
+                item = False # Estourou o intervalo
+
+            if item is None:
+                rodando = False
+            elif isinstance(item, threading.Event):
+                avisos.append(item)
+            elif item is not False:
+                instante, nivel, mensagem, args = item
+                segundo = int(instante)
+                if segundo != ultimo_segundo: # Reaproveita o carimbo de data/hora dentro do mesmo segundo
+                    ultimo_segundo = segundo
+                    data_hora = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(segundo))
+                if args:
+                    mensagem = mensagem % args
+                if not lote:
+                    limite = time.monotonic() + Logger.intervalo
+                lote.append(f"[{data_hora}] [{nivel}] {mensagem}\n")
+
+            # Descarrega por tamanho, por tempo, a pedido (descarregar) ou no encerramento
+            if lote and (len(lote) >= Logger.tamanho_lote or item is False or avisos or not rodando
+                         or time.monotonic() >= limite):
+                if arquivo:
+                    try:
+                        arquivo.write("".join(lote))
+                        arquivo.flush()
+                        if Metricas.ativo: Metricas.contar("rpg_log_linhas_total", len(lote))
+                    except Exception as e:
+                        print(f"Erro ao gravar log: {e}")
+                lote.clear()
+            for aviso in avisos:
+                aviso.set()
+            avisos.clear()
+
+        if arquivo:
+            arquivo.close()
+
+
+if hasattr(os, "register_at_fork"): # Não existe no Windows
+    os.register_at_fork(after_in_child=Logger._apos_fork)
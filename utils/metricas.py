@@ -0,0 +1,175 @@
+from __future__ import annotations
+import atexit
+import os
+import threading
+
+# Contadores e tempos do jogo (combate, saves, log), desligados por padrão.
+# Desligado, o custo é um teste de Metricas.ativo nos pontos instrumentados (o combate lê uma
+# vez por batalha); ligado, cada registro passa pela trava, porque o servidor roda várias
+# sessões em threads. Exporta em texto no formato do Prometheus (.prom, para o textfile
+# collector do node_exporter) e num instantâneo JSON (.json).
+#
+# Contadores somam valores; resumos guardam quantidade, soma e máximo das observações
+# (ex: turnos por batalha, segundos por fase do turno). Rótulos vêm como argumentos nomeados:
+#   Metricas.contar("rpg_skills_total", skill="Meteoro")
+#   Metricas.observar("rpg_turno_fase_segundos", 0.0002, fase="jogador")
+
+DESCRICOES = {
+    "rpg_batalhas_total": "Batalhas terminadas, por resultado.",
+    "rpg_batalha_turnos": "Turnos por batalha.",
+    "rpg_turno_fase_segundos": "Tempo de cada fase do turno (no modo interativo, a fase do jogador inclui a escolha).",
+    "rpg_skills_total": "Habilidades usadas, por nome.",
+    "rpg_criticos_total": "Acertos críticos dos personagens, por classe.",
+    "rpg_esquivas_total": "Ataques esquivados pelos personagens, por classe.",
+    "rpg_passivas_total": "Vezes que cada passiva fez efeito.",
+    "rpg_repositorio_segundos": "Tempo das operações de save, por backend e operação.",
+    "rpg_repositorio_bytes_total": "Bytes gravados/lidos nos saves, por backend e operação.",
+    "rpg_log_linhas_total": "Linhas gravadas no jogo.log.",
+}
+
+
+class Metricas:
+    ativo = False
+
+    # (nome, rótulos) -> valor / [quantidade, soma, máximo]; rótulos = tupla ordenada de pares
+    _contadores: dict[tuple[str, tuple], float] = {}
+    _resumos: dict[tuple[str, tuple], list[float]] = {}
+    _trava = threading.Lock()
+    _destino: str | None = None
+
+    @staticmethod
+    def ativar(destino: str | None = None) -> None:
+        #Liga a coleta. Com destino, grava <destino>.prom e <destino>.json na saída do processo.
+        Metricas.ativo = True
+        if destino and Metricas._destino is None:
+            atexit.register(lambda: Metricas.exportar(Metricas._destino))
+        if destino:
+            Metricas._destino = destino
+
+    @staticmethod
+    def desativar() -> None:
+        Metricas.ativo = False
+
+    @staticmethod
+    def zerar() -> None:
+        with Metricas._trava:
+            Metricas._contadores.clear()
+            Metricas._resumos.clear()
+
+    @staticmethod
+    def contar(nome: str, valor: float = 1, **rotulos) -> None:
+        chave = (nome, tuple(sorted(rotulos.items())))
+        with Metricas._trava:
+            Metricas._contadores[chave] = Metricas._contadores.get(chave, 0) + valor
+
+    @staticmethod
+    def observar(nome: str, valor: float, **rotulos) -> None:
+        chave = (nome, tuple(sorted(rotulos.items())))
+        with Metricas._trava:
+            resumo = Metricas._resumos.get(chave)
+            if resumo is None:
+                Metricas._resumos[chave] = [1, valor, valor]
+            else:
+                resumo[0] += 1
+                resumo[1] += valor
+                if valor > resumo[2]: resumo[2] = valor
+
+    # --- Exportação ---
+
+    @staticmethod
+    def instantaneo() -> dict:
+        #Cópia de tudo o que foi coletado, pronta para json.dump (e para Metricas.mesclar).
+        with Metricas._trava:
+            return _montar(Metricas._contadores, Metricas._resumos)
+
+    @staticmethod
+    def coletar() -> dict:
+        #Instantâneo e zera (processos trabalhadores devolvem só o que juntaram desde a última vez).
+        with Metricas._trava:
+            contadores, resumos = Metricas._contadores, Metricas._resumos
+            Metricas._contadores, Metricas._resumos = {}, {}
+        return _montar(contadores, resumos)
+
+    @staticmethod
+    def mesclar(instantaneo: dict) -> None:
+        #Soma um instantâneo de outro processo aos valores deste.
+        with Metricas._trava:
+            for c in instantaneo.get("contadores", ()):
+                chave = (c["nome"], tuple(sorted(c["rotulos"].items())))
+                Metricas._contadores[chave] = Metricas._contadores.get(chave, 0) + c["valor"]
+            for r in instantaneo.get("resumos", ()):
+                chave = (r["nome"], tuple(sorted(r["rotulos"].items())))
+                atual = Metricas._resumos.get(chave)
+                if atual is None:
+                    Metricas._resumos[chave] = [r["quantidade"], r["soma"], r["maximo"]]
+                else:
+                    atual[0] += r["quantidade"]
+                    atual[1] += r["soma"]
+                    atual[2] = max(atual[2], r["maximo"])
+
+    @staticmethod
+    def prometheus() -> str:
+        #Texto no formato de exposição do Prometheus (contadores como counter, resumos como summary + _max).
+        dados = Metricas.instantaneo()
+        linhas: list[str] = []
+        vistos: set[str] = set()
+
+        def cabecalho(nome: str, tipo: str, base: str) -> None:
+            if nome in vistos:
+                return
+            vistos.add(nome)
+            if base in DESCRICOES:
+                linhas.append(f"# HELP {nome} {DESCRICOES[base]}")
+            linhas.append(f"# TYPE {nome} {tipo}")
+
+        for c in dados["contadores"]:
+            cabecalho(c["nome"], "counter", c["nome"])
+            linhas.append(f"{c['nome']}{_rotulos(c['rotulos'])} {_numero(c['valor'])}")
+        # As séries de um mesmo nome precisam ficar juntas: _max vai num bloco próprio depois
+        for r in dados["resumos"]:
+            cabecalho(r["nome"], "summary", r["nome"])
+            rotulos = _rotulos(r["rotulos"])
+            linhas.append(f"{r['nome']}_count{rotulos} {_numero(r['quantidade'])}")
+            linhas.append(f"{r['nome']}_sum{rotulos} {_numero(r['soma'])}")
+        for r in dados["resumos"]:
+            cabecalho(r["nome"] + "_max", "gauge", r["nome"])
+            linhas.append(f"{r['nome']}_max{_rotulos(r['rotulos'])} {_numero(r['maximo'])}")
+        return "\n".join(linhas) + "\n"
+
+    @staticmethod
+    def exportar(destino: str) -> None:
+        #Grava <destino>.prom e <destino>.json (troca atômica: quem lê nunca vê o arquivo pela metade).
+        import json # Só quem exporta paga o import (este módulo é carregado na partida do main.py)
+        pasta = os.path.dirname(destino)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        for extensao, conteudo in ((".prom", Metricas.prometheus()),
+                                   (".json", json.dumps(Metricas.instantaneo(), indent=4, ensure_ascii=False))):
+            caminho = destino + extensao
+            temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporario, "w", encoding="utf-8") as f:
+                f.write(conteudo)
+            os.replace(temporario, caminho)
+
+
+def _montar(contadores: dict, resumos: dict) -> dict:
+    return {
+        "contadores": [{"nome": nome, "rotulos": dict(rotulos), "valor": valor}
+                       for (nome, rotulos), valor in sorted(contadores.items())],
+        "resumos": [{"nome": nome, "rotulos": dict(rotulos), "quantidade": q, "soma": s, "maximo": m}
+                    for (nome, rotulos), (q, s, m) in sorted(resumos.items())],
+    }
+
+
+def _rotulos(rotulos: dict) -> str:
+    if not rotulos:
+        return ""
+    pares = []
+    for nome, valor in rotulos.items():
+        valor = str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pares.append(f'{nome}="{valor}"')
+    return "{" + ",".join(pares) + "}"
+
+
+def _numero(valor: float) -> str:
+    return str(int(valor)) if float(valor).is_integer() else repr(float(valor))
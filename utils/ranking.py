@@ -0,0 +1,139 @@
+from __future__ import annotations
+import heapq
+import json
+import os
+import threading
+from typing import Any
+from .formato_binario import EXTENSAO, ler_save
+from .delta import EXTENSAO_DELTA, aplicar_delta, ler_deltas
+
+class IndiceRanking:
+    #Índice do ranking guardado em dados/ranking.idx (uma linha JSON por atualização).
+    # Cobre os saves .json e .sav, com os deltas do autosave (.delta) já aplicados.
+    # Cada linha é [arquivo, nome, classe, nivel, xp, mtime_ns]; linhas mais novas sobrescrevem
+    # as antigas e [arquivo, null] remove. Assim salvar só acrescenta uma linha no fim.
+    ARQUIVO = "ranking.idx"
+
+    def __init__(self, pasta: str = "dados", carregar: bool = True):
+        self.pasta = pasta
+        self.caminho = os.path.join(pasta, self.ARQUIVO)
+        self.entradas: dict[str, tuple] = {}
+        self._linhas = 0
+        # Para só registrar um save não é preciso ler o índice (é só uma linha a mais no fim)
+        if carregar:
+            self._carregar()
+
+    def _carregar(self) -> None:
+        if not os.path.exists(self.caminho):
+            return
+        with open(self.caminho, "r", encoding="utf-8") as f:
+            for linha in f:
+                try:
+                    registro = json.loads(linha)
+                except ValueError:
+                    continue # Linha cortada (ex: queda durante a escrita)
+                self._linhas += 1
+                if registro[1] is None:
+                    self.entradas.pop(registro[0], None)
+                else:
+                    self.entradas[registro[0]] = tuple(registro[1:])
+
+    def _acrescentar(self, registros: list[list]) -> None:
+        os.makedirs(self.pasta, exist_ok=True)
+        with open(self.caminho, "a", encoding="utf-8") as f:
+            for registro in registros:
+                f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        self._linhas += len(registros)
+
+    def _compactar(self) -> None:
+        # Reescreve só o estado atual quando o histórico fica muito maior que o índice.
+        # Temporário próprio de cada thread/processo: várias sessões do servidor podem compactar juntas
+        temporario = f"{self.caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            for arquivo, dados in self.entradas.items():
+                f.write(json.dumps([arquivo, *dados], ensure_ascii=False) + "\n")
+        os.replace(temporario, self.caminho)
+        self._linhas = len(self.entradas)
+
+    @staticmethod
+    def _resumo(dados: dict[str, Any]) -> tuple | None:
+        if "nome" not in dados or "xp" not in dados:
+            return None
+        return (dados["nome"], dados.get("classe", "?"), dados.get("nivel", 1), dados["xp"])
+
+    def registrar(self, nome_arquivo: str, dados: dict[str, Any]) -> None:
+        #Chamado pelo Repositorio logo depois de gravar um save.
+        resumo = self._resumo(dados)
+        if resumo is None:
+            return
+        try:
+            mtime = os.stat(os.path.join(self.pasta, nome_arquivo)).st_mtime_ns
+        except OSError:
+            return
+        entrada = (*resumo, mtime)
+        self.entradas[nome_arquivo] = entrada
+        self._acrescentar([[nome_arquivo, *entrada]])
+
+    def reconciliar(self) -> None:
+        #Relê apenas os saves cujo mtime mudou desde a última vez (ou que sumiram).
+        novos: list[list] = []
+        vistos = set()
+        try:
+            itens = list(os.scandir(self.pasta))
+        except FileNotFoundError:
+            itens = []
+
+        # mtime dos deltas do autosave: um delta novo também conta como mudança no save
+        mtime_deltas = {}
+        for item in itens:
+            if item.name.endswith(EXTENSAO_DELTA):
+                try:
+                    mtime_deltas[item.name[:-len(EXTENSAO_DELTA)]] = item.stat().st_mtime_ns
+                except FileNotFoundError:
+                    pass # Compactado (ou apagado) por outro processo depois do scandir
+
+        for item in itens:
+            if not item.name.endswith((".json", EXTENSAO)) or not item.is_file():
+                continue
+            base = os.path.splitext(item.name)[0]
+            try:
+                mtime = max(item.stat().st_mtime_ns, mtime_deltas.get(base, 0))
+            except FileNotFoundError:
+                continue
+            vistos.add(item.name)
+            atual = self.entradas.get(item.name)
+            if atual is not None and atual[-1] == mtime:
+                continue
+            try:
+                with open(item.path, "rb") as f:
+                    dados = ler_save(f.read())
+                if base in mtime_deltas:
+                    for delta in ler_deltas(os.path.join(self.pasta, base + EXTENSAO_DELTA)):
+                        aplicar_delta(dados, delta)
+                resumo = self._resumo(dados)
+            except Exception:
+                resumo = None
+            if resumo is None:
+                if atual is not None:
+                    del self.entradas[item.name]
+                    novos.append([item.name, None])
+                continue
+            self.entradas[item.name] = (*resumo, mtime)
+            novos.append([item.name, *resumo, mtime])
+
+        for arquivo in [a for a in self.entradas if a not in vistos]:
+            del self.entradas[arquivo]
+            novos.append([arquivo, None])
+
+        if novos:
+            self._acrescentar(novos)
+        if self._linhas > 2 * len(self.entradas) + 100:
+            self._compactar()
+
+    def top(self, k: int = 10, classe: str | None = None) -> list[dict[str, Any]]:
+        #Os k saves com mais XP (opcionalmente só de uma classe), sem abrir nenhum save.
+        candidatos = self.entradas.values()
+        if classe:
+            candidatos = (e for e in candidatos if e[1] == classe)
+        melhores = heapq.nlargest(k, candidatos, key=lambda e: e[3])
+        return [{"nome": e[0], "classe": e[1], "nivel": e[2], "xp": e[3]} for e in melhores]
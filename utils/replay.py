@@ -0,0 +1,53 @@
+from __future__ import annotations
+import json
+import os
+import time
+from typing import Any
+
+# Replays de batalha: cada Missao.executar grava em dados/replays/ a semente da missão, a versão
+# do conteúdo, o personagem no início e as decisões do jogador por turno. O replay.py refaz a
+# batalha sem terminal a partir disso (ver PoliticaReplay).
+DIR_REPLAYS = os.path.join("dados", "replays")
+EXTENSAO_REPLAY = ".replay"
+# 3: índice do item na lista de pilhas do inventário; 2: lista de inimigos (hordas), com o
+# índice do item na lista de poções repetidas; a 1 tinha um inimigo só
+VERSAO_REPLAY = 3
+LIMITE_REPLAYS = 50 # Os mais antigos são apagados
+
+
+def salvar_replay(dados: dict[str, Any], pasta: str = DIR_REPLAYS) -> str:
+    os.makedirs(pasta, exist_ok=True)
+    nome = time.strftime("%Y%m%d-%H%M%S") + f"-{dados.get('semente', 0) % 100000:05d}{EXTENSAO_REPLAY}"
+    caminho = os.path.join(pasta, nome)
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump({"versao": VERSAO_REPLAY, **dados}, f, ensure_ascii=False, separators=(",", ":"))
+    _rotacionar(pasta)
+    return caminho
+
+
+def _rotacionar(pasta: str) -> None:
+    replays = sorted(n for n in os.listdir(pasta) if n.endswith(EXTENSAO_REPLAY))
+    for nome in replays[:-LIMITE_REPLAYS]:
+        try:
+            os.remove(os.path.join(pasta, nome))
+        except OSError:
+            pass
+
+
+def listar_replays(pasta: str = DIR_REPLAYS) -> list[str]:
+    #Caminhos dos replays, do mais antigo ao mais novo.
+    if not os.path.isdir(pasta):
+        return []
+    return [os.path.join(pasta, n) for n in sorted(os.listdir(pasta)) if n.endswith(EXTENSAO_REPLAY)]
+
+
+def carregar_replay(caminho: str) -> dict[str, Any]:
+    with open(caminho, "r", encoding="utf-8") as f:
+        dados = json.load(f)
+    versao = dados.get("versao")
+    if versao == 1:
+        dados["inimigos"] = [dados.pop("inimigo")]
+        dados["resultado"]["vida_inimigos"] = [dados["resultado"].pop("vida_inimigo")]
+    elif versao not in (2, VERSAO_REPLAY):
+        raise ValueError(f"Versão de replay não suportada: {versao}")
+    return dados
@@ -1,15 +1,45 @@
 from __future__ import annotations
 import json
 import os
+from time import perf_counter
 from typing import Any
+from .ranking import IndiceRanking
+from .formato_binario import EXTENSAO, codificar, ler_save
+from .delta import EXTENSAO_DELTA, aplicar_delta, ler_deltas
+from .metricas import Metricas
+from .terminal import escrever
+
+__all__ = ["Repositorio", "BACKENDS", "criar_repositorio"] # Os dois últimos vêm de utils/backends.py (ver o fim do arquivo)
 
 class Repositorio:
-    #Gerencia a leitura e escrita de arquivos JSON na pasta 'dados/'.
+    #Gerencia a leitura e escrita dos saves na pasta 'dados/'.
+    # Grava em JSON (.json) ou no formato binário compacto (.sav); a leitura detecta o formato sozinha.
+    # O autosave acrescenta deltas em <save>.delta, que viram um snapshot novo a cada LIMITE_DELTAS.
     DIR_SAVES = "dados"
+    EXTENSOES = (".json", EXTENSAO)
+    LIMITE_DELTAS = 20
+
+    def __init__(self, formato: str = "json"):
+        self.formato = formato # "json" ou "binario"
+
+    def _base(self, nome_arquivo: str) -> str:
+        for ext in self.EXTENSOES:
+            if nome_arquivo.endswith(ext):
+                return nome_arquivo[:-len(ext)]
+        return nome_arquivo
 
     def salvar(self, dados: dict[str, Any], nome_arquivo: str) -> None:
-        if not nome_arquivo.endswith(".json"):
-            nome_arquivo += ".json"
+        try:
+            caminho_completo = self._gravar_snapshot(dados, nome_arquivo)
+            escrever(f"✔ Jogo salvo com sucesso em '{caminho_completo}'!")
+        except Exception as e:
+            escrever(f"❌ Erro ao salvar arquivo: {e}")
+
+    def _gravar_snapshot(self, dados: dict[str, Any], nome_arquivo: str) -> str:
+        inicio = perf_counter()
+        binario = self.formato == "binario"
+        base = self._base(nome_arquivo)
+        nome_arquivo = base + (EXTENSAO if binario else ".json")
         
         # Garante que a pasta existe
         os.makedirs(self.DIR_SAVES, exist_ok=True)
@@ -17,27 +47,100 @@ class Repositorio:
         # Cria o caminho completo (ex: dados/save1.json)
         caminho_completo = os.path.join(self.DIR_SAVES, nome_arquivo)
         
-        try:
+        if binario:
+            with open(caminho_completo, "wb") as f:
+                f.write(codificar(dados))
+                tamanho = f.tell()
+        else:
             with open(caminho_completo, "w", encoding="utf-8") as f:
                 json.dump(dados, f, indent=4, ensure_ascii=False)
-            print(f"✔ Jogo salvo com sucesso em '{caminho_completo}'!")
+                tamanho = f.tell()
+        # Um save com o mesmo nome no outro formato ficaria desatualizado,
+        # e os deltas antigos já estão dentro do snapshot novo
+        for outro in (base + (".json" if binario else EXTENSAO), base + EXTENSAO_DELTA):
+            outro = os.path.join(self.DIR_SAVES, outro)
+            if os.path.exists(outro):
+                os.remove(outro)
+        IndiceRanking(self.DIR_SAVES, carregar=False).registrar(nome_arquivo, dados)
+        if Metricas.ativo:
+            self._medir("salvar", inicio, tamanho)
+        return caminho_completo
+
+    def _medir(self, operacao: str, inicio: float, tamanho: int) -> None:
+        Metricas.observar("rpg_repositorio_segundos", perf_counter() - inicio, backend=self.formato, operacao=operacao)
+        Metricas.contar("rpg_repositorio_bytes_total", tamanho, backend=self.formato, operacao=operacao)
+
+    def salvar_delta(self, delta: dict[str, Any], nome_arquivo: str, limite: int | None = None) -> bool:
+        #Autosave: acrescenta só o que mudou (Personagem.extrair_delta()) ao fim de <save>.delta.
+        # Depois de 'limite' deltas junta tudo num snapshot novo. Sem snapshot ainda, retorna False.
+        base = self._base(nome_arquivo)
+        if not any(os.path.exists(os.path.join(self.DIR_SAVES, base + ext)) for ext in self.EXTENSOES):
+            return False
+        if not delta:
+            return True
+        caminho_delta = os.path.join(self.DIR_SAVES, base + EXTENSAO_DELTA)
+        try:
+            inicio = perf_counter()
+            linha = json.dumps(delta, ensure_ascii=False, separators=(",", ":")) + "\n"
+            with open(caminho_delta, "a+", encoding="utf-8") as f:
+                f.write(linha)
+                f.seek(0)
+                pendentes = sum(1 for _ in f)
+            if Metricas.ativo:
+                self._medir("delta", inicio, len(linha.encode("utf-8")))
+            if pendentes >= (limite or self.LIMITE_DELTAS):
+                # Compacta: o snapshot novo já inclui os deltas (e apaga o .delta)
+                self._gravar_snapshot(self._montar(*self._ler(base)), base)
+            return True
         except Exception as e:
-            print(f"❌ Erro ao salvar arquivo: {e}")
+            escrever(f"❌ Erro no autosave: {e}")
+            return False
 
     def carregar(self, nome_arquivo: str) -> dict[str, Any] | None:
-        if not nome_arquivo.endswith(".json"):
-            nome_arquivo += ".json"
+        try:
+            lido = self._ler(nome_arquivo, avisar=True)
+        except Exception as e:
+            escrever(f"❌ Erro ao ler arquivo: {e}")
+            return None
+        return self._montar(*lido) if lido else None
 
-        caminho_completo = os.path.join(self.DIR_SAVES, nome_arquivo)
+    def _ler(self, nome_arquivo: str, avisar: bool = False) -> tuple[dict[str, Any], list[dict[str, Any]]] | None:
+        # Snapshot + deltas pendentes (ainda não aplicados)
+        # Sem extensão: procura o .json e depois o .sav
+        if nome_arquivo.endswith(self.EXTENSOES):
+            candidatos = [nome_arquivo]
+        else:
+            candidatos = [nome_arquivo + ext for ext in self.EXTENSOES]
 
-        if not os.path.exists(caminho_completo):
-            print(f"❌ Arquivo '{nome_arquivo}' não encontrado na pasta '{self.DIR_SAVES}'.")
+        inicio = perf_counter()
+        caminho_completo = next((c for c in (os.path.join(self.DIR_SAVES, n) for n in candidatos)
+                                 if os.path.exists(c)), None)
+
+        if caminho_completo is None:
+            if avisar:
+                escrever(f"❌ Arquivo '{candidatos[0]}' não encontrado na pasta '{self.DIR_SAVES}'.")
             return None
 
-        try:
-            with open(caminho_completo, "r", encoding="utf-8") as f:
-                dados = json.load(f)
-            return dados
-        except Exception as e:
-            print(f"❌ Erro ao ler arquivo: {e}")
-            return None
\ No newline at end of file
+        with open(caminho_completo, "rb") as f:
+            conteudo = f.read()
+        dados = ler_save(conteudo)
+        deltas = ler_deltas(os.path.join(self.DIR_SAVES, self._base(nome_arquivo) + EXTENSAO_DELTA))
+        if Metricas.ativo:
+            self._medir("carregar", inicio, len(conteudo))
+        return dados, deltas
+
+    @staticmethod
+    def _montar(dados: dict[str, Any], deltas: list[dict[str, Any]]) -> dict[str, Any]:
+        for delta in deltas:
+            aplicar_delta(dados, delta)
+        return dados
+
+    def ranking(self, k: int = 20, classe: str | None = None) -> list[dict[str, Any]]:
+        # Usa o índice dados/ranking.idx (só relê os saves que mudaram)
+        indice = IndiceRanking(self.DIR_SAVES)
+        indice.reconciliar()
+        return indice.top(k, classe)
+
+
+# A fábrica mora em utils/backends.py (leve, sem a persistência); continua importável daqui
+from .backends import BACKENDS, criar_repositorio
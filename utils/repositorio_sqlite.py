@@ -0,0 +1,213 @@
+from __future__ import annotations
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+from .delta import aplicar_delta
+from .metricas import Metricas
+from .terminal import escrever
+
+class RepositorioSQLite:
+    #Guarda os personagens em um banco SQLite local (dados/saves.db) em vez de um .json por save.
+    # Mesma interface do Repositorio (salvar/carregar/salvar_delta/ranking) + operações em lote numa transação.
+    DIR_SAVES = "dados"
+    ARQUIVO_DB = "saves.db"
+    LIMITE_DELTAS = 20
+
+    # Uma conexão por banco, reaproveitada por todas as instâncias (a trava serializa o acesso)
+    _conexoes: dict[str, sqlite3.Connection] = {}
+    _trava = threading.RLock()
+
+    def __init__(self, caminho_db: str | None = None):
+        self.caminho_db = caminho_db or os.path.join(self.DIR_SAVES, self.ARQUIVO_DB)
+
+    @property
+    def conexao(self) -> sqlite3.Connection:
+        con = self._conexoes.get(self.caminho_db)
+        if con is None:
+            with self._trava:
+                con = self._conexoes.get(self.caminho_db)
+                if con is None:
+                    con = self._abrir(self.caminho_db)
+                    self._conexoes[self.caminho_db] = con
+        return con
+
+    @staticmethod
+    def _abrir(caminho: str) -> sqlite3.Connection:
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        # isolation_level=None: as transações são abertas explicitamente com BEGIN
+        con = sqlite3.connect(caminho, isolation_level=None, check_same_thread=False)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        con.execute("""
+            CREATE TABLE IF NOT EXISTS saves (
+                arquivo    TEXT PRIMARY KEY,
+                nome       TEXT NOT NULL,
+                classe     TEXT,
+                nivel      INTEGER,
+                xp         INTEGER,
+                dados      TEXT NOT NULL,
+                atualizado REAL
+            )""")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_saves_nome ON saves(nome)")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_saves_classe_xp ON saves(classe, xp)")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_saves_nivel ON saves(nivel)")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_saves_xp ON saves(xp)")
+        # Deltas do autosave ainda não juntados ao snapshot da tabela saves
+        con.execute("""
+            CREATE TABLE IF NOT EXISTS deltas (
+                seq     INTEGER PRIMARY KEY AUTOINCREMENT,
+                arquivo TEXT NOT NULL,
+                dados   TEXT NOT NULL
+            )""")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_deltas_arquivo ON deltas(arquivo, seq)")
+        return con
+
+    @staticmethod
+    def _chave(nome_arquivo: str) -> str:
+        # "save1" e "save1.json" são o mesmo save
+        return nome_arquivo[:-5] if nome_arquivo.endswith(".json") else nome_arquivo
+
+    @staticmethod
+    def _linha(nome_arquivo: str, dados: dict[str, Any]) -> tuple:
+        return (RepositorioSQLite._chave(nome_arquivo), dados.get("nome", ""), dados.get("classe"),
+                dados.get("nivel"), dados.get("xp"),
+                json.dumps(dados, ensure_ascii=False, separators=(",", ":")), time.time())
+
+    def salvar(self, dados: dict[str, Any], nome_arquivo: str) -> None:
+        try:
+            self.salvar_varios([(nome_arquivo, dados)])
+            escrever(f"✔ Jogo salvo com sucesso em '{self.caminho_db}' ({self._chave(nome_arquivo)})!")
+        except Exception as e:
+            escrever(f"❌ Erro ao salvar no banco: {e}")
+
+    def carregar(self, nome_arquivo: str) -> dict[str, Any] | None:
+        try:
+            dados = self.carregar_varios([nome_arquivo]).get(self._chave(nome_arquivo))
+        except Exception as e:
+            escrever(f"❌ Erro ao ler do banco: {e}")
+            return None
+        if dados is None:
+            escrever(f"❌ Save '{self._chave(nome_arquivo)}' não encontrado em '{self.caminho_db}'.")
+        return dados
+
+    def salvar_varios(self, saves: list[tuple[str, dict[str, Any]]]) -> None:
+        #Grava vários saves numa única transação (ou todos, ou nenhum).
+        inicio = time.perf_counter()
+        linhas = [self._linha(nome, dados) for nome, dados in saves]
+        with self._trava:
+            con = self.conexao
+            con.execute("BEGIN")
+            try:
+                con.executemany("INSERT OR REPLACE INTO saves VALUES (?, ?, ?, ?, ?, ?, ?)", linhas)
+                con.executemany("DELETE FROM deltas WHERE arquivo = ?", [(l[0],) for l in linhas])
+                con.execute("COMMIT")
+            except BaseException:
+                con.execute("ROLLBACK")
+                raise
+        if Metricas.ativo:
+            self._medir("salvar", inicio, sum(len(l[5].encode("utf-8")) for l in linhas))
+
+    @staticmethod
+    def _medir(operacao: str, inicio: float, tamanho: int) -> None:
+        Metricas.observar("rpg_repositorio_segundos", time.perf_counter() - inicio, backend="sqlite", operacao=operacao)
+        Metricas.contar("rpg_repositorio_bytes_total", tamanho, backend="sqlite", operacao=operacao)
+
+    def salvar_delta(self, delta: dict[str, Any], nome_arquivo: str, limite: int | None = None) -> bool:
+        #Autosave: guarda só o que mudou; a cada 'limite' deltas regrava o snapshot completo.
+        chave = self._chave(nome_arquivo)
+        inicio = time.perf_counter()
+        with self._trava:
+            con = self.conexao
+            con.execute("BEGIN")
+            try:
+                atual = con.execute("SELECT dados FROM saves WHERE arquivo = ?", (chave,)).fetchone()
+                if atual is None:
+                    con.execute("ROLLBACK")
+                    return False
+                if delta:
+                    texto = json.dumps(delta, ensure_ascii=False, separators=(",", ":"))
+                    con.execute("INSERT INTO deltas (arquivo, dados) VALUES (?, ?)", (chave, texto))
+                    # O ranking lê só as colunas, então elas já acompanham o delta
+                    if "nivel" in delta or "xp" in delta:
+                        con.execute("UPDATE saves SET nivel = COALESCE(?, nivel), xp = COALESCE(?, xp) "
+                                    "WHERE arquivo = ?", (delta.get("nivel"), delta.get("xp"), chave))
+                    deltas = con.execute("SELECT dados FROM deltas WHERE arquivo = ? ORDER BY seq",
+                                         (chave,)).fetchall()
+                    if len(deltas) >= (limite or self.LIMITE_DELTAS):
+                        dados = self._montar(atual[0], [d for (d,) in deltas])
+                        con.execute("INSERT OR REPLACE INTO saves VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                    self._linha(chave, dados))
+                        con.execute("DELETE FROM deltas WHERE arquivo = ?", (chave,))
+                con.execute("COMMIT")
+            except BaseException:
+                con.execute("ROLLBACK")
+                raise
+        if Metricas.ativo and delta:
+            self._medir("delta", inicio, len(texto.encode("utf-8")))
+        return True
+
+    @staticmethod
+    def _montar(dados: str, deltas: list[str]) -> dict[str, Any]:
+        resultado = json.loads(dados)
+        for delta in deltas:
+            aplicar_delta(resultado, json.loads(delta))
+        return resultado
+
+    def carregar_varios(self, nomes: list[str] | None = None) -> dict[str, dict[str, Any]]:
+        #Lê vários saves numa única transação (já com os deltas aplicados). Sem nomes, lê todos.
+        inicio = time.perf_counter()
+        with self._trava:
+            con = self.conexao
+            con.execute("BEGIN")
+            try:
+                if nomes is None:
+                    linhas = con.execute("SELECT arquivo, dados FROM saves").fetchall()
+                    pendentes = con.execute("SELECT arquivo, dados FROM deltas ORDER BY seq").fetchall()
+                else:
+                    chaves = [self._chave(n) for n in nomes]
+                    linhas, pendentes = [], []
+                    # Limite de parâmetros do SQLite: consulta em blocos
+                    for i in range(0, len(chaves), 500):
+                        bloco = chaves[i:i + 500]
+                        marcadores = ",".join("?" * len(bloco))
+                        linhas += con.execute(f"SELECT arquivo, dados FROM saves WHERE arquivo IN ({marcadores})",
+                                              bloco).fetchall()
+                        pendentes += con.execute(f"SELECT arquivo, dados FROM deltas WHERE arquivo IN ({marcadores})"
+                                                 " ORDER BY seq", bloco).fetchall()
+            finally:
+                con.execute("COMMIT")
+        deltas: dict[str, list[str]] = {}
+        for arquivo, dados in pendentes:
+            deltas.setdefault(arquivo, []).append(dados)
+        resultado = {arquivo: self._montar(dados, deltas.get(arquivo, ())) for arquivo, dados in linhas}
+        if Metricas.ativo:
+            self._medir("carregar", inicio, sum(len(d.encode("utf-8")) for _, d in linhas + pendentes))
+        return resultado
+
+    def listar(self) -> list[str]:
+        with self._trava:
+            return [a for (a,) in self.conexao.execute("SELECT arquivo FROM saves ORDER BY arquivo")]
+
+    def ranking(self, k: int = 20, classe: str | None = None) -> list[dict[str, Any]]:
+        #Top k por XP usando os índices (sem decodificar os saves).
+        sql = "SELECT nome, classe, nivel, xp FROM saves"
+        params: tuple = ()
+        if classe:
+            sql += " WHERE classe = ?"
+            params = (classe,)
+        sql += " ORDER BY xp DESC LIMIT ?"
+        with self._trava:
+            linhas = self.conexao.execute(sql, params + (k,)).fetchall()
+        return [{"nome": n, "classe": c, "nivel": nv, "xp": xp} for n, c, nv, xp in linhas]
+
+    @classmethod
+    def fechar_todos(cls) -> None:
+        with cls._trava:
+            for con in cls._conexoes.values():
+                con.close()
+            cls._conexoes.clear()
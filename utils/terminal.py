@@ -0,0 +1,119 @@
+from __future__ import annotations
+import atexit
+import os
+import re
+import sys
+import time
+from contextvars import ContextVar, Token
+
+# Entrada e saída do jogo interativo (menus e combate). Por padrão é o terminal do processo;
+# o servidor (servidor.py) liga uma sessão remota por conexão através de uma ContextVar,
+# então o mesmo código dos menus atende vários jogadores, cada um na sua thread.
+#
+# A saída é montada num buffer e vai para o terminal numa escrita só, quando o jogo pede
+# entrada ou pausa: um turno de combate inteiro (status, barras, mensagens e o prompt) é um
+# único write, em vez de um print por linha. As cores são códigos ANSI embutidos no texto
+# (Cor); sem cores, o console tira os códigos na hora de escrever.
+
+_ANSI = re.compile(r"\x1b\[[0-9;]*m")
+
+
+class Cor:
+    VERMELHO = '\033[91m'
+    VERDE = '\033[92m'
+    AMARELO = '\033[93m'
+    AZUL = '\033[94m'
+    CIANO = '\033[96m' # Gelo
+    CINZA = '\033[90m'
+    RESET = '\033[0m'
+
+
+def _cores_padrao() -> bool:
+    # Convenção NO_COLOR (no-color.org); saída redirecionada (pipe/arquivo) também vai sem cor
+    return "NO_COLOR" not in os.environ and sys.stdout.isatty()
+
+
+class Console:
+    #Terminal local (stdout/input/time.sleep). As sessões remotas sobrescrevem escrever/ler/pausar.
+    def __init__(self, cores: bool | None = None, quadros: bool = True):
+        self.cores = _cores_padrao() if cores is None else cores
+        # False = sem os quadros de status do combate (barras de HP a cada turno), só as mensagens
+        self.quadros = quadros
+        self._buffer: list[str] = []
+
+    def formatar(self, texto: str) -> str:
+        return texto if self.cores else _ANSI.sub("", texto)
+
+    def descarregar(self, fim: str = "") -> None:
+        #Escreve o que estava no buffer (mais 'fim') numa chamada só.
+        if self._buffer:
+            fim = "".join(self._buffer) + fim
+            self._buffer.clear()
+        if fim:
+            sys.stdout.write(self.formatar(fim))
+            sys.stdout.flush()
+
+    def escrever(self, texto: str) -> None:
+        self._buffer.append(texto)
+
+    def ler(self, prompt: str) -> str:
+        self.descarregar(prompt)
+        return input()
+
+    def pausar(self, segundos: float) -> None:
+        self.descarregar()
+        time.sleep(segundos)
+
+
+_padrao = Console()
+_console: ContextVar[Console] = ContextVar("console", default=_padrao)
+atexit.register(_padrao.descarregar) # O que sobrou depois do último prompt (ex: "Até logo!")
+
+
+def usar_console(console: Console) -> Token:
+    #Liga o console no contexto atual (devolve o token para desfazer com restaurar_console).
+    return _console.set(console)
+
+
+def restaurar_console(token: Token) -> None:
+    _console.reset(token)
+
+
+def console_atual() -> Console:
+    return _console.get()
+
+
+def configurar_terminal(cores: bool | None = None, quadros: bool | None = None) -> None:
+    #Opções de linha de comando (--sem-cor, --sem-quadros) para o terminal local.
+    if cores is not None: _padrao.cores = cores
+    if quadros is not None: _padrao.quadros = quadros
+
+
+def escrever(*valores, sep: str = " ", end: str = "\n") -> None:
+    # Mesma assinatura do print (o caso comum, uma string só, sem o join)
+    if len(valores) == 1 and type(valores[0]) is str:
+        _console.get().escrever(valores[0] + end)
+    else:
+        _console.get().escrever(sep.join(map(str, valores)) + end)
+
+
+def ler(prompt: str = "") -> str:
+    # Como o input: levanta EOFError quando a entrada acabou (ex: a conexão caiu)
+    return _console.get().ler(prompt)
+
+
+def pausar(segundos: float) -> None:
+    _console.get().pausar(segundos)
+
+
+# Barras de HP: a parte desenhada depende só da largura e de quantas casas estão cheias,
+# então cada combinação é montada uma vez e reaproveitada em todos os turnos
+_BARRAS: dict[tuple[int, int], str] = {}
+
+
+def barra(largura: int, cheio: int) -> str:
+    chave = (largura, cheio)
+    desenho = _BARRAS.get(chave)
+    if desenho is None:
+        desenho = _BARRAS[chave] = "[" + "#" * cheio + "-" * (largura - cheio) + "]"
+    return desenho